@@ -0,0 +1,58 @@
+# Profile the display driver on a host and dump the screen.
+# Call with python3 emulator/bench.py [screen.png]
+# Runs each primitive in direct and in frame buffer mode, prints the SPI
+# traffic per primitive and checks that both modes produce the same pixels.
+
+import sys
+import st7735emu
+from ST7735 import TFT
+from sysfont import sysfont
+
+def scene(tft):
+    """Draw a bit of everything, like a typical bot program does"""
+    tft.fill(TFT.BLACK)
+    tft.fillrect((10, 10), (50, 30), TFT.RED)
+    tft.rect((5, 5), (150, 118), TFT.GRAY)
+    tft.line((0, 0), (159, 127), TFT.GREEN)
+    tft.line((0, 127), (159, 0), TFT.BLUE)
+    tft.hline((0, 64), 160, TFT.YELLOW)
+    tft.vline((80, 0), 128, TFT.CYAN)
+    tft.circle((100, 60), 25, TFT.WHITE)
+    tft.fillcircle((40, 90), 12, TFT.PURPLE)
+    tft.text((2, 50), "Hello XWK-Bot", TFT.WHITE, sysfont)
+    tft.text((2, 100), "42 cm", TFT.YELLOW, sysfont, 3)
+    for i in range(3):
+        tft.terminal("Line %d" % i, TFT.GREEN, sysfont)
+
+def run(buffered):
+    e = st7735emu.Emulator()
+    tft = e.display()
+    if buffered:
+        tft.framebuffer(True)
+    e.profile(tft)
+    scene(tft)
+    tft.flush()
+    return e
+
+print("Direct mode")
+direct = run(False)
+direct.report()
+print()
+print("Frame buffer mode")
+buffered = run(True)
+buffered.report()
+
+w, h = direct.size()
+diff = 0
+for y in range(h):
+    for x in range(w):
+        if direct.pixel(x, y) != buffered.pixel(x, y):
+            diff += 1
+print()
+print("Pixels differing between direct and frame buffer mode:", diff)
+
+if len(sys.argv) > 1:
+    direct.save_png(sys.argv[1], scale=3)
+    print("Saved", sys.argv[1])
+print("Bytes sent with CS high:", direct.stray + buffered.stray,
+      "Pixels outside display RAM:", direct.clipped + buffered.clipped)
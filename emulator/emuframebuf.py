@@ -0,0 +1,169 @@
+"""
+emuframebuf - Pure Python stand-in for MicroPython's framebuf module, RGB565 only.
+install() in st7735emu registers it as framebuf when the real one is missing.
+Lines and ellipses use the same algorithms as MicroPython, so the pixels match.
+"""
+
+RGB565 = 1
+
+
+class FrameBuffer:
+
+    def __init__(self, buf, width, height, format, stride=None):
+        if format != RGB565:
+            raise ValueError("only RGB565 is emulated")
+        self.buf = buf
+        self.width = width
+        self.height = height
+
+    def _row(self, w, c):
+        # Native (little endian) byte order, like framebuf on the ESP32
+        return bytes([c & 0xFF, (c >> 8) & 0xFF]) * w
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def pixel(self, x, y, c=None):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = (y * self.width + x) * 2
+            if c is None:
+                return self.buf[i] | (self.buf[i + 1] << 8)
+            self.buf[i] = c & 0xFF
+            self.buf[i + 1] = (c >> 8) & 0xFF
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        row = self._row(x1 - x0, c)
+        for yy in range(y0, y1):
+            i = (yy * self.width + x0) * 2
+            self.buf[i:i + len(row)] = row
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+        else:
+            self.fill_rect(x, y, w, 1, c)
+            self.fill_rect(x, y + h - 1, w, 1, c)
+            self.fill_rect(x, y, 1, h, c)
+            self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = x2 - x1
+        sx = 1
+        if dx < 0:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        sy = 1
+        if dy < 0:
+            dy = -dy
+            sy = -1
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                self.pixel(y1, x1, c)
+            else:
+                self.pixel(x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        self.pixel(x2, y2, c)
+
+    def _points(self, cx, cy, x, y, c, f, m):
+        if f:
+            if m & 1:
+                self.fill_rect(cx, cy - y, x + 1, 1, c)
+            if m & 2:
+                self.fill_rect(cx - x, cy - y, x + 1, 1, c)
+            if m & 4:
+                self.fill_rect(cx - x, cy + y, x + 1, 1, c)
+            if m & 8:
+                self.fill_rect(cx, cy + y, x + 1, 1, c)
+        else:
+            if m & 1:
+                self.pixel(cx + x, cy - y, c)
+            if m & 2:
+                self.pixel(cx - x, cy - y, c)
+            if m & 4:
+                self.pixel(cx - x, cy + y, c)
+            if m & 8:
+                self.pixel(cx + x, cy + y, c)
+
+    def ellipse(self, cx, cy, xr, yr, c, f=False, m=15):
+        if xr == 0 and yr == 0:
+            if m & 15:
+                self.pixel(cx, cy, c)
+            return
+        two_a = 2 * xr * xr
+        two_b = 2 * yr * yr
+        x = xr
+        y = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        err = 0
+        stopx = two_b * xr
+        stopy = 0
+        while stopx >= stopy:
+            self._points(cx, cy, x, y, c, f, m)
+            y += 1
+            stopy += two_a
+            err += ychange
+            ychange += two_a
+            if 2 * err + xchange > 0:
+                x -= 1
+                stopx -= two_b
+                err += xchange
+                xchange += two_b
+        x = 0
+        y = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        err = 0
+        stopx = 0
+        stopy = two_a * yr
+        while stopx <= stopy:
+            self._points(cx, cy, x, y, c, f, m)
+            x += 1
+            stopx += two_b
+            err += xchange
+            xchange += two_b
+            if 2 * err + ychange > 0:
+                y -= 1
+                stopy -= two_a
+                err += ychange
+                ychange += two_a
+
+    def scroll(self, xstep, ystep):
+        # Uncovered areas keep their old contents, as in MicroPython
+        w = self.width
+        h = self.height
+        old = bytes(self.buf)
+        for y in range(h):
+            sy = y - ystep
+            if not 0 <= sy < h:
+                continue
+            x0 = max(0, xstep)
+            x1 = min(w, w + xstep)
+            if x1 <= x0:
+                continue
+            d = (y * w + x0) * 2
+            s = (sy * w + x0 - xstep) * 2
+            self.buf[d:d + (x1 - x0) * 2] = old[s:s + (x1 - x0) * 2]
@@ -0,0 +1,6 @@
+"""
+emumachine - Minimal machine module for running the display driver on a host.
+install() in st7735emu registers it as machine when the real one is missing.
+"""
+
+from st7735emu import FakePin as Pin, FakeSPI as SPI
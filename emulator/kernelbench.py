@@ -0,0 +1,56 @@
+# Time the pixel loops of micropython/lib/kernels.py, Python against viper.
+# Call with micropython emulator/kernelbench.py [rounds]
+# Viper needs the MicroPython unix port (or a board), under CPython only the
+# Python versions run. Each kernel is first checked to give the same pixels.
+
+import sys
+import time
+import st7735emu
+
+st7735emu.install()
+import kernels
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+def cases():
+    """Typical calls: name, destination size and the other arguments"""
+    # bot.image() boot logo at scale 5, 32 visible source pixels
+    widths = bytearray([5] * 32)
+    src = bytes(range(64))
+    yield 'scale_row 32px x5', 'scale_row', 32 * 5 * 2, (src, widths)
+    # Palette image row, 128 pixels at 4 and 1 bits per pixel, odd start
+    pal = bytes(range(32))
+    packed = bytes((i * 37) & 0xFF for i in range(65))
+    yield 'palette_row 128px 4bpp', 'palette_row', 256, (packed, pal, 4 | (4 << 4))
+    yield 'palette_row 128px 1bpp', 'palette_row', 256, (packed, pal, 1 | (3 << 4))
+    # sysfont character, unscaled and at size 3
+    cols = bytes((0x3E, 0x51, 0x49, 0x45, 0x3E))
+    yield 'render_glyph 5x8', 'render_glyph', 5 * 8 * 2, (cols, bytes((5, 8, 1, 1)), 0xFFE0)
+    yield 'render_glyph 5x8 x3', 'render_glyph', 5 * 8 * 2 * 9, (cols, bytes((5, 8, 3, 3)), 0xFFE0)
+
+def timed(f, dst, args):
+    """Microseconds per call"""
+    t = time.ticks_us()
+    for i in range(ROUNDS):
+        f(dst, *args)
+    return time.ticks_diff(time.ticks_us(), t) / ROUNDS
+
+print("Kernels compiled with:", kernels.EMITTER)
+print("%-24s %10s %10s %8s" % ("kernel", "python us", kernels.EMITTER + " us", "speedup"))
+failed = 0
+for label, name, size, args in cases():
+    slow = kernels.FALLBACK[name]
+    fast = getattr(kernels, name)
+    want = bytearray(size)
+    got = bytearray(size)
+    slow(want, *args)
+    fast(got, *args)
+    if got != want:
+        failed += 1
+        print("%-24s differs from the Python version" % label)
+        continue
+    tp = timed(slow, want, args)
+    tf = timed(fast, got, args)
+    print("%-24s %10.1f %10.1f %7.1fx" % (label, tp, tf, tp / tf if tf else 0))
+if failed:
+    print(failed, "kernels give different pixels")
@@ -0,0 +1,485 @@
+"""
+st7735emu - Host-side emulator for the ST7735 driver in micropython/lib.
+Runs under CPython or the MicroPython unix port, no board needed.
+
+A fake SPI bus decodes the command stream the driver sends (CASET, RASET,
+RAMWR, MADCTL, VSCRDEF, VSCSAD) into a simulated display RAM, which can be
+read back pixel by pixel or saved as a PNG. Bytes, commands, transactions
+and CS toggles are counted per driver primitive.
+
+Usage:
+
+import st7735emu
+emu = st7735emu.Emulator()
+tft = emu.display()                  # TFT on fake pins, initr(), landscape
+emu.profile(tft)                     # Count SPI traffic per primitive
+tft.text((0, 0), "Hello", tft.WHITE, sysfont)
+emu.report()                         # Table of calls, bytes, transactions ...
+emu.save_png("screen.png", scale=4)
+print(hex(emu.pixel(0, 0)))          # RGB565 as seen in drawing orientation
+
+install() provides the board modules the driver needs when they are
+missing: machine (Pin, SPI), framebuf (pure Python, slow but complete
+enough for the driver) and the MicroPython time functions.
+"""
+
+import sys
+import time
+
+# Driver commands the emulator understands
+CASET = 0x2A
+RASET = 0x2B
+RAMWR = 0x2C
+MADCTL = 0x36
+VSCRDEF = 0x33
+VSCSAD = 0x37
+
+# MADCTL bits
+MY = 0x80
+MX = 0x40
+MV = 0x20
+BGR = 0x08
+
+# Public TFT methods profile() attributes traffic to
+PRIMITIVES = ('pixel', 'text', 'char', 'line', 'vline', 'hline', 'rect',
+              'fillrect', 'circle', 'fillcircle', 'fill', 'image', 'terminal',
+              'terminal_reset', 'flush', 'swap', 'vscroll', 'rotation', 'blitruns')
+
+_here = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+LIB = _here + '/../micropython/lib'
+
+
+class FakePin:
+    """machine.Pin replacement. Calls watch(pin, value) on every change."""
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None, **kwargs):
+        self.id = id
+        self.v = 0 if value is None else value
+        self.watch = None
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def __call__(self, value=None):
+        if value is None:
+            return self.v
+        value = 1 if value else 0
+        if value != self.v:
+            self.v = value
+            if self.watch is not None:
+                self.watch(self, value)
+
+    def value(self, value=None):
+        return self(value)
+
+    def on(self):
+        self(1)
+
+    def off(self):
+        self(0)
+
+
+class FakeSPI:
+    """machine.SPI replacement. Writes go to the attached Emulator, if any."""
+
+    def __init__(self, id=1, *args, **kwargs):
+        self.id = id
+        self.sink = None
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        if self.sink is not None:
+            self.sink._write(buf)
+
+    def read(self, n, write=0):
+        return bytes(n)
+
+    def readinto(self, buf, write=0):
+        for i in range(len(buf)):
+            buf[i] = 0
+
+
+def install():
+    """
+    Make the driver importable on a host: put micropython/lib on sys.path and
+    provide machine, framebuf and the time functions if they are missing.
+    """
+    for path in (LIB, _here):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    try:
+        import machine
+        ok = hasattr(machine, 'Pin') and hasattr(machine, 'SPI')
+    except ImportError:
+        ok = False
+    if not ok:
+        import emumachine
+        sys.modules['machine'] = emumachine
+    try:
+        import framebuf
+    except ImportError:
+        import emuframebuf
+        sys.modules['framebuf'] = emuframebuf
+    # CPython's time lacks the MicroPython tick functions
+    if not hasattr(time, 'ticks_us'):
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+        time.sleep_us = lambda us: time.sleep(us / 1000000)
+        time.ticks_ms = lambda: int(time.perf_counter() * 1000)
+        time.ticks_us = lambda: int(time.perf_counter() * 1000000)
+        time.ticks_diff = lambda a, b: a - b
+        time.ticks_add = lambda a, b: a + b
+
+
+def _newcounter():
+    return {'calls': 0, 'bytes': 0, 'pixels': 0, 'commands': 0,
+            'transactions': 0, 'cs_toggles': 0, 'us': 0}
+
+
+class Emulator:
+    """
+    Simulated ST7735 display RAM fed by the SPI traffic of a TFT instance.
+    """
+
+    def __init__(self, width=128, height=160):
+        """
+        Args:
+            width, height (int): Size of the display RAM in portrait orientation.
+                Use 132, 162 to emulate panels driven with a RAM offset.
+        """
+        install()
+        self.width = width
+        self.height = height
+        self.gram = bytearray(width * height * 2)
+        self.madctl = 0
+        self.tfa = 0                  # Vertical scroll definition
+        self.vsa = height
+        self.ssa = 0                  # Vertical scroll start address
+        self.cs = None
+        self.dc = None
+        self._cmd = None
+        self._param = bytearray()
+        self._col = (0, width - 1)
+        self._row = (0, height - 1)
+        self._ptr = None              # Next RAMWR pixel (column, row) in window coordinates
+        self._odd = None              # First byte of a pixel split across writes
+        self.clipped = 0              # Pixels written outside the display RAM
+        self.stray = 0                # Bytes written while CS was high
+        self.reset_stats()
+        self._current = '-'
+        self._depth = 0
+
+    def display(self, init='initr', rotation=1):
+        """
+        Create a TFT on fake pins and SPI, initialize it like bot.display does.
+
+        Returns:
+            TFT: The driver instance, attached to this emulator
+        """
+        from ST7735 import TFT
+        tft = TFT(FakeSPI(1), 12, 27, 26)
+        self.attach(tft)
+        getattr(tft, init)()
+        tft.rgb(True)
+        tft.rotation(rotation)
+        self.reset_stats()
+        return tft
+
+    def attach(self, tft):
+        """Decode the traffic of an existing TFT, its spi, dc and cs must be fakes"""
+        self.dc = tft.dc
+        self.cs = tft.cs
+        self.cs.watch = self._cswatch
+        tft.spi.sink = self
+
+    # Profiling
+
+    def profile(self, tft, names=PRIMITIVES):
+        """
+        Attribute traffic to the outermost public primitive being called.
+        Wraps the methods on the instance, the driver class stays untouched.
+        """
+        for name in names:
+            method = getattr(tft, name, None)
+            if method is not None:
+                setattr(tft, name, self._wrap(name, method))
+
+    def _wrap(self, name, method):
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                return method(*args, **kwargs)
+            self._current = name
+            self._depth = 1
+            t = time.ticks_us()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                c = self._counter()
+                c['us'] += time.ticks_diff(time.ticks_us(), t)
+                c['calls'] += 1
+                self._depth = 0
+                self._current = '-'
+        return wrapper
+
+    def _counter(self):
+        c = self.counters.get(self._current)
+        if c is None:
+            c = self.counters[self._current] = _newcounter()
+        return c
+
+    def reset_stats(self):
+        """Clear all counters"""
+        self.counters = {}
+
+    def stats(self):
+        """
+        Returns:
+            dict: Primitive name -> counters, '-' is traffic outside any
+                profiled primitive, 'total' sums up everything
+        """
+        total = _newcounter()
+        for c in self.counters.values():
+            for k in total:
+                total[k] += c[k]
+        s = dict(self.counters)
+        s['total'] = total
+        return s
+
+    def report(self):
+        """Print the counters as a table"""
+        s = self.stats()
+        keys = ('calls', 'bytes', 'pixels', 'commands', 'transactions', 'cs_toggles', 'us')
+        print('%-14s' % 'primitive' + ''.join('%13s' % k for k in keys))
+        for name in sorted(s):
+            if name != 'total':
+                print('%-14s' % name + ''.join('%13d' % s[name][k] for k in keys))
+        print('%-14s' % 'total' + ''.join('%13d' % s['total'][k] for k in keys))
+
+    # SPI decoding
+
+    def _cswatch(self, pin, value):
+        c = self._counter()
+        c['cs_toggles'] += 1
+        if not value:
+            c['transactions'] += 1
+
+    def _write(self, buf):
+        if self.cs is not None and self.cs.v:
+            self.stray += len(buf)
+            return
+        c = self._counter()
+        c['bytes'] += len(buf)
+        if not self.dc.v:
+            # Command bytes, every byte starts a new command
+            c['commands'] += len(buf)
+            self._cmd = buf[-1]
+            self._param = bytearray()
+            self._ptr = None
+            self._odd = None
+            return
+        cmd = self._cmd
+        if cmd == RAMWR:
+            c['pixels'] += self._pixels(buf)
+            return
+        self._param.extend(buf)
+        p = self._param
+        if cmd == CASET and len(p) >= 4:
+            self._col = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif cmd == RASET and len(p) >= 4:
+            self._row = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif cmd == MADCTL and len(p) >= 1:
+            self.madctl = p[0]
+        elif cmd == VSCRDEF and len(p) >= 6:
+            self.tfa = (p[0] << 8) | p[1]
+            self.vsa = (p[2] << 8) | p[3]
+        elif cmd == VSCSAD and len(p) >= 2:
+            self.ssa = (p[0] << 8) | p[1]
+
+    def _pixels(self, buf):
+        """Store RAMWR data, the column advances first, then the row"""
+        if self._ptr is None:
+            self._ptr = [self._col[0], self._row[0]]
+        ptr = self._ptr
+        c0, c1 = self._col
+        r1 = self._row[1]
+        i = 0
+        n = len(buf)
+        count = 0
+        if self._odd is not None:
+            buf = bytes([self._odd]) + bytes(buf)
+            n += 1
+            self._odd = None
+        while i + 1 < n:
+            if ptr[1] <= r1:
+                self._store(ptr[0], ptr[1], buf[i], buf[i + 1])
+                count += 1
+            ptr[0] += 1
+            if ptr[0] > c1:
+                ptr[0] = c0
+                ptr[1] += 1
+            i += 2
+        if i < n:
+            self._odd = buf[i]
+        return count
+
+    def _physical(self, col, row):
+        """Map a column/row address to a display RAM position using MADCTL"""
+        m = self.madctl
+        if m & MV:
+            col, row = row, col
+        if m & MX:
+            col = self.width - 1 - col
+        if m & MY:
+            row = self.height - 1 - row
+        return col, row
+
+    def _store(self, col, row, hi, lo):
+        x, y = self._physical(col, row)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = (y * self.width + x) * 2
+            self.gram[i] = hi
+            self.gram[i + 1] = lo
+        else:
+            self.clipped += 1
+
+    # Reading the screen
+
+    def _scanout(self, y):
+        """Display RAM row shown on panel row y, following the vertical scroll"""
+        tfa = self.tfa
+        vsa = self.vsa
+        if tfa <= y < tfa + vsa and vsa:
+            return tfa + (y - tfa + self.ssa - tfa) % vsa
+        return y
+
+    def panel(self, x, y):
+        """RGB565 value shown at panel position x, y in portrait orientation"""
+        y = self._scanout(y)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        i = (y * self.width + x) * 2
+        return (self.gram[i] << 8) | self.gram[i + 1]
+
+    def size(self):
+        """Size of the screen in drawing orientation (as set by MADCTL)"""
+        if self.madctl & MV:
+            return self.height, self.width
+        return self.width, self.height
+
+    def pixel(self, x, y):
+        """RGB565 value shown at x, y in drawing orientation"""
+        px, py = self._physical(x, y)
+        return self.panel(px, py)
+
+    def rgb(self, color):
+        """Convert a RGB565 value to an (r, g, b) tuple as the panel shows it"""
+        r = (color >> 11) & 0x1F
+        g = (color >> 5) & 0x3F
+        b = color & 0x1F
+        r = (r << 3) | (r >> 2)
+        g = (g << 2) | (g >> 4)
+        b = (b << 3) | (b >> 2)
+        if self.madctl & BGR:
+            r, b = b, r
+        return r, g, b
+
+    def rows(self, logical=True, scale=1):
+        """
+        Yield the screen as RGB888 rows.
+
+        Args:
+            logical (bool): Drawing orientation, False for the portrait panel
+            scale (int): Pixel repetition factor
+        """
+        w, h = self.size() if logical else (self.width, self.height)
+        get = self.pixel if logical else self.panel
+        for y in range(h):
+            row = bytearray(w * 3 * scale)
+            i = 0
+            for x in range(w):
+                r, g, b = self.rgb(get(x, y))
+                for _ in range(scale):
+                    row[i] = r
+                    row[i + 1] = g
+                    row[i + 2] = b
+                    i += 3
+            for _ in range(scale):
+                yield row
+
+    def save_png(self, path, logical=True, scale=1):
+        """Save the screen as a PNG file"""
+        w, h = self.size() if logical else (self.width, self.height)
+        write_png(path, w * scale, h * scale, self.rows(logical, scale))
+
+
+# PNG writer without zlib: the image data is stored in uncompressed deflate blocks
+
+_crctable = None
+
+def _crc32(data, crc=0):
+    global _crctable
+    if _crctable is None:
+        _crctable = []
+        for n in range(256):
+            c = n
+            for _ in range(8):
+                c = (0xEDB88320 ^ (c >> 1)) if c & 1 else (c >> 1)
+            _crctable.append(c)
+    crc ^= 0xFFFFFFFF
+    for b in data:
+        crc = _crctable[(crc ^ b) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+def _chunk(f, kind, data):
+    f.write(len(data).to_bytes(4, 'big'))
+    f.write(kind)
+    f.write(data)
+    f.write(_crc32(data, _crc32(kind)).to_bytes(4, 'big'))
+
+def write_png(path, width, height, rows):
+    """
+    Write an RGB888 PNG file.
+
+    Args:
+        rows: Iterable of height rows with width * 3 bytes each
+    """
+    raw = bytearray()
+    for row in rows:
+        raw.append(0)                 # Filter type none
+        raw.extend(row)
+    z = bytearray(b'\x78\x01')        # zlib header, no compression
+    a1, a2 = 1, 0
+    for b in raw:
+        a1 = (a1 + b) % 65521
+        a2 = (a2 + a1) % 65521
+    pos = 0
+    while True:
+        block = raw[pos:pos + 65535]
+        pos += len(block)
+        final = pos >= len(raw)
+        n = len(block)
+        z.append(1 if final else 0)
+        z.extend(n.to_bytes(2, 'little'))
+        z.extend((n ^ 0xFFFF).to_bytes(2, 'little'))
+        z.extend(block)
+        if final:
+            break
+    z.extend(((a2 << 16) | a1).to_bytes(4, 'big'))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        _chunk(f, b'IHDR', width.to_bytes(4, 'big') + height.to_bytes(4, 'big') + bytes([8, 2, 0, 0, 0]))
+        _chunk(f, b'IDAT', z)
+        _chunk(f, b'IEND', b'')
+
+
+# Importing the emulator is enough to make the driver importable
+install()
@@ -0,0 +1,163 @@
+# Call with python3 convert_animation.py <input> [more inputs] [options]
+# Example: python3 convert_animation.py path/to/blink.gif
+# Example: python3 convert_animation.py face1.png face2.png face3.png --fps 8
+# Example: python3 convert_animation.py walk.png --frames 8 --keyframe 4   (sprite sheet)
+# Output in the same directory as the first input file: blink.anm
+
+import argparse
+import os.path
+import struct
+from PIL import Image, ImageSequence
+
+"""
+Converts an animated GIF/PNG, a list of images or a sprite sheet (frames side
+by side) to the animation format played by micropython/lib/animation.py and
+bot.animate(). Each frame only stores the rectangles that changed since the
+previous frame, so small moving parts like blinking eyes need few bytes and
+little display bandwidth. Keyframes store the whole frame; the player can
+jump to them when it falls behind.
+
+Output File Format (e.g., blink.anm), all numbers big-endian:
+- Bytes 0-3: Magic b'XWKA'
+- Byte 4: Version (1)
+- Byte 5: Reserved (0)
+- Bytes 6-7: Width, bytes 8-9: Height
+- Bytes 10-11: Number of frames
+- Bytes 12-15: Reserved (0)
+- Frame table, 8 bytes per frame: 32 bit file offset of the frame,
+  16 bit delay in ms until the next frame, flags (bit 0 = keyframe), 0
+- Frame: 16 bit number of rectangles, then per rectangle x, y, width and
+  height (16 bit each) followed by its RGB565 pixels row by row
+"""
+
+MAGIC = b'XWKA'
+VERSION = 1
+HEADER = 16
+KEYFRAME = 0x01
+
+
+def rgb565(img):
+    """Pixels of an image as a list of RGB565 values, row by row"""
+    pixels = []
+    for r, g, b in img.convert("RGB").getdata():
+        pixels.append(((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3))
+    return pixels
+
+
+def changed_rects(prev, cur, width, height, gap):
+    """
+    Rectangles covering the pixels that differ between two frames. Rows with
+    changes are grouped into bands, bands closer than gap rows are merged
+    because every rectangle costs a display window and 8 bytes of header.
+    """
+    rects = []
+    band = None     # [y0, y1, x0, x1]
+    for y in range(height):
+        row = y * width
+        xs = [x for x in range(width) if prev[row + x] != cur[row + x]]
+        if not xs:
+            continue
+        if band is not None and y - band[1] <= gap:
+            band[1] = y
+            band[2] = min(band[2], xs[0])
+            band[3] = max(band[3], xs[-1])
+        else:
+            if band is not None:
+                rects.append(band)
+            band = [y, y, xs[0], xs[-1]]
+    if band is not None:
+        rects.append(band)
+    return [(x0, y0, x1 - x0 + 1, y1 - y0 + 1) for y0, y1, x0, x1 in rects]
+
+
+def encode_frame(pixels, width, rects):
+    """Frame data: rectangle count, then each rectangle with its pixels"""
+    data = bytearray(struct.pack(">H", len(rects)))
+    for x, y, w, h in rects:
+        data += struct.pack(">HHHH", x, y, w, h)
+        for yy in range(y, y + h):
+            for p in pixels[yy * width + x:yy * width + x + w]:
+                data += struct.pack(">H", p)
+    return bytes(data)
+
+
+def write_animation(path, frames, width, height, keyframe=0, gap=4):
+    """
+    Write an animation file.
+
+    Args:
+        frames: list of (pixels, delay in ms)
+        keyframe: Store every keyframe-th frame whole, 0 for only the first
+        gap: Merge changed row bands closer than this
+
+    Returns:
+        tuple: Number of keyframes and file size
+    """
+    table = bytearray()
+    data = bytearray()
+    offset = HEADER + 8 * len(frames)
+    keyframes = 0
+    full = [(0, 0, width, height)]
+    prev = None
+    for i, (pixels, delay) in enumerate(frames):
+        key = prev is None or (keyframe and i % keyframe == 0)
+        rects = full if key else changed_rects(prev, pixels, width, height, gap)
+        if not key and sum(w * h for x, y, w, h in rects) >= width * height:
+            # Changes cover the whole frame anyway
+            rects = full
+            key = True
+        keyframes += key
+        table += struct.pack(">IHBB", offset + len(data), min(delay, 0xFFFF), KEYFRAME if key else 0, 0)
+        data += encode_frame(pixels, width, rects)
+        prev = pixels
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(bytes([VERSION, 0]))
+        f.write(struct.pack(">HHH", width, height, len(frames)))
+        f.write(bytes(4))
+        f.write(table)
+        f.write(data)
+    return keyframes, offset + len(data)
+
+
+def read_frames(paths, sheet_frames, fps):
+    """Frames of the input files as (width, height, [(pixels, delay)])"""
+    frames = []
+    default = 1000 // fps if fps else 100
+    for path in paths:
+        img = Image.open(path)
+        if sheet_frames:
+            # Sprite sheet, frames side by side
+            w = img.width // sheet_frames
+            for i in range(sheet_frames):
+                frames.append((img.crop((i * w, 0, (i + 1) * w, img.height)), default))
+        else:
+            for frame in ImageSequence.Iterator(img):
+                delay = default if fps else frame.info.get("duration", default) or default
+                frames.append((frame.copy(), delay))
+    width, height = frames[0][0].size
+    for img, delay in frames:
+        if img.size != (width, height):
+            raise SystemExit(f"All frames must be {width}x{height}, found {img.size[0]}x{img.size[1]}")
+    return width, height, [(rgb565(img), delay) for img, delay in frames]
+
+
+# Set up argument parser
+parser = argparse.ArgumentParser(description="Convert images to the animation format of bot.animate().")
+parser.add_argument("input_paths", nargs='+', help="Animated GIF/PNG, single frame images or a sprite sheet")
+parser.add_argument("--frames", type=int, default=0, help="Number of frames side by side in a sprite sheet")
+parser.add_argument("--fps", type=int, default=0, help="Frame rate, default: GIF frame durations or 10")
+parser.add_argument("--keyframe", type=int, default=0, help="Store every n-th frame whole (default: only the first)")
+parser.add_argument("--gap", type=int, default=4, help="Merge changed areas closer than this many rows (default 4)")
+args = parser.parse_args()
+
+input_dir = os.path.dirname(args.input_paths[0])
+input_basename = os.path.splitext(os.path.basename(args.input_paths[0]))[0]
+output_path = os.path.join(input_dir, f"{input_basename}.anm")
+
+width, height, frames = read_frames(args.input_paths, args.frames, args.fps)
+keyframes, size = write_animation(output_path, frames, width, height, args.keyframe, args.gap)
+
+print(f"Converted {len(frames)} frames of {width}x{height}, {keyframes} keyframes, {size} bytes "
+      f"(raw frames would be {len(frames) * width * height * 2} bytes)")
+print(f"Output saved to: {output_path}")
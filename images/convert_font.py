@@ -0,0 +1,246 @@
+# Call with python3 convert_font.py <font> [options]
+# Example: python3 convert_font.py path/to/DejaVuSans.ttf --size 12 16 --proportional
+# Example: python3 convert_font.py path/to/6x13.bdf
+# Example: python3 convert_font.py --sysfont      (sysfont.py as binary font)
+# Output in the same directory as the input file: DejaVuSans_12.fnt, DejaVuSans_16.fnt, 6x13_13.fnt
+
+import argparse
+import os.path
+import struct
+
+"""
+Converts a BDF or TTF/OTF font to the binary font format read by
+micropython/lib/binfont.py. Glyphs are stored as columns of pixels, so the
+driver can read single glyphs from flash instead of keeping the font in RAM.
+TTF/OTF fonts need Pillow and produce one file per --size, BDF fonts have a
+fixed size and are read without extra packages.
+
+Output File Format (e.g., DejaVuSans_16.fnt), all numbers big-endian:
+- Bytes 0-3: Magic b'XWKF'
+- Byte 4: Version (1)
+- Byte 5: Height in pixels
+- Byte 6: Width of the widest glyph
+- Byte 7: Flags, bit 0 = proportional
+- Bytes 8-9: First character code
+- Bytes 10-11: Last character code
+- Bytes 12-15: Reserved (0)
+- Index: 4 bytes per character from first to last, 24 bit file offset of the
+  glyph data (0 = no glyph) and 8 bit glyph width
+- Glyph data: column after column, (height + 7) // 8 bytes per column,
+  bit 0 of the first byte is the top pixel
+
+The display driver adds a blank column after each character, so glyph
+widths are the advance width minus one.
+"""
+
+MAGIC = b'XWKF'
+VERSION = 1
+PROPORTIONAL = 0x01
+
+
+def pack_columns(rows, width, height):
+    """Pack a glyph given as rows of 0/1 values into column bytes"""
+    bpc = (height + 7) // 8
+    data = bytearray()
+    for x in range(width):
+        col = 0
+        for y in range(height):
+            if x < len(rows[y]) and rows[y][x]:
+                col |= 1 << y
+        data += col.to_bytes(bpc, 'little')
+    return bytes(data)
+
+
+def write_font(path, height, glyphs, proportional):
+    """
+    Write a font file.
+
+    Args:
+        glyphs: dict of character code -> (width, rows), rows are height
+            lists of 0/1 values
+    """
+    first = min(glyphs)
+    last = max(glyphs)
+    if last > 0xFFFF or height > 255:
+        raise ValueError("Character codes must be < 65536 and height < 256")
+    maxw = max(w for w, rows in glyphs.values())
+    if not proportional:
+        glyphs = {c: (maxw, rows) for c, (w, rows) in glyphs.items()}
+    count = last - first + 1
+    index = bytearray()
+    data = bytearray()
+    offset = 16 + 4 * count
+    for code in range(first, last + 1):
+        g = glyphs.get(code)
+        if g is None:
+            index += bytes(4)
+            continue
+        width, rows = g
+        if width > 255:
+            raise ValueError("Glyph %d is wider than 255 pixels" % code)
+        index += (offset + len(data)).to_bytes(3, 'big') + bytes([width])
+        data += pack_columns(rows, width, height)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(bytes([VERSION, height, maxw, PROPORTIONAL if proportional else 0]))
+        f.write(struct.pack(">HH", first, last))
+        f.write(bytes(4))
+        f.write(index)
+        f.write(data)
+    return count, len(data)
+
+
+def trim(rows, width):
+    """Width without blank columns on the right, at least 1"""
+    while width > 1 and not any(row[width - 1] if width - 1 < len(row) else 0 for row in rows):
+        width -= 1
+    return width
+
+
+def read_bdf(path, first, last, proportional):
+    """Read a BDF bitmap font, returns (height, glyphs)"""
+    glyphs = {}
+    ascent = descent = None
+    bbox = None
+    with open(path, encoding='latin-1') as f:
+        lines = iter(f.read().splitlines())
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        key = parts[0]
+        if key == 'FONTBOUNDINGBOX':
+            bbox = [int(v) for v in parts[1:5]]
+        elif key == 'FONT_ASCENT':
+            ascent = int(parts[1])
+        elif key == 'FONT_DESCENT':
+            descent = int(parts[1])
+        elif key == 'STARTCHAR':
+            if ascent is None:
+                # No font properties, use the bounding box
+                ascent = bbox[1] + bbox[3]
+                descent = -bbox[3]
+            height = ascent + descent
+            code = None
+            dwidth = None
+            gbox = None
+            bitmap = []
+            for line in lines:
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == 'ENCODING':
+                    code = int(parts[1])
+                elif parts[0] == 'DWIDTH':
+                    dwidth = int(parts[1])
+                elif parts[0] == 'BBX':
+                    gbox = [int(v) for v in parts[1:5]]
+                elif parts[0] == 'BITMAP':
+                    for line in lines:
+                        if line.strip() == 'ENDCHAR':
+                            break
+                        bitmap.append(int(line.strip(), 16) if line.strip() else 0)
+                    break
+            if code is None or not (first <= code <= last):
+                continue
+            w, h, xoff, yoff = gbox
+            if dwidth is None:
+                dwidth = w + xoff
+            width = max(1, dwidth - 1)
+            cell = max(width, w + max(xoff, 0))
+            rows = [[0] * cell for _ in range(height)]
+            nbits = ((w + 7) // 8) * 8
+            top = ascent - (yoff + h)
+            for gy, bits in enumerate(bitmap[:h]):
+                y = top + gy
+                if not 0 <= y < height:
+                    continue
+                for gx in range(w):
+                    x = gx + xoff
+                    if 0 <= x < cell and bits & (1 << (nbits - 1 - gx)):
+                        rows[y][x] = 1
+            if proportional and code != 32:
+                width = trim(rows, cell)
+            glyphs[code] = (width, rows)
+    return ascent + descent, glyphs
+
+
+def read_ttf(path, size, first, last, proportional):
+    """Render a TrueType/OpenType font with Pillow, returns (height, glyphs)"""
+    from PIL import Image, ImageDraw, ImageFont
+    font = ImageFont.truetype(path, size)
+    ascent, descent = font.getmetrics()
+    height = ascent + descent
+    glyphs = {}
+    for code in range(first, last + 1):
+        ch = chr(code)
+        advance = int(round(font.getlength(ch)))
+        if advance <= 0:
+            continue
+        left = min(0, font.getbbox(ch)[0])
+        cell = advance - left + size
+        img = Image.new('1', (cell, height), 0)
+        ImageDraw.Draw(img).text((-left, 0), ch, font=font, fill=1)
+        rows = [[1 if img.getpixel((x, y)) else 0 for x in range(cell)] for y in range(height)]
+        width = max(1, advance - 1)
+        if proportional and code != 32:
+            width = max(1, trim(rows, cell))
+        glyphs[code] = (width, rows)
+    return height, glyphs
+
+
+def read_sysfont(path):
+    """Read the sysfont dict from micropython/lib/sysfont.py, returns (height, glyphs)"""
+    scope = {}
+    with open(path) as f:
+        exec(f.read(), scope)
+    font = scope['sysfont']
+    w = font['Width']
+    h = font['Height']
+    data = font['Data']
+    glyphs = {}
+    for code in range(font['Start'], font['End'] + 1):
+        cols = data[(code - font['Start']) * w:(code - font['Start'] + 1) * w]
+        if len(cols) < w:
+            # 'End' of sysfont is one past its data
+            break
+        rows = [[(cols[x] >> y) & 1 for x in range(w)] for y in range(h)]
+        glyphs[code] = (w, rows)
+    return h, glyphs
+
+
+# Set up argument parser
+parser = argparse.ArgumentParser(description="Convert a BDF or TTF font to the binary font format of binfont.py.")
+parser.add_argument("input_path", nargs='?', help="Path to the font file (.bdf, .ttf or .otf)")
+parser.add_argument("--size", type=int, nargs='+', default=[16], help="Pixel sizes for TTF/OTF fonts, one file each")
+parser.add_argument("--first", type=int, default=32, help="First character code (default 32)")
+parser.add_argument("--last", type=int, default=126, help="Last character code (default 126)")
+parser.add_argument("--proportional", action='store_true', help="Trim glyphs to their width instead of a fixed cell")
+parser.add_argument("--sysfont", action='store_true', help="Convert micropython/lib/sysfont.py")
+args = parser.parse_args()
+
+if args.sysfont:
+    here = os.path.dirname(os.path.abspath(__file__))
+    source = os.path.join(here, '..', 'micropython', 'lib', 'sysfont.py')
+    fonts = [(os.path.join(here, 'sysfont.fnt'), read_sysfont(source))]
+elif not args.input_path:
+    parser.error("input_path is required unless --sysfont is given")
+else:
+    input_dir = os.path.dirname(args.input_path)
+    input_basename, ext = os.path.splitext(os.path.basename(args.input_path))
+    fonts = []
+    if ext.lower() == '.bdf':
+        height, glyphs = read_bdf(args.input_path, args.first, args.last, args.proportional)
+        fonts.append((os.path.join(input_dir, f"{input_basename}_{height}.fnt"), (height, glyphs)))
+    else:
+        for size in args.size:
+            height, glyphs = read_ttf(args.input_path, size, args.first, args.last, args.proportional)
+            fonts.append((os.path.join(input_dir, f"{input_basename}_{size}.fnt"), (height, glyphs)))
+
+for output_path, (height, glyphs) in fonts:
+    if not glyphs:
+        print(f"No glyphs in range for {output_path}")
+        continue
+    count, nbytes = write_font(output_path, height, glyphs, args.proportional)
+    print(f"Converted font, height {height}, {len(glyphs)} of {count} characters, {nbytes} bytes of glyph data")
+    print(f"Output saved to: {output_path}")
@@ -1,4 +1,4 @@
-# Call with python3 convert_to_rgb565.py <input_image_path>
+# Call with python3 convert_to_rgb565.py <input_image_path> [--format auto|raw|rle|palette]
 # Example: python3 convert_to_rgb565.py path/to/logo.png
 # Output in the same directory as the input file: logo.bin
 
@@ -25,11 +25,98 @@ Example:
   - Header: 4 bytes (width=25, height=6)
   - Pixel data: 25 * 6 * 2 = 300 bytes
   - Total file size: 4 + 300 = 304 bytes
+
+Compressed formats (read by micropython/lib/imagefile.py, all numbers big-endian):
+- Bytes 0-3: Magic b'XWKI' (a raw file never starts with it, its width is < 1000)
+- Byte 4: Format, 1 = RLE, 2 = palette
+- Byte 5: Bits per pixel, 16 for RLE, 1, 2, 4 or 8 for palette
+- Bytes 6-7: Width, bytes 8-9: Height
+- Bytes 10-11: Number of palette colours (0 for RLE)
+- Palette: 2 bytes RGB565 per colour
+- RLE data: packets that never span two rows. Header byte n: bit 7 set means
+  the next pixel repeats (n & 0x7F) + 1 times, otherwise (n & 0x7F) + 1
+  literal pixels follow
+- Palette data: rows of palette indices, the first pixel in the high bits of
+  a byte, each row starts at a new byte
+
+With --format auto (the default) the smallest of the formats is written,
+the raw format if nothing is smaller.
 """
 
+MAGIC = b'XWKI'
+RLE = 1
+PALETTE = 2
+
+
+def header(fmt, bpp, width, height, colors):
+    """Header of a compressed file"""
+    return MAGIC + struct.pack(">BBHHH", fmt, bpp, width, height, colors)
+
+
+def encode_raw(pixels, width, height):
+    """Raw format: size header and the RGB565 pixels"""
+    data = bytearray(struct.pack(">HH", width, height))
+    for p in pixels:
+        data += struct.pack(">H", p)
+    return bytes(data)
+
+
+def encode_rle(pixels, width, height):
+    """Run-length encoded RGB565, runs of 2 or more equal pixels are packed"""
+    data = bytearray(header(RLE, 16, width, height, 0))
+    for y in range(height):
+        row = pixels[y * width:(y + 1) * width]
+        x = 0
+        literal = []
+        while x < width:
+            n = 1
+            while x + n < width and n < 128 and row[x + n] == row[x]:
+                n += 1
+            if n >= 2:
+                if literal:
+                    data += pack_literal(literal)
+                    literal = []
+                data.append(0x80 | (n - 1))
+                data += struct.pack(">H", row[x])
+            else:
+                literal.append(row[x])
+                if len(literal) == 128:
+                    data += pack_literal(literal)
+                    literal = []
+            x += n
+        if literal:
+            data += pack_literal(literal)
+    return bytes(data)
+
+
+def pack_literal(literal):
+    """One literal packet"""
+    return bytes([len(literal) - 1]) + b"".join(struct.pack(">H", p) for p in literal)
+
+
+def encode_palette(pixels, width, height):
+    """Palette format with as few bits per pixel as the colours need, None for more than 256 colours"""
+    colors = sorted(set(pixels))
+    if len(colors) > 256:
+        return None
+    bpp = next(b for b in (1, 2, 4, 8) if len(colors) <= 1 << b)
+    index = {c: i for i, c in enumerate(colors)}
+    data = bytearray(header(PALETTE, bpp, width, height, len(colors)))
+    for c in colors:
+        data += struct.pack(">H", c)
+    for y in range(height):
+        row = bytearray((width * bpp + 7) // 8)
+        for x in range(width):
+            bit = x * bpp
+            row[bit >> 3] |= index[pixels[y * width + x]] << (8 - bpp - (bit & 7))
+        data += row
+    return bytes(data)
+
 # Set up argument parser
 parser = argparse.ArgumentParser(description="Convert an image to RGB565 binary format for ST7735 display.")
 parser.add_argument("input_path", help="Path to the input image file (e.g., logo.png)")
+parser.add_argument("--format", choices=["auto", "raw", "rle", "palette"], default="auto",
+                    help="Output format, auto picks the smallest (default)")
 args = parser.parse_args()
 
 # Get the input path and derive the output path
@@ -44,28 +131,42 @@ output_path = os.path.join(input_dir, f"{input_basename}.bin")
 img = Image.open(input_path).convert("RGB")
 width, height = img.size
 
-# Open a binary file to write the RGB565 data with a header
+# Convert the pixels to RGB565
+pixels = []
+for y in range(height):
+    for x in range(width):
+        # Get the RGB values of the pixel
+        r, g, b = img.getpixel((x, y))
+        # Convert to RGB565
+        # R (5 bits): Take the 5 most significant bits of red
+        # G (6 bits): Take the 6 most significant bits of green
+        # B (5 bits): Take the 5 most significant bits of blue
+        r = (r >> 3) & 0x1F  # 5 bits
+        g = (g >> 2) & 0x3F  # 6 bits
+        b = (b >> 3) & 0x1F  # 5 bits
+        # Combine into a 16-bit value: RRRRRGGG GGGBBBBB
+        rgb565 = (r << 11) | (g << 5) | b
+        pixels.append(rgb565)
+
+# Encode in the requested formats, auto tries all and keeps the smallest
+encoders = {"raw": encode_raw, "rle": encode_rle, "palette": encode_palette}
+names = list(encoders) if args.format == "auto" else [args.format]
+results = {}
+for name in names:
+    data = encoders[name](pixels, width, height)
+    if data is None:
+        print(f"{name}: not possible, the image has more than 256 colours")
+        continue
+    results[name] = data
+    print(f"{name}: {len(data)} bytes")
+if not results:
+    raise SystemExit("No output format possible")
+# min() keeps the first of equal sizes, so raw wins a tie
+best = min(results, key=lambda n: len(results[n]))
+
+# Open a binary file to write the image data with a header
 with open(output_path, "wb") as f:
-    # Write the header: width and height as 16-bit unsigned integers (big-endian)
-    f.write(struct.pack(">H", width))  # Width (2 bytes)
-    f.write(struct.pack(">H", height))  # Height (2 bytes)
+    f.write(results[best])
 
-    # Convert and write the pixel data as RGB565
-    for y in range(height):
-        for x in range(width):
-            # Get the RGB values of the pixel
-            r, g, b = img.getpixel((x, y))
-            # Convert to RGB565
-            # R (5 bits): Take the 5 most significant bits of red
-            # G (6 bits): Take the 6 most significant bits of green
-            # B (5 bits): Take the 5 most significant bits of blue
-            r = (r >> 3) & 0x1F  # 5 bits
-            g = (g >> 2) & 0x3F  # 6 bits
-            b = (b >> 3) & 0x1F  # 5 bits
-            # Combine into a 16-bit value: RRRRRGGG GGGBBBBB
-            rgb565 = (r << 11) | (g << 5) | b
-            # Write as two bytes (big-endian)
-            f.write(struct.pack(">H", rgb565))  # 16-bit unsigned short
-
-print(f"Converted image to RGB565 with header. Width: {width}, Height: {height}")
+print(f"Converted image to {best} format with header. Width: {width}, Height: {height}")
 print(f"Output saved to: {output_path}")
@@ -1,4 +1,5 @@
-import bot                      # Load the 'lib/bot.py' library which contains all XWK-Bot functions
+import bot                      # Load the 'lib/bot/' package which contains all XWK-Bot functions
+bot.warmup('display', 'buttons')  # Set up what the boot screen and the menu need now, other hardware on first use
 
 bot.shutup()                    # Make sure the beeper is silent
 bot.stop()                      # Make sure motors are stopped
@@ -18,4 +19,9 @@ import ota_check
 ota_check.check_and_update()    # Try OTA update 3 timeswhen ota_flag.txt is found
 
 import menu                     # Load the 'lib/menuy.py' library
+
+import gc, time
+gc.collect()                    # Report boot time and memory, to compare .py with precompiled .mpy files (see ota/ota.md)
+print("Boot to menu: %d ms, free heap: %d bytes" % (time.ticks_ms(), gc.mem_free()))
+
 menu.start()                    # Display the menu
\ No newline at end of file
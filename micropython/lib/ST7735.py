@@ -8,6 +8,16 @@
 import machine
 import time
 from math import sqrt
+from lrucache import LRUCache
+import kernels
+try:
+  import framebuf
+except ImportError:
+  framebuf = None
+try:
+  import _thread
+except ImportError:
+  _thread = None
 
 #TFTRotations and TFTRGB are bits to set
 # on MADCTL to control display rotation/color layout
@@ -38,6 +48,90 @@ def TFTColor( aR, aG, aB ) :
 
 ScreenSize = (128, 160)
 
+def _fontglyph( aFont, aCode ) :
+  '''Width and column data of a character, None if the font lacks it.
+     Fonts are sysfont style dicts or objects with a glyph() method like
+     binfont.BinFont.  Columns hold (Height + 7) // 8 bytes each, bit 0 of
+     the first byte is the top pixel.'''
+  if type(aFont) is dict:
+    start = aFont['Start']
+    if not (start <= aCode <= aFont['End']):
+      return None
+    w = aFont['Width']
+    n = w * ((aFont['Height'] + 7) // 8)
+    ci = (aCode - start) * n
+    data = aFont['Data'][ci:ci + n]
+    #sysfont's 'End' is one character past its data.
+    return (w, data) if len(data) == n else None
+  return aFont.glyph(aCode)
+
+_fonttags = 0 #Last tag handed out by _fonttag().
+
+def _fonttag( aFont ) :
+  '''Number identifying a font in the glyph cache, stored in the font on
+     first use ('Tag' of a dict, tag of a BinFont).  id() can't be used, a
+     font loaded later may get the address of a freed one.'''
+  global _fonttags
+  if type(aFont) is dict:
+    t = aFont.get('Tag')
+    if t is None:
+      _fonttags += 1
+      t = aFont['Tag'] = _fonttags
+  else:
+    t = getattr(aFont, 'tag', None)
+    if t is None:
+      _fonttags += 1
+      t = aFont.tag = _fonttags
+  return t
+
+def _charwidth( aFont, aChar ) :
+  '''Width of a character in font pixels, spacing not included.  Missing
+     characters take the width of the widest glyph.'''
+  if type(aFont) is dict:
+    return aFont['Width']
+  g = aFont.glyph(ord(aChar))
+  return g[0] if g else aFont['Width']
+
+#Counter slots of TFT.instrument().
+_CALLS = 0
+_US = 1
+_COMMANDS = 2
+_DATA = 3
+_TOGGLES = 4
+_TRANSACTIONS = 5
+_STATNAMES = ('calls', 'us', 'commands', 'data', 'cs_toggles', 'transactions')
+
+class _StatPin(object) :
+  '''Pin wrapper used while instrumented.  Remembers the level so the SPI
+     wrapper knows commands from data, and counts CS toggles.'''
+  def __init__( self, aPin, aTFT, aLevel, aCount ) :
+    self.pin = aPin
+    self.tft = aTFT
+    self.level = aLevel
+    self.count = aCount
+
+  def __call__( self, aValue = None ) :
+    if aValue is None:
+      return self.pin()
+    if self.count and aValue != self.level:
+      c = self.tft._statcur
+      c[_TOGGLES] += 1
+      if not aValue:
+        c[_TRANSACTIONS] += 1
+    self.level = aValue
+    self.pin(aValue)
+
+class _StatSPI(object) :
+  '''SPI wrapper used while instrumented, counts command and data bytes.'''
+  def __init__( self, aSPI, aTFT ) :
+    self.spi = aSPI
+    self.tft = aTFT
+
+  def write( self, aData ) :
+    t = self.tft
+    t._statcur[_DATA if t.dc.level else _COMMANDS] += len(aData)
+    self.spi.write(aData)
+
 class TFT(object) :
   """Sainsmart TFT 7735 display driver."""
 
@@ -89,6 +183,31 @@ class TFT(object) :
   GMCTRP1 = 0xE0
   GMCTRN1 = 0xE1
 
+  #Preallocated single byte window commands.
+  _CASET = b'\x2a'
+  _RASET = b'\x2b'
+  _RAMWR = b'\x2c'
+
+  #Dirty rectangles are merged if the union costs at most this many extra
+  # pixels (about the price of one more window set).  No more than
+  # DIRTY_MAX rectangles are kept per frame.
+  DIRTY_SLACK = 64
+  DIRTY_MAX = 8
+
+  #Default byte budget of the rendered glyph cache.
+  GLYPH_CACHE = 4096
+  #Largest text row buffer that is kept between calls (26 characters of
+  # sysfont need 2496 bytes).
+  LINEBUF_MAX = 4096
+  #Pixels held by the reused fill buffer (more than one 160 pixel row).
+  FILLBUF = 256
+  #Default frame rate limit of swap() in double buffered mode, 0 = none.
+  MAX_FPS = 25
+  #Public methods timed by instrument().
+  PRIMITIVES = ('pixel', 'text', 'char', 'line', 'vline', 'hline', 'rect',
+                'fillrect', 'circle', 'fillcircle', 'fill', 'image', 'terminal',
+                'terminal_reset', 'terminal_clear_line', 'flush', 'swap', 'vscroll', 'blitruns')
+
   BLACK = 0
   RED = TFTColor(0xFF, 0x00, 0x00)
   MAROON = TFTColor(0x80, 0x00, 0x00)
@@ -123,12 +242,43 @@ class TFT(object) :
     self.spi = spi
     self.colorData = bytearray(2)
     self.windowLocData = bytearray(4)
+    self._cmd = bytearray(1)           #Command byte for _writecommand.
+    self._fillbuf = None               #Reused by _draw, see _fillbuffer.
+    self._fillmv = None
+    self._fillcount = 0                #Bytes of _fillbuf holding the color.
+    self.transactions = 0              #CS assertions sent to the display.
+    self._fb = None                    #framebuf.FrameBuffer when buffered.
+    self._fbuf = None                  #RGB565 pixel data of the frame buffer.
+    self._dirty = []                   #Changed [x0, y0, x1, y1] since last flush.
+    self.flush_rects = 0               #Rectangles sent by the last flush.
+    self.flush_bytes = 0               #Pixel bytes sent by the last flush.
+    self.glyphs = LRUCache(TFT.GLYPH_CACHE) #Rendered RGB565 glyphs.
+    self._linebuf = None               #Reused by text() to compose a row.
+    self._front = None                 #Copy of the frame buffer being sent.
+    self._pending = None               #Rectangles handed to the flush thread.
+    self._wake = None                  #Lock released to wake the flush thread.
+    self._minframe = 0                 #Milliseconds between two swaps.
+    self._flusherror = None            #Exception of the flush thread, raised by sync().
+    self._lastswap = 0
+    self.swaps = 0                     #Frames handed to the flush thread.
+    self.dropped = 0                   #swap() calls that skipped a frame.
+    self._stats = None                 #Counters per primitive when instrumented.
+    self._statcur = None               #Counters of the running primitive.
+    self._statdepth = 0
 
 # Added by klemens@ull.at 2024-01-28    
     self.terminal_line_height = 10
     self.terminal_max_lines = 13
     self.terminal_current_line = 0    
     self.terminal_current_col = 0
+    self.terminal_scrolling = False    # Scroll instead of clearing when full
+    self._vtop = 0                     # Hardware scroll offset in pixel rows
+    self._termcol = 0                  # Cursor column in characters
+    self._termlines = []               # Ring buffer of [text, colors, font] per line
+    self._termtop = 0                  # Index of the top line in _termlines
+    self._draws = 0                    # Counts drawing, not flushing
+    self._termdraws = 0                # _draws after the last terminal output
+    self._scrolldata = bytearray(2)
 
   def size( self ) :
     return self._size
@@ -136,16 +286,19 @@ class TFT(object) :
 #   @micropython.native
   def on( self, aTF = True ) :
     '''Turn display on or off.'''
+    self.sync()
     self._writecommand(TFT.DISPON if aTF else TFT.DISPOFF)
 
 #   @micropython.native
   def invertcolor( self, aBool ) :
     '''Invert the color data IE: Black = White.'''
+    self.sync()
     self._writecommand(TFT.INVON if aBool else TFT.INVOFF)
 
 #   @micropython.native
   def rgb( self, aTF = True ) :
     '''True = rgb else bgr'''
+    self.sync()
     self._rgb = aTF
     self._setMADCTL()
 
@@ -158,23 +311,327 @@ class TFT(object) :
       self.rotate = aRot
       #If switching from vertical to horizontal swap x,y
       # (indicated by bit 0 changing).
+      self.sync()
       if (rotchange & 1):
         self._size =(self._size[1], self._size[0])
+        #Frame buffer geometry follows the screen, contents are lost.
+        if self._fb is not None:
+          fps = self._fpslimit() if self._front is not None else None
+          self.framebuffer(False)
+          self.framebuffer(True)
+          if fps is not None:
+            self.doublebuffer(True, fps)
       self._setMADCTL()
 
+  def framebuffer( self, aEnable = True ) :
+    '''Enable or disable the off-screen frame buffer.  While enabled all
+       drawing primitives render into a RGB565 buffer in RAM (2 bytes per
+       pixel, 40 KB for 128x160) and nothing is sent to the display until
+       flush() is called.'''
+    if aEnable:
+      if self._fb is None:
+        if framebuf is None:
+          raise RuntimeError("framebuf module not available")
+        w, h = self._size
+        self._fbuf = bytearray(w * h * 2)
+        self._fb = framebuf.FrameBuffer(self._fbuf, w, h, framebuf.RGB565)
+    else:
+      self.doublebuffer(False)
+      self._fb = None
+      self._fbuf = None
+    self._dirty = []
+
+  def buffered( self ) :
+    '''True if drawing goes to the frame buffer.'''
+    return self._fb is not None
+
+  def flush( self, aAll = False ) :
+    '''Send the changed regions of the frame buffer to the display, one
+       window per dirty rectangle.  aAll sends the whole buffer.
+       flush_rects and flush_bytes tell what the flush has cost.'''
+    if self._fb is None:
+      return
+    w = self._size[0]
+    if aAll:
+      self._dirty = [[0, 0, w - 1, self._size[1] - 1]]
+    if self._front is not None:
+      #Double buffered: hand the frame to the flush thread.
+      self.swap(True)
+      return
+    self._sendrects(self._fbuf, self._dirty)
+    self._dirty = []
+
+  def _sendrects( self, aBuf, aRects ) :
+    '''Send the given rectangles of a frame buffer, one window each.'''
+    w = self._size[0]
+    buf = memoryview(aBuf)
+    rects = 0
+    nbytes = 0
+    for x0, y0, x1, y1 in aRects:
+      self._setwindowloc((x0, y0), (x1, y1))
+      n = (x1 - x0 + 1) * 2
+      self.dc(1)
+      self.cs(0)
+      if n == w * 2:
+        #Full width rows are contiguous in the buffer.
+        self.spi.write(buf[y0 * n:(y1 + 1) * n])
+      else:
+        d = (y0 * w + x0) * 2
+        for y in range(y0, y1 + 1):
+          self.spi.write(buf[d:d + n])
+          d += w * 2
+      self.cs(1)
+      self.transactions += 1
+      rects += 1
+      nbytes += n * (y1 - y0 + 1)
+    self.flush_rects = rects
+    self.flush_bytes = nbytes
+
+  def doublebuffer( self, aEnable = True, aFps = MAX_FPS ) :
+    '''Flush from a second buffer on a background thread.  Drawing goes to
+       the frame buffer as usual, swap() copies the changed regions to the
+       front buffer and returns while a _thread worker sends them.  Needs
+       another 40 KB of RAM.  aFps limits how often swap() hands over a
+       frame, 0 for no limit.'''
+    if aEnable:
+      if _thread is None:
+        raise RuntimeError("_thread module not available")
+      if self._fb is None:
+        self.framebuffer(True)
+      self._minframe = 1000 // aFps if aFps else 0
+      if self._front is None:
+        self._front = bytearray(self._fbuf)
+        self._wake = _thread.allocate_lock()
+        self._wake.acquire()
+        _thread.start_new_thread(self._flushthread, (self._front, self._wake))
+    elif self._front is not None:
+      self.sync()
+      self._front = None
+      #Wake the worker so it sees _front is gone and exits.
+      self._wake.release()
+      self._wake = None
+
+  def doublebuffered( self ) :
+    '''True if frames are sent by the flush thread.'''
+    return self._front is not None
+
+  def _fpslimit( self ) :
+    return 1000 // self._minframe if self._minframe else 0
+
+  def swap( self, aWait = False ) :
+    '''Hand the changes drawn since the last swap to the flush thread.
+       Returns False without blocking if the thread is still sending the
+       previous frame or the frame rate limit is reached; the changes are
+       kept for the next swap.  aWait waits instead of skipping.'''
+    if self._front is None:
+      self.flush()
+      return True
+    if self._flusherror is not None:
+      self.sync()
+    if not self._dirty:
+      return True
+    if aWait:
+      self.sync()
+      t = self._minframe - time.ticks_diff(time.ticks_ms(), self._lastswap)
+      if t > 0:
+        time.sleep_ms(t)
+    elif (self._pending is not None or
+          time.ticks_diff(time.ticks_ms(), self._lastswap) < self._minframe):
+      self.dropped += 1
+      return False
+    #The worker is idle, so the front buffer can be updated.
+    w = self._size[0]
+    front = self._front
+    back = self._fbuf
+    for x0, y0, x1, y1 in self._dirty:
+      n = (x1 - x0 + 1) * 2
+      if n == w * 2:
+        front[y0 * n:(y1 + 1) * n] = back[y0 * n:(y1 + 1) * n]
+      else:
+        d = (y0 * w + x0) * 2
+        for y in range(y0, y1 + 1):
+          front[d:d + n] = back[d:d + n]
+          d += w * 2
+    self._pending = self._dirty
+    self._dirty = []
+    self._lastswap = time.ticks_ms()
+    self.swaps += 1
+    self._wake.release()
+    return True
+
+  def sync( self ) :
+    '''Wait until the flush thread has sent the last frame.  Call this
+       before sending commands to the display while double buffered.
+       Raises the exception the flush thread got sending it, if any.'''
+    while self._pending is not None:
+      time.sleep_ms(1)
+    e = self._flusherror
+    if e is not None:
+      self._flusherror = None
+      raise e
+
+  def _flushthread( self, aFront, aWake ) :
+    '''Worker of doublebuffer(), sends each frame handed over by swap().'''
+    while True:
+      aWake.acquire()
+      if self._front is not aFront:
+        return
+      try:
+        self._sendrects(aFront, self._pending)
+      except Exception as e:
+        #Hand it to sync(), the worker keeps running for the next frame.
+        self._flusherror = e
+        self.cs(1)
+      finally:
+        self._pending = None
+
+  def instrument( self, aEnable = True ) :
+    '''Count commands, data bytes, CS toggles and transactions and time the
+       public primitives with ticks_us, see stats().  Traffic is counted to
+       the outermost primitive running, traffic outside of one to 'other'.
+       Costs nothing while disabled: the SPI and pins are wrapped and the
+       primitives replaced on this instance only while enabled.'''
+    if aEnable and self._stats is None:
+      #A flush still running must finish on the transport it started with.
+      self.sync()
+      self._stats = {}
+      self._statcur = self._statcounter('other')
+      self.spi = _StatSPI(self.spi, self)
+      self.dc = _StatPin(self.dc, self, None, False)
+      self.cs = _StatPin(self.cs, self, 1, True)
+      for name in TFT.PRIMITIVES:
+        setattr(self, name, self._timed(name, getattr(self, name)))
+    elif not aEnable and self._stats is not None:
+      self.sync()
+      for name in TFT.PRIMITIVES:
+        delattr(self, name)
+      self.spi = self.spi.spi
+      self.dc = self.dc.pin
+      self.cs = self.cs.pin
+      self._stats = None
+      self._statcur = None
+
+  def instrumented( self ) :
+    '''True if instrument() is enabled.'''
+    return self._stats is not None
+
+  def _statcounter( self, aName ) :
+    c = self._stats.get(aName)
+    if c is None:
+      c = self._stats[aName] = [0] * len(_STATNAMES)
+    return c
+
+  def _timed( self, aName, aMethod ) :
+    '''Wrap a bound method so its calls, time and traffic are counted.'''
+    def timed( *args, **kwargs ) :
+      if self._statdepth or self._stats is None:
+        return aMethod(*args, **kwargs)
+      c = self._statcounter(aName)
+      other = self._statcur
+      self._statcur = c
+      self._statdepth = 1
+      t = time.ticks_us()
+      try:
+        return aMethod(*args, **kwargs)
+      finally:
+        c[_US] += time.ticks_diff(time.ticks_us(), t)
+        c[_CALLS] += 1
+        self._statdepth = 0
+        self._statcur = other
+    return timed
+
+  def reset_stats( self ) :
+    '''Set all instrumentation counters to zero.'''
+    if self._stats is not None:
+      for c in self._stats.values():
+        for i in range(len(c)):
+          c[i] = 0
+
+  def stats( self ) :
+    '''Counters as a dict: one dict of calls, us, commands, data,
+       cs_toggles and transactions per primitive, their sum as 'total'
+       and the glyph cache statistics as 'glyphs'.  Empty if not
+       instrumented.'''
+    if self._stats is None:
+      return {}
+    res = {}
+    total = [0] * len(_STATNAMES)
+    for name, c in self._stats.items():
+      if c[_CALLS] or c[_DATA] or c[_COMMANDS]:
+        res[name] = dict(zip(_STATNAMES, c))
+      for i in range(len(c)):
+        total[i] += c[i]
+    res['total'] = dict(zip(_STATNAMES, total))
+    res['glyphs'] = self.glyphs.stats()
+    return res
+
+  def _damage( self, x0, y0, x1, y1 ) :
+    '''Record a changed region of the frame buffer.  Rectangles that overlap
+       or lie close together are merged so a flush needs only a few windows.'''
+    self._draws += 1
+    x0 = max(x0, 0)
+    y0 = max(y0, 0)
+    x1 = min(x1, self._size[0] - 1)
+    y1 = min(y1, self._size[1] - 1)
+    if x1 < x0 or y1 < y0:
+      return
+    r = [x0, y0, x1, y1]
+    d = self._dirty
+    i = 0
+    while i < len(d):
+      if TFT._mergecost(d[i], r) <= TFT.DIRTY_SLACK:
+        r = TFT._union(d.pop(i), r)
+        i = 0
+      else:
+        i += 1
+    d.append(r)
+    if len(d) > TFT.DIRTY_MAX:
+      #Too many rectangles, merge the cheapest pair.
+      best = None
+      for i in range(len(d)):
+        for j in range(i + 1, len(d)):
+          c = TFT._mergecost(d[i], d[j])
+          if best is None or c < best[0]:
+            best = (c, i, j)
+      r = TFT._union(d[best[1]], d.pop(best[2]))
+      d[best[1]] = r
+
+  @staticmethod
+  def _union( a, b ) :
+    return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+
+  @staticmethod
+  def _mergecost( a, b ) :
+    '''Pixels that would be sent in vain if a and b were merged.'''
+    u = TFT._union(a, b)
+    return ((u[2] - u[0] + 1) * (u[3] - u[1] + 1)
+            - (a[2] - a[0] + 1) * (a[3] - a[1] + 1)
+            - (b[2] - b[0] + 1) * (b[3] - b[1] + 1))
+
+  @staticmethod
+  def _fbcolor( aColor ) :
+    '''framebuf stores RGB565 in native (little endian) order, the display
+       wants big endian.  Swap the bytes so the buffer can be sent as is.'''
+    return ((aColor & 0xFF) << 8) | ((aColor >> 8) & 0xFF)
+
 #  @micropython.native
   def pixel( self, aPos, aColor ) :
     '''Draw a pixel at the given position'''
+    if self._fb is not None:
+      self._fb.pixel(aPos[0], aPos[1], TFT._fbcolor(aColor))
+      self._damage(aPos[0], aPos[1], aPos[0], aPos[1])
+      return
     if 0 <= aPos[0] < self._size[0] and 0 <= aPos[1] < self._size[1]:
       self._setwindowpoint(aPos)
       self._pushcolor(aColor)
 
 #   @micropython.native
-  def text( self, aPos, aString, aColor, aFont, aSize = 1, nowrap = False ) :
+  def text( self, aPos, aString, aColor, aFont, aSize = 1, nowrap = False, aBgColor = None ) :
     '''Draw a text at the given position.  If the string reaches the end of the
        display it is wrapped to aPos[0] on the next line.  aSize may be an integer
        which will size the font uniformly on w,h or a or any type that may be
-       indexed with [0] or [1].'''
+       indexed with [0] or [1].  aBgColor fills the glyph background and
+       takes the faster opaque path, None (default) leaves it untouched.'''
 
     if aFont == None:
       return
@@ -186,26 +643,154 @@ class TFT(object) :
       wh = aSize
 
     px, py = aPos
-    width = wh[0] * aFont["Width"] + 1
+    if aBgColor is not None:
+      #Opaque text is composed row by row and sent with one window each.
+      sx = max(1, int(wh[0]))
+      sy = max(1, int(wh[1]))
+      #Same wrap point as below: the last character must fit including
+      # its blank right edge.
+      room = self._size[0] - px
+      n = len(aString)
+      i = 0
+      while i < n:
+        j = i
+        used = 0
+        while j < n:
+          width = sx * _charwidth(aFont, aString[j]) + 1
+          if j > i and used + width > room:
+            break
+          used += width
+          j += 1
+        self._textrow(px, py, aString[i:j], aColor, aFont, sx, sy, aBgColor)
+        if nowrap:
+          break
+        py += aFont["Height"] * sy + 1
+        i = j
+      return
+
     for c in aString:
-      self.char((px, py), c, aColor, aFont, wh)
-      px += width
+      width = wh[0] * _charwidth(aFont, c) + 1
       #We check > rather than >= to let the right (blank) edge of the
       # character print off the right of the screen.
-      if px + width > self._size[0]:
+      if px > aPos[0] and px + width > self._size[0]:
         if nowrap:
           break
         else:
           py += aFont["Height"] * wh[1] + 1
           px = aPos[0]
+      self.char((px, py), c, aColor, aFont, wh, None)
+      px += width
+
+  def textwidth( self, aString, aFont, aSize = 1 ) :
+    '''Width of aString in pixels as drawn by text(), including the blank
+       column after each character.'''
+    sx = aSize if (type(aSize) == int) or (type(aSize) == float) else aSize[0]
+    sx = max(1, int(sx))
+    w = 0
+    for c in aString:
+      w += sx * _charwidth(aFont, c) + 1
+    return w
+
+  def _textrow( self, x, y, aString, aColor, aFont, sx, sy, aBgColor ) :
+    '''Compose the glyphs of aString side by side into one row buffer,
+       with a background column between them, and send it as one image.
+       Unscaled text is copied from the glyph cache, scaled text is
+       expanded directly from the font data (see _scaledrow).'''
+    n = len(aString)
+    gh = aFont["Height"] * sy
+    #Bytes per pixel row of each glyph, proportional fonts differ.
+    gw2s = [_charwidth(aFont, c) * sx * 2 for c in aString]
+    w2 = sum(gw2s) + 2 * (n - 1)
+    size = w2 * gh
+    buf = self._linebuf
+    if buf is None or len(buf) < size:
+      buf = bytearray(size)
+      #Keep the buffer for the next line unless it is unusually big.
+      if size <= TFT.LINEBUF_MAX:
+        self._linebuf = buf
+    if sx > 1 or sy > 1:
+      self._scaledrow(buf, aString, aColor, aFont, sx, sy, aBgColor, w2)
+      self.image(x, y, x + w2 // 2 - 1, y + gh - 1, memoryview(buf)[:size])
+      return
+    bh = aBgColor >> 8
+    bl = aBgColor & 0xff
+    blank = None
+    d0 = 0
+    for k in range(n):
+      gw2 = gw2s[k]
+      g = self._glyph(aFont, aString[k], aColor, aBgColor, (sx, sy))
+      if g is None:
+        if blank is None:
+          blank = bytes((bh, bl)) * (gw2 // 2 * gh)
+        g = blank
+      g = memoryview(g)
+      d = d0
+      d0 += gw2 + 2
+      s = 0
+      for r in range(gh):
+        buf[d:d + gw2] = g[s:s + gw2]
+        if k < n - 1:
+          buf[d + gw2] = bh
+          buf[d + gw2 + 1] = bl
+        d += w2
+        s += gw2
+    self.image(x, y, x + w2 // 2 - 1, y + gh - 1, memoryview(buf)[:size])
+
+  def _scaledrow( self, buf, aString, aColor, aFont, sx, sy, aBgColor, w2 ) :
+    '''Render scaled text into buf.  Each font row is written once as
+       horizontal runs of equal color, each run a single slice copy, and
+       the finished pixel row is then duplicated sy - 1 times.  Scaled
+       glyphs are not cached, big digits would only evict the small ones.'''
+    maxw = aFont["Width"]
+    fonth = aFont["Height"]
+    bpc = (fonth + 7) // 8
+    bh = aBgColor >> 8
+    bl = aBgColor & 0xff
+    fgs = memoryview(bytes((aColor >> 8, aColor & 0xff)) * (maxw * sx))
+    bgs = memoryview(bytes((bh, bl)) * (maxw * sx))
+    cols = []
+    for c in aString:
+      g = _fontglyph(aFont, ord(c))
+      cols.append(g if g else (maxw, None))
+    mv = memoryview(buf)
+    n = len(cols)
+    d = 0
+    for r in range(fonth):
+      row = d
+      rb = r >> 3
+      rs = r & 7
+      for k in range(n):
+        fontw, col = cols[k]
+        q = 0
+        while q < fontw:
+          on = 0 if col is None else (col[q * bpc + rb] >> rs) & 1
+          e = q + 1
+          while e < fontw and (0 if col is None else (col[e * bpc + rb] >> rs) & 1) == on:
+            e += 1
+          ln = (e - q) * sx * 2
+          buf[d:d + ln] = fgs[:ln] if on else bgs[:ln]
+          d += ln
+          q = e
+        if k < n - 1:
+          buf[d] = bh
+          buf[d + 1] = bl
+          d += 2
+      for i in range(sy - 1):
+        mv[d:d + w2] = mv[row:row + w2]
+        d += w2
           
 # Added by klemens@ull.at 2024-01-28
   def terminal( self, aString, aColor, aFont, newline=True, line=None):
     #print("terminal()", aString, aColor, newline, line, self.terminal_current_line, self.terminal_current_col)
 
-    """Write text to terminal. If line is specified, write to that line instead of current line"""
+    """Write text to terminal. If line is specified, write to that line instead of current line.
+    The text of every line is kept (see terminal_lines()), only characters that
+    differ from what is on the screen are drawn. Text that doesn't fit continues
+    on the next line, or is cut off when writing to a given line."""
+    self._terminal_sync()
     if self.terminal_current_line >= self.terminal_max_lines:
-        self.terminal_reset()
+        if not self._terminal_scrollup():
+            self.terminal_reset()
 
     # Use specified line if given, otherwise use current line
     write_line = line if line is not None else self.terminal_current_line
@@ -214,63 +799,307 @@ class TFT(object) :
     #ext_x = self.terminal_current_col if not newline else 0
     if newline or line is not None:
         self.terminal_current_col = 0
-
-    self.text((self.terminal_current_col, write_line * self.terminal_line_height), str(aString), aColor, aFont)
+        self._termcol = 0
+
+    text = str(aString)
+    if not 0 <= write_line < self.terminal_max_lines:
+        # Outside the terminal, nothing to remember
+        self.text((self.terminal_current_col, self._terminal_y(write_line)), text, aColor, aFont, aBgColor=TFT.BLACK)
+        text = ''
+    while text:
+        # Characters that fit from the cursor to the right edge
+        room = self._size[0] - self.terminal_current_col
+        fit = 0
+        while fit < len(text):
+            room -= _charwidth(aFont, text[fit]) + 1
+            if room < 0:
+                break
+            fit += 1
+        if fit == 0 and self._termcol == 0:
+            fit = 1
+        self._terminal_put(write_line, self._termcol, text[:fit], aColor, aFont)
+        self._termcol += fit
+        self.terminal_current_col += self.textwidth(text[:fit], aFont)
+        text = text[fit:]
+        if not text or line is not None:
+            break
+        # Continue on the next line
+        self.terminal_current_line += 1
+        self.terminal_current_col = 0
+        self._termcol = 0
+        if self.terminal_current_line >= self.terminal_max_lines:
+            if not self._terminal_scrollup():
+                self.terminal_reset()
+        write_line = self.terminal_current_line
     
     # Update current column position - use same width calculation as text function
-    if not newline:
-        self.terminal_current_col = self.terminal_current_col + len(str(aString)) * (aFont['Width'] + 1)
-    else:
+    if newline:
         self.terminal_current_col = 0
+        self._termcol = 0
         if line is None:  # Only advance line if newline=True and no specific line was given
             self.terminal_current_line += 1
+    self._termdraws = self._draws
     
   def terminal_reset(self):
     """Reset terminal state"""
     self.fill(TFT.BLACK)  # Clear the screen
+    if self._vtop:
+        self._vtop = 0
+        self.vscroll(0)
     self.terminal_current_line = 0
     self.terminal_current_col = 0
+    self._termcol = 0
+    # Screen is empty, so are all lines
+    self._termlines = [['', [], None, False] for i in range(self.terminal_max_lines)]
+    self._termtop = 0
+    self._termdraws = self._draws
+
+  def terminal_clear_line(self, line):
+    """Clear one terminal line with a single fill."""
+    if not 0 <= line < self.terminal_max_lines:
+      return
+    self._terminal_sync()
+    self.fillrect((0, self._terminal_y(line)), (self._size[0], self.terminal_line_height), TFT.BLACK)
+    self._terminal_line(line)[:] = ['', [], None, False]
+    self._termdraws = self._draws
+
+  def terminal_lines(self):
+    """Text on the terminal, top line first.  Each line is a list of
+    (text, color) runs, so the screen can be read without touching the display."""
+    lines = []
+    for i in range(self.terminal_max_lines):
+      text, colors, font, stale = self._terminal_line(i)
+      runs = []
+      j = 0
+      while j < len(text):
+        k = j + 1
+        while k < len(text) and colors[k] == colors[j]:
+          k += 1
+        runs.append((text[j:k], colors[j]))
+        j = k
+      lines.append(runs)
+    return lines
+
+  def _terminal_sync(self):
+    """If anything else was drawn since the last terminal output, the lines
+    may have been drawn over: mark them stale so they are redrawn whole."""
+    if self._draws != self._termdraws:
+      for l in self._termlines:
+        l[3] = True
+
+  def _terminal_line(self, line):
+    """[text, colors per character, font, stale] of a line as shown on the screen"""
+    if len(self._termlines) != self.terminal_max_lines:
+      # terminal_max_lines was changed, start over with empty lines
+      self._termlines = [['', [], None, False] for i in range(self.terminal_max_lines)]
+      self._termtop = 0
+    return self._termlines[(self._termtop + line) % self.terminal_max_lines]
+
+  def _terminal_put(self, line, col, aString, aColor, aFont):
+    """Write aString into a line from character col on and draw what changed."""
+    old = self._terminal_line(line)
+    text, colors, font, stale = old
+    if len(text) < col:
+      colors = colors + [aColor] * (col - len(text))
+      text = text + ' ' * (col - len(text))
+    n = len(aString)
+    new = [text[:col] + aString + text[col + n:],
+           colors[:col] + [aColor] * n + colors[col + n:], aFont, False]
+    if font is not None and font is not aFont:
+      # Other font, character positions don't match any more
+      self.fillrect((0, self._terminal_y(line)), (self._size[0], self.terminal_line_height), TFT.BLACK)
+      old = ['', [], aFont, False]
+    self._terminal_draw(line, old, new)
+    self._terminal_line(line)[:] = new
+
+  def _terminal_draw(self, line, old, new):
+    """Draw the difference between two contents of a line.  With fixed width
+    fonts only changed characters are drawn, with proportional fonts
+    everything from the first change on.  A shorter line is cleared behind
+    its end with one fill.  Stale lines are drawn whole."""
+    t0, c0, f0, stale = old
+    t1, c1, font = new[0], new[1], new[2]
+    y = self._terminal_y(line)
+    n = len(t1)
+    #Characters that are the same in both, none if old is stale.
+    same = 0 if stale else len(t0)
+    if font is None:
+      font = f0
+    fixed = n and (type(font) is dict or not getattr(font, 'proportional', True))
+    if fixed:
+      cell = font['Width'] + 1
+      i = 0
+      while i < n:
+        if i < same and t0[i] == t1[i] and c0[i] == c1[i]:
+          i += 1
+          continue
+        #A run of changed characters in one color is one text row.
+        j = i + 1
+        while j < n and c1[j] == c1[i] and not (j < same and t0[j] == t1[j] and c0[j] == c1[j]):
+          j += 1
+        self.text((i * cell, y), t1[i:j], c1[i], font, nowrap=True, aBgColor=TFT.BLACK)
+        i = j
+      end1 = n * cell
+    else:
+      i = 0
+      while i < n and i < same and t0[i] == t1[i] and c0[i] == c1[i]:
+        i += 1
+      x = self.textwidth(t1[:i], font) if i else 0
+      while i < n:
+        j = i + 1
+        while j < n and c1[j] == c1[i]:
+          j += 1
+        self.text((x, y), t1[i:j], c1[i], font, nowrap=True, aBgColor=TFT.BLACK)
+        x += self.textwidth(t1[i:j], font)
+        if j < n:
+          #text() leaves the blank column after a run alone, old text
+          # may have been drawn there.
+          self.fillrect((x - 1, y), (1, font['Height']), TFT.BLACK)
+        i = j
+      end1 = x
+    #Clear what is left of the old text, if anything can be, from the
+    # blank column after the last character on.
+    end1 = max(end1 - 1, 0)
+    if t0 and f0 is not None and (len(t0) > n or not fixed or f0 is not font):
+      end0 = min(self.textwidth(t0, f0), self._size[0])
+      if end0 > end1:
+        self.fillrect((end1, y), (end0 - end1, self.terminal_line_height), TFT.BLACK)
+
+  def terminal_scroll(self, enable=True):
+    """Scroll the terminal up by one line when it is full instead of clearing it.
+    In portrait orientation (rotation 0) the display's hardware scrolling is used,
+    only the newly exposed line is cleared. The controller scrolls along the
+    panel's long side, so in landscape the frame buffer is scrolled in RAM
+    instead; without frame buffer the lines are redrawn from the kept text,
+    only the characters that differ from the line above."""
+    self.terminal_scrolling = enable
+    if enable and self._terminal_hwscroll():
+        # Scroll area is the visible part of the 162 rows of display RAM
+        tfa = self._offset[1]
+        self.setvscroll(tfa, 162 - tfa - self._size[1])
+    self.terminal_reset()
+
+  def _terminal_hwscroll(self):
+    """True if the terminal scrolls with the display's scroll address"""
+    return (self.terminal_scrolling and self.rotate == 0
+            and self._size[1] % self.terminal_line_height == 0)
+
+  def _terminal_y(self, line):
+    """Pixel row of a terminal line, following the hardware scroll offset"""
+    y = line * self.terminal_line_height
+    if self._vtop:
+        y = (self._vtop + y) % self._size[1]
+    return y
+
+  def _terminal_scrollup(self):
+    """Make room for a new line at the bottom. Returns False if the terminal can't scroll."""
+    if not self.terminal_scrolling:
+        return False
+    lh = self.terminal_line_height
+    w, h = self._size
+    if self._terminal_hwscroll():
+        # The line leaving the top reappears at the bottom, clear it and move the scroll address
+        self.fillrect((0, self._vtop), (w, lh), TFT.BLACK)
+        self._vtop = (self._vtop + lh) % h
+        self.vscroll(self._vtop)
+    elif self._fb is not None:
+        self._fb.scroll(0, -lh)
+        self.fillrect((0, h - lh), (w, lh), TFT.BLACK)
+        self._damage(0, 0, w - 1, h - 1)
+    else:
+        # Pixels stay where they are, draw each line over the one above it
+        shown = [self._terminal_line(i)[:] for i in range(self.terminal_max_lines)]
+        for i in range(self.terminal_max_lines):
+            self._terminal_draw(i, shown[i], shown[i + 1] if i + 1 < len(shown) else ['', [], None, False])
+            if i + 1 < len(shown):
+                # Drawn whole if it was stale, what is on the screen is known again
+                self._terminal_line(i + 1)[3] = False
+    # The top line is gone, its slot becomes the empty bottom line
+    self._terminal_line(0)[:] = ['', [], None, False]
+    self._termtop = (self._termtop + 1) % self.terminal_max_lines
+    self.terminal_current_line = self.terminal_max_lines - 1
+    return True
 
   #@micropython.native
-  def char( self, aPos, aChar, aColor, aFont, aSizes ) :
+  def char( self, aPos, aChar, aColor, aFont, aSizes, aBgColor = None ) :
     '''Draw a character at the given position using the given font and color.
        aSizes is a tuple with x, y as integer scales indicating the
-       # of pixels to draw for each pixel in the character.'''
+       # of pixels to draw for each pixel in the character.  aBgColor fills
+       the unset pixels, None (default) leaves them untouched.'''
 
     if aFont == None:
       return
 
-    startchar = aFont['Start']
-    endchar = aFont['End']
+    if aBgColor is not None:
+      sx = max(1, int(aSizes[0]))
+      sy = max(1, int(aSizes[1]))
+      if sx > 1 or sy > 1:
+        #Scaled glyphs are rendered into one buffer and sent as one window.
+        self._textrow(aPos[0], aPos[1], aChar, aColor, aFont, sx, sy, aBgColor)
+        return
+      buf = self._glyph(aFont, aChar, aColor, aBgColor, aSizes)
+      if buf is not None:
+        h = aFont['Height']
+        w = len(buf) // (2 * h)
+        self.image(aPos[0], aPos[1], aPos[0] + w - 1, aPos[1] + h - 1, buf)
+      return
 
-    ci = ord(aChar)
-    if (startchar <= ci <= endchar):
-      fontw = aFont['Width']
+    g = _fontglyph(aFont, ord(aChar))
+    if g is not None:
+      fontw, charA = g
       fonth = aFont['Height']
-      ci = (ci - startchar) * fontw
-
-      charA = aFont["Data"][ci:ci + fontw]
+      bpc = (fonth + 7) // 8
       px = aPos[0]
-      if aSizes[0] <= 1 and aSizes[1] <= 1 :
-        buf = bytearray(2 * fonth * fontw)
-        for q in range(fontw) :
-          c = charA[q]
-          for r in range(fonth) :
-            if c & 0x01 :
-              pos = 2 * (r * fontw + q)
-              buf[pos] = aColor >> 8
-              buf[pos + 1] = aColor & 0xff
+      #Transparent background, only draw the set pixels.  Vertical runs
+      # of set pixels in a column are drawn as one rectangle.
+      for q in range(fontw) :
+        c = charA[q] if bpc == 1 else int.from_bytes(charA[q * bpc:(q + 1) * bpc], 'little')
+        c &= (1 << fonth) - 1
+        r = 0
+        while c :
+          if c & 0x01 :
+            run = 0
+            while c & 0x01 :
+              run += 1
+              c >>= 1
+            self.fillrect((px, aPos[1] + r * aSizes[1]), (aSizes[0], run * aSizes[1]), aColor)
+            r += run
+          else :
             c >>= 1
-        self.image(aPos[0], aPos[1], aPos[0] + fontw - 1, aPos[1] + fonth - 1, buf)
-      else:
-        for c in charA :
-          py = aPos[1]
-          for r in range(fonth) :
-            if c & 0x01 :
-              self.fillrect((px, py), aSizes, aColor)
-            py += aSizes[1]
-            c >>= 1
-          px += aSizes[0]
+            r += 1
+        px += aSizes[0]
+
+  def glyphcache( self, aBytes ) :
+    '''Set the byte budget of the rendered glyph cache, 0 disables it.
+       Hit/miss statistics are available from glyphs.stats().'''
+    self.glyphs.resize(aBytes)
+
+  def _glyph( self, aFont, aChar, aColor, aBgColor, aSizes ) :
+    '''Return the RGB565 bitmap of a character, rendered row by row with
+       aColor on aBgColor and scaled by aSizes.  Bitmaps are kept in an LRU
+       cache keyed by font, character, colors and scale.  None if the
+       character is not in the font.'''
+    ci = ord(aChar)
+    sx = max(1, int(aSizes[0]))
+    sy = max(1, int(aSizes[1]))
+    key = (_fonttag(aFont), ci, aColor, aBgColor, sx, sy)
+    buf = self.glyphs.get(key)
+    if buf is None:
+      g = _fontglyph(aFont, ci)
+      if g is None:
+        return None
+      buf = self._renderglyph(aFont, g, aColor, aBgColor, sx, sy)
+      self.glyphs.put(key, buf)
+    return buf
+
+  def _renderglyph( self, aFont, aGlyph, aColor, aBgColor, sx, sy ) :
+    fontw, charA = aGlyph
+    fonth = aFont['Height']
+    w = fontw * sx
+    buf = bytearray(bytes((aBgColor >> 8, aBgColor & 0xff)) * (w * fonth * sy))
+    #Set the foreground pixels, a viper loop where the firmware has one.
+    kernels.render_glyph(buf, charA, bytes((fontw, fonth, sx, sy)), aColor)
+    return buf
 
 #   @micropython.native
   def line( self, aStart, aEnd, aColor ) :
@@ -294,32 +1123,53 @@ class TFT(object) :
 
       dx = abs(dx)
       dy = abs(dy)
+      #Pixels sharing a row (or column for steep lines) are collected into
+      # runs, and all runs go out in one CS assertion.
+      self._setColor(aColor)
+      self._begin()
       if (dx >= dy):
         dy <<= 1
         e = dy - dx
         dx <<= 1
+        rx = px
         while (px != ex):
-          self.pixel((px, py), aColor)
           if (e >= 0):
+            self._span(min(rx, px), py, max(rx, px), py)
+            rx = px + inx
             py += iny
             e -= dx
           e += dy
           px += inx
+        if rx != px:
+          self._span(min(rx, px - inx), py, max(rx, px - inx), py)
       else:
         dx <<= 1
         e = dx - dy
         dy <<= 1
+        ry = py
         while (py != ey):
-          self.pixel((px, py), aColor)
           if (e >= 0):
+            self._span(px, min(ry, py), px, max(ry, py))
+            ry = py + iny
             px += inx
             e -= dy
           e += dx
           py += iny
+        if ry != py:
+          self._span(px, min(ry, py - iny), px, max(ry, py - iny))
+      self._end()
+      if self._fb is not None:
+        self._damage(min(aStart[0], aEnd[0]), min(aStart[1], aEnd[1]),
+                     max(aStart[0], aEnd[0]), max(aStart[1], aEnd[1]))
 
 #   @micropython.native
   def vline( self, aStart, aLen, aColor ) :
     '''Draw a vertical line from aStart for aLen. aLen may be negative.'''
+    if self._fb is not None:
+      y = aStart[1] + aLen if aLen < 0 else aStart[1]
+      self._fb.vline(aStart[0], y, abs(aLen), TFT._fbcolor(aColor))
+      self._damage(aStart[0], y, aStart[0], y + abs(aLen) - 1)
+      return
     start = (clamp(aStart[0], 0, self._size[0]), clamp(aStart[1], 0, self._size[1]))
     stop = (start[0], clamp(start[1] + aLen, 0, self._size[1]))
     #Make sure smallest y 1st.
@@ -332,6 +1182,11 @@ class TFT(object) :
 #   @micropython.native
   def hline( self, aStart, aLen, aColor ) :
     '''Draw a horizontal line from aStart for aLen. aLen may be negative.'''
+    if self._fb is not None:
+      x = aStart[0] + aLen if aLen < 0 else aStart[0]
+      self._fb.hline(x, aStart[1], abs(aLen), TFT._fbcolor(aColor))
+      self._damage(x, aStart[1], x + abs(aLen) - 1, aStart[1])
+      return
     start = (clamp(aStart[0], 0, self._size[0]), clamp(aStart[1], 0, self._size[1]))
     stop = (clamp(start[0] + aLen, 0, self._size[0]), start[1])
     #Make sure smallest x 1st.
@@ -354,6 +1209,18 @@ class TFT(object) :
   def fillrect( self, aStart, aSize, aColor ) :
     '''Draw a filled rectangle.  aStart is the smallest coordinate corner
        and aSize is a tuple indicating width, height.'''
+    if self._fb is not None:
+      x, y = aStart
+      w, h = aSize
+      if w < 0:
+        x += w
+        w = -w
+      if h < 0:
+        y += h
+        h = -h
+      self._fb.fill_rect(x, y, w, h, TFT._fbcolor(aColor))
+      self._damage(x, y, x + w - 1, y + h - 1)
+      return
     start = (clamp(aStart[0], 0, self._size[0]), clamp(aStart[1], 0, self._size[1]))
     end = (clamp(start[0] + aSize[0] - 1, 0, self._size[0]), clamp(start[1] + aSize[1] - 1, 0, self._size[1]))
 
@@ -374,37 +1241,32 @@ class TFT(object) :
 #   @micropython.native
   def circle( self, aPos, aRadius, aColor ) :
     '''Draw a hollow circle with the given radius and color with aPos as center.'''
-    self.colorData[0] = aColor >> 8
-    self.colorData[1] = aColor
+    self._setColor(aColor)
+    cx, cy = aPos
     xend = int(0.7071 * aRadius) + 1
     rsq = aRadius * aRadius
-    for x in range(xend) :
-      y = int(sqrt(rsq - x * x))
-      xp = aPos[0] + x
-      yp = aPos[1] + y
-      xn = aPos[0] - x
-      yn = aPos[1] - y
-      xyp = aPos[0] + y
-      yxp = aPos[1] + x
-      xyn = aPos[0] - y
-      yxn = aPos[1] - x
-
-      self._setwindowpoint((xp, yp))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xp, yn))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xn, yp))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xn, yn))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xyp, yxp))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xyp, yxn))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xyn, yxp))
-      self._writedata(self.colorData)
-      self._setwindowpoint((xyn, yxn))
-      self._writedata(self.colorData)
+    #Steps of x with the same y form a horizontal run in four octants and a
+    # vertical run in the other four.  All runs go out in one CS assertion.
+    self._begin()
+    x0 = 0
+    y = int(sqrt(rsq))
+    for x in range(1, xend + 1) :
+      ny = int(sqrt(rsq - x * x)) if x < xend else -1
+      if ny != y :
+        x1 = x - 1
+        self._span(cx + x0, cy + y, cx + x1, cy + y)
+        self._span(cx + x0, cy - y, cx + x1, cy - y)
+        self._span(cx - x1, cy + y, cx - x0, cy + y)
+        self._span(cx - x1, cy - y, cx - x0, cy - y)
+        self._span(cx + y, cy + x0, cx + y, cy + x1)
+        self._span(cx + y, cy - x1, cx + y, cy - x0)
+        self._span(cx - y, cy + x0, cx - y, cy + x1)
+        self._span(cx - y, cy - x1, cx - y, cy - x0)
+        x0 = x
+        y = ny
+    self._end()
+    if self._fb is not None:
+      self._damage(cx - aRadius, cy - aRadius, cx + aRadius, cy + aRadius)
 
 #   @micropython.native
   def fillcircle( self, aPos, aRadius, aColor ) :
@@ -425,11 +1287,108 @@ class TFT(object) :
     self.fillrect((0, 0), self._size, aColor)
 
   def image( self, x0, y0, x1, y1, data ) :
-    self._setwindowloc((x0, y0), (x1, y1))
-    self._writedata(data)
+    '''Write RGB565 (big endian) pixel data to the rectangle x0,y0 - x1,y1,
+       clipped to the screen.'''
+    if self._fb is not None:
+      self._fbimage(x0, y0, x1, y1, data)
+      return
+    cx0 = max(x0, 0)
+    cy0 = max(y0, 0)
+    cx1 = min(x1, self._size[0] - 1)
+    cy1 = min(y1, self._size[1] - 1)
+    if cx1 < cx0 or cy1 < cy0:
+      return
+    self._setwindowloc((cx0, cy0), (cx1, cy1))
+    w = (x1 - x0 + 1) * 2
+    n = (cx1 - cx0 + 1) * 2
+    s = (cy0 - y0) * w + (cx0 - x0) * 2
+    if n == w:
+      #Whole rows, still one write.
+      self._writedata(memoryview(data)[s:s + n * (cy1 - cy0 + 1)])
+      return
+    mv = memoryview(data)
+    self.dc(1)
+    self.cs(0)
+    for r in range(cy1 - cy0 + 1):
+      self.spi.write(mv[s:s + n])
+      s += w
+    self.cs(1)
+    self.transactions += 1
+
+  def blitruns( self, x, y, aRuns, aData ) :
+    '''Draw pixel runs with the top left corner at x, y.  aRuns holds five
+       values per run: dx, dy, width, height and the pixel offset of the
+       run in aData (RGB565 big endian, rows of a run are contiguous).
+       Runs are clipped to the screen and sent as one window each in one
+       CS assertion; everything between them is left untouched.'''
+    sw, sh = self._size
+    mv = memoryview(aData)
+    fb = self._fb is not None
+    bx0 = sw
+    by0 = sh
+    bx1 = by1 = -1
+    if not fb:
+      self._begin()
+    for i in range(0, len(aRuns), 5):
+      rw = aRuns[i + 2]
+      rh = aRuns[i + 3]
+      x0 = x + aRuns[i]
+      y0 = y + aRuns[i + 1]
+      x1 = x0 + rw - 1
+      y1 = y0 + rh - 1
+      cx0 = max(x0, 0)
+      cy0 = max(y0, 0)
+      cx1 = min(x1, sw - 1)
+      cy1 = min(y1, sh - 1)
+      if cx1 < cx0 or cy1 < cy0:
+        continue
+      off = aRuns[i + 4] * 2
+      n = (cx1 - cx0 + 1) * 2
+      s = off + ((cy0 - y0) * rw + cx0 - x0) * 2
+      if fb:
+        d = (cy0 * sw + cx0) * 2
+        for r in range(cy1 - cy0 + 1):
+          self._fbuf[d:d + n] = mv[s:s + n]
+          d += sw * 2
+          s += rw * 2
+        bx0 = min(bx0, cx0)
+        by0 = min(by0, cy0)
+        bx1 = max(bx1, cx1)
+        by1 = max(by1, cy1)
+      else:
+        self._windowcmds(cx0, cy0, cx1, cy1)
+        self.dc(1)
+        if n == rw * 2:
+          self.spi.write(mv[s:s + n * (cy1 - cy0 + 1)])
+        else:
+          for r in range(cy1 - cy0 + 1):
+            self.spi.write(mv[s:s + n])
+            s += rw * 2
+    if fb:
+      if bx1 >= 0:
+        self._damage(bx0, by0, bx1, by1)
+    else:
+      self._end()
+
+  def _fbimage( self, x0, y0, x1, y1, data ) :
+    '''Copy pixel data row by row into the frame buffer, clipped to the screen.'''
+    w = x1 - x0 + 1
+    cx0 = max(x0, 0)
+    cx1 = min(x1, self._size[0] - 1)
+    if cx1 < cx0:
+      return
+    src = memoryview(data)
+    n = (cx1 - cx0 + 1) * 2
+    skip = (cx0 - x0) * 2
+    for y in range(max(y0, 0), min(y1, self._size[1] - 1) + 1):
+      s = (y - y0) * w * 2 + skip
+      d = (y * self._size[0] + cx0) * 2
+      self._fbuf[d:d + n] = src[s:s + n]
+    self._damage(cx0, y0, cx1, y1)
 
   def setvscroll(self, tfa, bfa) :
     ''' set vertical scroll area '''
+    self.sync()
     self._writecommand(TFT.VSCRDEF)
     data2 = bytearray([0, tfa])
     self._writedata(data2)
@@ -447,76 +1406,160 @@ class TFT(object) :
     self._vscrolladdr(a)
 
   def _vscrolladdr(self, addr) :
+    self.sync()
     self._writecommand(TFT.VSCSAD)
-    data2 = bytearray([addr >> 8, addr & 0xff])
+    data2 = self._scrolldata
+    data2[0] = addr >> 8
+    data2[1] = addr & 0xff
     self._writedata(data2)
     
+  #Transport layer.  All SPI traffic goes through the methods below, which
+  # work on preallocated buffers so drawing creates no garbage.
+
 #   @micropython.native
   def _setColor( self, aColor ) :
+    '''Set the color used by _draw().'''
     self.colorData[0] = aColor >> 8
-    self.colorData[1] = aColor
-    self.buf = bytes(self.colorData) * 32
+    self.colorData[1] = aColor & 0xff
+
+#   @micropython.native
+  def _fillbuffer( self, aPixels ) :
+    '''Return the reused fill buffer holding at least min(aPixels, FILLBUF)
+       pixels of the current color.  It only grows and is only rewritten
+       when the color changes or more pixels are needed.'''
+    n = min(int(aPixels), TFT.FILLBUF) * 2
+    buf = self._fillbuf
+    if buf is None or len(buf) < n:
+      buf = self._fillbuf = bytearray(n)
+      self._fillmv = memoryview(buf)
+      self._fillcount = 0
+    hi = self.colorData[0]
+    lo = self.colorData[1]
+    if self._fillcount and (buf[0] != hi or buf[1] != lo):
+      self._fillcount = 0
+    if self._fillcount < n:
+      #Double the filled part until the request is covered.
+      mv = self._fillmv
+      buf[0] = hi
+      buf[1] = lo
+      done = 2
+      while done < n:
+        c = min(done, n - done)
+        mv[done:done + c] = mv[0:c]
+        done += c
+      self._fillcount = n
+    return self._fillmv
 
 #   @micropython.native
   def _draw( self, aPixels ) :
     '''Send given color to the device aPixels times.'''
+    aPixels = int(aPixels)
+    if aPixels <= 0:
+      return
+    self.cs(0)
+    self._sendfill(aPixels)
+    self.cs(1)
+    self.transactions += 1
 
+  def _sendfill( self, aPixels ) :
+    '''Send the current color aPixels times, CS must be asserted.'''
+    mv = self._fillbuffer(aPixels)
+    chunk = min(aPixels, TFT.FILLBUF) * 2
+    full = mv[:chunk]
     self.dc(1)
-    self.cs(0)
-    for i in range(aPixels//32):
-      self.spi.write(self.buf)
-    rest = (int(aPixels) % 32)
+    for i in range(aPixels * 2 // chunk):
+      self.spi.write(full)
+    rest = (aPixels * 2) % chunk
     if rest > 0:
-        buf2 = bytes(self.colorData) * rest
-        self.spi.write(buf2)
-    self.cs(1)
+      self.spi.write(mv[:rest])
+
+  def _begin( self ) :
+    '''Start a batch of _span calls in one CS assertion.'''
+    if self._fb is None:
+      self._draws += 1
+      self.cs(0)
+
+  def _end( self ) :
+    '''Finish a batch started with _begin.'''
+    if self._fb is None:
+      self.cs(1)
+      self.transactions += 1
+
+  def _span( self, x0, y0, x1, y1 ) :
+    '''Fill the rectangle x0,y0 - x1,y1 with the current color inside a
+       batch (_begin/_end).  The rectangle is clipped to the screen.  When
+       buffered it is drawn into the frame buffer instead.'''
+    x0 = max(x0, 0)
+    y0 = max(y0, 0)
+    x1 = min(x1, self._size[0] - 1)
+    y1 = min(y1, self._size[1] - 1)
+    if x1 < x0 or y1 < y0:
+      return
+    if self._fb is not None:
+      #Same pixels as on the display, the caller records the damage.
+      c = (self.colorData[0] << 8) | self.colorData[1]
+      self._fb.fill_rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1, TFT._fbcolor(c))
+      return
+    self._windowcmds(x0, y0, x1, y1)
+    self._sendfill((x1 - x0 + 1) * (y1 - y0 + 1))
 
 #   @micropython.native
   def _setwindowpoint( self, aPos ) :
     '''Set a single point for drawing a color to.'''
-    x = self._offset[0] + int(aPos[0])
-    y = self._offset[1] + int(aPos[1])
-    self._writecommand(TFT.CASET)            #Column address set.
-    self.windowLocData[0] = self._offset[0]
-    self.windowLocData[1] = x
-    self.windowLocData[2] = self._offset[0]
-    self.windowLocData[3] = x
-    self._writedata(self.windowLocData)
-
-    self._writecommand(TFT.RASET)            #Row address set.
-    self.windowLocData[0] = self._offset[1]
-    self.windowLocData[1] = y
-    self.windowLocData[2] = self._offset[1]
-    self.windowLocData[3] = y
-    self._writedata(self.windowLocData)
-    self._writecommand(TFT.RAMWR)            #Write to RAM.
+    self._window(aPos[0], aPos[1], aPos[0], aPos[1])
 
 #   @micropython.native
   def _setwindowloc( self, aPos0, aPos1 ) :
     '''Set a rectangular area for drawing a color to.'''
-    self._writecommand(TFT.CASET)            #Column address set.
-    self.windowLocData[0] = self._offset[0]
-    self.windowLocData[1] = self._offset[0] + int(aPos0[0])
-    self.windowLocData[2] = self._offset[0]
-    self.windowLocData[3] = self._offset[0] + int(aPos1[0])
-    self._writedata(self.windowLocData)
+    self._window(aPos0[0], aPos0[1], aPos1[0], aPos1[1])
 
-    self._writecommand(TFT.RASET)            #Row address set.
-    self.windowLocData[0] = self._offset[1]
-    self.windowLocData[1] = self._offset[1] + int(aPos0[1])
-    self.windowLocData[2] = self._offset[1]
-    self.windowLocData[3] = self._offset[1] + int(aPos1[1])
-    self._writedata(self.windowLocData)
-
-    self._writecommand(TFT.RAMWR)            #Write to RAM.
+#   @micropython.native
+  def _window( self, x0, y0, x1, y1 ) :
+    '''Send CASET, RASET and RAMWR with their data under a single CS
+       assertion, toggling DC between command and data bytes.'''
+    if self._fb is None:
+      #Flushing also sets windows, only count drawing.
+      self._draws += 1
+    self.cs(0)
+    self._windowcmds(x0, y0, x1, y1)
+    self.cs(1)
+    self.transactions += 1
+
+  def _windowcmds( self, x0, y0, x1, y1 ) :
+    '''The window commands of _window, CS must be asserted.'''
+    ox = self._offset[0]
+    oy = self._offset[1]
+    loc = self.windowLocData
+    spi = self.spi
+    dc = self.dc
+    dc(0)
+    spi.write(TFT._CASET)                    #Column address set.
+    loc[0] = ox
+    loc[1] = ox + int(x0)
+    loc[2] = ox
+    loc[3] = ox + int(x1)
+    dc(1)
+    spi.write(loc)
+    dc(0)
+    spi.write(TFT._RASET)                    #Row address set.
+    loc[0] = oy
+    loc[1] = oy + int(y0)
+    loc[2] = oy
+    loc[3] = oy + int(y1)
+    dc(1)
+    spi.write(loc)
+    dc(0)
+    spi.write(TFT._RAMWR)                    #Write to RAM.
 
   #@micropython.native
   def _writecommand( self, aCommand ) :
     '''Write given command to the device.'''
+    self._cmd[0] = aCommand
     self.dc(0)
     self.cs(0)
-    self.spi.write(bytearray([aCommand]))
+    self.spi.write(self._cmd)
     self.cs(1)
+    self.transactions += 1
 
   #@micropython.native
   def _writedata( self, aData ) :
@@ -526,12 +1569,13 @@ class TFT(object) :
     self.cs(0)
     self.spi.write(aData)
     self.cs(1)
+    self.transactions += 1
 
   #@micropython.native
   def _pushcolor( self, aColor ) :
     '''Push given color to the device.'''
     self.colorData[0] = aColor >> 8
-    self.colorData[1] = aColor
+    self.colorData[1] = aColor & 0xff
     self._writedata(self.colorData)
 
   #@micropython.native
@@ -0,0 +1,293 @@
+"""
+Animation - Frame sequences for the ST7735 TFT played at a steady frame rate.
+Plays animation files made by images/convert_animation.py, which store only
+the rectangles that changed since the previous frame, or sprite sheets:
+ordinary image files (see imagefile.py) with the frames side by side.
+Frames are paced with time.ticks_ms(); when drawing falls behind, frames
+are skipped so the animation keeps its speed instead of slowing down.
+
+Usage:
+
+import bot
+from animation import Animation
+
+face = Animation(bot.tft, "/images/blink.anm", update=bot.display_update)
+face.play(20, 10, loops=3)                  # Blocks until done
+face.start(20, 10)                          # Loops in a background thread
+bot.forward(50)                             # Drive while the animation plays
+bot.sleep(2)
+bot.stop()
+face.stop()
+print(face.shown, "frames shown,", face.skipped, "skipped")
+
+sheet = Animation(bot.tft, "/images/walk.bin", frames=8)   # Sprite sheet
+
+Animation file format (all numbers big-endian):
+- Bytes 0-3: Magic b'XWKA'
+- Byte 4: Version (1)
+- Byte 5: Reserved (0)
+- Bytes 6-7: Width, bytes 8-9: Height
+- Bytes 10-11: Number of frames
+- Bytes 12-15: Reserved (0)
+- Frame table, 8 bytes per frame: 32 bit file offset of the frame,
+  16 bit delay in ms until the next frame, flags (bit 0 = keyframe), 0
+- Frame: 16 bit number of rectangles, then per rectangle x, y, width and
+  height (16 bit each) followed by its RGB565 pixels row by row.
+  A keyframe has one rectangle covering the whole frame, the first frame
+  is always a keyframe.
+"""
+
+import time
+from imagefile import ImageFile
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+MAGIC = b'XWKA'
+HEADER = 16
+KEYFRAME = 0x01
+
+class Animation:
+    """
+    An animation file opened for playing. The file stays open, only one
+    rectangle or a few rows of pixels are in RAM at a time.
+    """
+
+    def __init__(self, tft, path, frames=None, fps=10, update=None, buffer=2048):
+        """
+        Args:
+            tft: The display
+            path (str): Animation file or sprite sheet image
+            frames (int): Number of frames of a sprite sheet, defaults to
+                square frames. Ignored for animation files.
+            fps (int): Frame rate of a sprite sheet. Animation files store
+                the delay of each frame.
+            update: Called after each frame, e.g. bot.display_update to
+                send a frame buffer to the display
+            buffer (int): Bytes of pixels read and sent at once
+        """
+        self.tft = tft
+        self.path = path
+        self.update = update
+        self.shown = 0          # Frames drawn since the last play() or start()
+        self.skipped = 0        # Frames skipped to keep up with the frame rate
+        self._buf = memoryview(bytearray(buffer))
+        self._run = False
+        self._done = None       # Lock held by the background thread
+        self._f = open(path, 'rb')
+        head = bytearray(HEADER)
+        self._f.readinto(head)
+        if head[0:4] == MAGIC:
+            self._sheet = None
+            self.width = (head[6] << 8) | head[7]
+            self.height = (head[8] << 8) | head[9]
+            self.count = (head[10] << 8) | head[11]
+            self._table = self._f.read(8 * self.count)
+        else:
+            # Any other file is an image with the frames side by side
+            self._f.close()
+            self._f = None
+            self._sheet = ImageFile(path)
+            self.height = self._sheet.height
+            if frames is None:
+                frames = max(1, self._sheet.width // self.height)
+            self.count = frames
+            self.width = self._sheet.width // frames
+            self._table = None
+        self.fps = fps
+
+    def close(self):
+        """Stop playing and close the file"""
+        self.stop()
+        if self._sheet is not None:
+            self._sheet.close()
+        else:
+            self._f.close()
+
+    def delay(self, index):
+        """Milliseconds from frame index to the next one"""
+        if self._table is None:
+            return 1000 // self.fps
+        t = self._table
+        return (t[index * 8 + 4] << 8) | t[index * 8 + 5]
+
+    def keyframe(self, index):
+        """True if frame index can be drawn without the frames before it"""
+        if self._table is None:
+            return True
+        return bool(self._table[index * 8 + 6] & KEYFRAME)
+
+    def frame(self, index, x=0, y=0):
+        """Draw one frame with the top left corner at x, y, clipped to the screen.
+        Unless it is a keyframe, the previous frame must be on the screen."""
+        if self._table is None:
+            s = self._sheet
+            x0 = index * self.width
+            self._blit(x, y, self.width, self.height,
+                       lambda sy, n, c0, c1, mv: s.rows(sy, n, x0 + c0, x0 + c1, mv))
+            return
+        t = self._table
+        i = index * 8
+        f = self._f
+        f.seek((t[i] << 24) | (t[i + 1] << 16) | (t[i + 2] << 8) | t[i + 3])
+        head = bytearray(8)
+        f.readinto(memoryview(head)[:2])
+        for r in range((head[0] << 8) | head[1]):
+            f.readinto(head)
+            rw = (head[4] << 8) | head[5]
+            rh = (head[6] << 8) | head[7]
+            start = f.tell()
+            self._blit(x + ((head[0] << 8) | head[1]), y + ((head[2] << 8) | head[3]), rw, rh,
+                       lambda sy, n, c0, c1, mv: self._readrect(start, rw, sy, n, c0, c1, mv))
+            # Continue after the pixels, whatever part of them was read
+            f.seek(start + rw * rh * 2)
+
+    def _readrect(self, start, w, y, n, x0, x1, mv):
+        """Read rows y to y + n - 1, columns x0 to x1 of a rectangle's pixels"""
+        f = self._f
+        row = (x1 - x0 + 1) * 2
+        if x0 == 0 and x1 == w - 1:
+            f.seek(start + y * w * 2)
+            f.readinto(mv[:n * row])
+        else:
+            for i in range(n):
+                f.seek(start + ((y + i) * w + x0) * 2)
+                f.readinto(mv[i * row:(i + 1) * row])
+
+    def _blit(self, x, y, w, h, read):
+        """Send the visible part of a w x h rectangle at x, y, a few rows at a time.
+        read(y, n, x0, x1, buf) fills buf with rows y.. and columns x0..x1."""
+        sw, sh = self.tft.size()
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, sw) - 1
+        y1 = min(y + h, sh) - 1
+        if x1 < x0 or y1 < y0:
+            return
+        row = (x1 - x0 + 1) * 2
+        rows = max(1, len(self._buf) // row)
+        if row > len(self._buf):
+            # Wider than the buffer, grow it once
+            self._buf = memoryview(bytearray(row))
+        sy = y0
+        while sy <= y1:
+            n = min(rows, y1 - sy + 1)
+            mv = self._buf[:n * row]
+            read(sy - y, n, x0 - x, x1 - x, mv)
+            self.tft.image(x0, sy, x1, sy + n - 1, mv)
+            sy += n
+
+    def play(self, x=0, y=0, fps=None, loops=1):
+        """
+        Play the animation and return when done.
+
+        Args:
+            x, y (int): Top left corner on the screen
+            fps (int): Frame rate, None for the delays stored in the file
+            loops (int): Number of times to play, 0 plays until stop()
+        """
+        self._run = True
+        self._play(x, y, fps, loops)
+
+    def _delay(self, index, fps):
+        return 1000 // fps if fps else self.delay(index)
+
+    def _play(self, x, y, fps, loops):
+        self.shown = 0
+        self.skipped = 0
+        buffered = self.tft.buffered()
+        index = 0
+        loop = 0
+        due = 0                 # Time of the current frame since start in ms
+        start = time.ticks_ms()
+        while self._run:
+            now = time.ticks_diff(time.ticks_ms(), start)
+            if now - due >= self._delay(index, fps):
+                # More than a frame behind
+                index, due = self._catchup(index, due, fps, now, x, y, buffered)
+            self.frame(index, x, y)
+            if self.update is not None:
+                self.update()
+            self.shown += 1
+            due += self._delay(index, fps)
+            index += 1
+            if index >= self.count:
+                index = 0
+                loop += 1
+                if loops and loop >= loops:
+                    break
+            wait = due - time.ticks_diff(time.ticks_ms(), start)
+            if wait > 0:
+                time.sleep_ms(wait)
+        self._run = False
+
+    def _catchup(self, index, due, fps, now, x, y, buffered):
+        """
+        Skip the frames that are overdue, at most to the end of the loop.
+
+        Returns:
+            tuple: Frame to draw next and the time it was due
+        """
+        target = index
+        t = due
+        while target + 1 < self.count and t + self._delay(target, fps) <= now:
+            t += self._delay(target, fps)
+            target += 1
+        if buffered:
+            # Frames in between only change the frame buffer, the next
+            # update sends what they changed together with the target frame
+            while index < target:
+                self.frame(index, x, y)
+                index += 1
+                self.skipped += 1
+            return index, t
+        # Without a frame buffer frames can only be skipped up to a keyframe
+        k = index
+        tk = due
+        i = index
+        ti = due
+        while i < target:
+            ti += self._delay(i, fps)
+            i += 1
+            if self.keyframe(i):
+                k = i
+                tk = ti
+        if k == index:
+            # Nothing to skip to, continue from now instead of rushing to catch up
+            return index, now
+        self.skipped += k - index
+        return k, tk
+
+    def start(self, x=0, y=0, fps=None, loops=0):
+        """
+        Play in a background thread, the program continues right away.
+        Don't draw anything else on the display until stop() returns.
+        Same arguments as play(), by default loops until stop().
+        """
+        if _thread is None:
+            raise RuntimeError("_thread module not available")
+        self.stop()
+        self._done = _thread.allocate_lock()
+        self._done.acquire()
+        self._run = True
+        _thread.start_new_thread(self._worker, (x, y, fps, loops))
+
+    def _worker(self, x, y, fps, loops):
+        try:
+            self._play(x, y, fps, loops)
+        finally:
+            self._run = False
+            self._done.release()
+
+    def running(self):
+        """True while play() or the background thread is playing"""
+        return self._run
+
+    def stop(self):
+        """Stop playing, waits for the background thread to finish its frame"""
+        self._run = False
+        if self._done is not None:
+            self._done.acquire()
+            self._done.release()
+            self._done = None
@@ -0,0 +1,115 @@
+"""
+BinFont - Fonts in a compact binary file, glyphs are read from flash on demand.
+Unlike sysfont.py, which is compiled into RAM on every boot, only a small
+LRU cache of recently used glyphs is kept in memory. Fonts may be taller than
+8 pixels and proportional. Create font files with images/convert_font.py.
+
+Usage:
+
+from binfont import BinFont
+font = BinFont("/fonts/dejavu_16.fnt")
+tft.text((0, 0), "Hello", TFT.WHITE, font)   # Works wherever sysfont does
+print(font.textwidth("Hello"))                # Width in pixels incl. spacing
+
+File format (all numbers big-endian):
+- Bytes 0-3: Magic b'XWKF'
+- Byte 4: Version (1)
+- Byte 5: Height in pixels
+- Byte 6: Width of the widest glyph
+- Byte 7: Flags, bit 0 = proportional
+- Bytes 8-9: First character code
+- Bytes 10-11: Last character code
+- Bytes 12-15: Reserved
+- Index, 4 bytes per character from first to last: 24 bit file offset of
+  the glyph (0 = no glyph) and 8 bit glyph width
+- Glyph data: one column after the other, (height + 7) // 8 bytes per column,
+  bit 0 of the first byte is the top pixel (same bit order as sysfont)
+"""
+
+from lrucache import LRUCache
+
+MAGIC = b'XWKF'
+HEADER = 16
+PROPORTIONAL = 0x01
+
+class BinFont:
+    """
+    A font file opened for glyph lookups. Also answers the sysfont dict keys
+    'Width' (widest glyph), 'Height', 'Start' and 'End' for code that only
+    needs the metrics.
+    """
+
+    def __init__(self, path, cache=1024):
+        """
+        Args:
+            path (str): Font file
+            cache (int): Bytes of glyph data kept in RAM
+        """
+        self.path = path
+        self._f = open(path, 'rb')
+        head = self._f.read(HEADER)
+        if len(head) < HEADER or head[0:4] != MAGIC:
+            self._f.close()
+            raise ValueError("Not a font file: " + path)
+        self.height = head[5]
+        self.width = head[6]
+        self.proportional = bool(head[7] & PROPORTIONAL)
+        self.start = (head[8] << 8) | head[9]
+        self.end = (head[10] << 8) | head[11]
+        self.bpc = (self.height + 7) // 8     # Bytes per column
+        self.glyphs = LRUCache(cache)
+        self._entry = bytearray(4)
+        self.tag = None     # Identifies the font in TFT's glyph cache, set there
+
+    def __getitem__(self, key):
+        if key == 'Width':
+            return self.width
+        if key == 'Height':
+            return self.height
+        if key == 'Start':
+            return self.start
+        if key == 'End':
+            return self.end
+        raise KeyError(key)
+
+    def glyph(self, code):
+        """
+        Look up a character.
+
+        Args:
+            code (int): Character code
+
+        Returns:
+            tuple: (width, column data) or None if the font has no such glyph
+        """
+        g = self.glyphs.get(code)
+        if g is None:
+            g = self._read(code)
+            # Missing glyphs are cached as False so they aren't looked up again
+            self.glyphs.put(code, g, 8 + (len(g[1]) if g else 0))
+        return g if g else None
+
+    def _read(self, code):
+        if not (self.start <= code <= self.end):
+            return False
+        f = self._f
+        e = self._entry
+        f.seek(HEADER + 4 * (code - self.start))
+        f.readinto(e)
+        offset = (e[0] << 16) | (e[1] << 8) | e[2]
+        if not offset:
+            return False
+        f.seek(offset)
+        return (e[3], f.read(e[3] * self.bpc))
+
+    def textwidth(self, text):
+        """Width of text in pixels as drawn by TFT.text, 1 pixel spacing included"""
+        w = 0
+        for c in text:
+            g = self.glyph(ord(c))
+            w += (g[0] if g else self.width) + 1
+        return w
+
+    def close(self):
+        """Close the font file"""
+        self._f.close()
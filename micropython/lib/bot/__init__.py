@@ -0,0 +1,115 @@
+"""
+bot - All XWK-Bot functions: display, motors, sound, LED, sensors, buttons and WiFi.
+
+The functions live in submodules (bot.display, bot.motors, bot.net ...) that
+are imported when one of their names is used first, so a program that only
+drives the motors never loads the display driver or the network code.
+Only bot.core (config and colors) is imported with the package.
+
+Usage:
+
+import bot
+bot.write("Hello")              # Imports bot.display and sets up the display
+bot.forward(20)                 # Imports bot.motors
+from bot.motors import motor    # Or import from a submodule directly
+
+MOTOR_ALIGNMENT, IMAGE_CACHE and IMAGE_CACHE_MIN_FREE change at runtime, read
+and set them on their submodule (bot.motors.MOTOR_ALIGNMENT ...); reading them
+from bot gives the current value.
+
+The modules and classes bot.py used to import (bot.TFT, bot.sysfont,
+bot.machine ...) resolve the same way. `from bot import *` takes the names from
+__all__ and so imports every submodule; MicroPython builds that don't support
+__all__ only copy the names loaded so far.
+"""
+
+import sys
+from bot.core import config, rgb_to_tft_color, sleep
+from bot.core import BLACK, RED, GREEN, BLUE, CYAN, YELLOW, MAGENTA, WHITE, GREY, GRAY
+
+# Submodule: names bot.<name> resolves by importing it. Submodule names must
+# differ from the function names.
+_MODULES = {
+    'display': ('SCK_PIN', 'SDA_PIN', 'DC_PIN', 'RESET_PIN', 'CS_PIN', 'DISPLAY_BUFFER',
+                'DISPLAY_FPS', 'DISPLAY_STATS', 'TERMINAL_SCROLL', 'display_update',
+                'display_buffer', 'display_instrument', 'display_stats', 'display_doublebuffer',
+                'write', 'terminal_scroll', 'reset_terminal', 'clear_line', 'terminal_lines',
+                'clear', 'spi', 'tft'),
+    'graphics': ('load_font', 'text', 'IMAGE_BUFFER', 'IMAGE_CACHE', 'IMAGE_CACHE_MIN_FREE',
+                 'image', 'image_cache', 'image_cache_clear', 'image_cache_stats',
+                 'load_sprite', 'sprite', 'animate', 'animate_stop'),
+    'ultrasonic': ('TRIGGER_PIN', 'ECHO_PIN', 'distance', 'trigger_pin', 'echo_pin', 'uss'),
+    'battery': ('BATTERY_PIN', 'BATTERY_TIMER', 'BATTERY_INTERVAL_MS', 'battery_voltage_read',
+                'battery_monitor', 'battery_voltage', 'battery_voltage_warning', 'battery_adc'),
+    'motors': ('MOTOR_ALIGNMENT', 'MOTOR_LEFT_FORWARD_PIN', 'MOTOR_LEFT_BACKWARD_PIN',
+               'MOTOR_RIGHT_FORWARD_PIN', 'MOTOR_RIGHT_BACKWARD_PIN', 'MOTOR_PWM_FREQUENCY',
+               'MIN_SPEED', 'MIN_DURATION_MS', 'KICK_START_SPEED', 'KICK_START_DURATION_MS',
+               'motor_alignment', 'motor', 'forward', 'backward', 'turn', 'turn_left',
+               'turn_right', 'turn_random', 'stop', 'INT1_A', 'INT2_A', 'INT1_B', 'INT2_B'),
+    'sound': ('beep', 'shutup', 'sweep', 'beeper'),
+    'led': ('RGB_RED_PIN', 'RGB_GREEN_PIN', 'RGB_BLUE_PIN', 'rgb_led', 'visualize_value',
+            'rgb_led_red', 'rgb_led_green', 'rgb_led_blue'),
+    'infrared': ('IR_LEFT_PIN', 'IR_RIGHT_PIN', 'infrared_left', 'infrared_right',
+                 'ir_is_dark_left', 'ir_is_dark_right', 'ir_is_bright_left',
+                 'ir_is_bright_right', 'infrared_left_pin', 'infrared_right_pin'),
+    'buttons': ('is_pressed', 'BUTTON_UP', 'BUTTON_DOWN', 'BUTTON_LEFT', 'BUTTON_RIGHT', 'BUTTON_A'),
+    'net': ('get_ip', 'network_setup', 'start_ap_mode'),
+}
+
+# Modules and classes the single bot.py module imported: name: (module, attribute or None for the module)
+_IMPORTS = {
+    'gc': ('gc', None), 'machine': ('machine', None), 'time': ('time', None), 'os': ('os', None),
+    'network': ('network', None), 'ubinascii': ('ubinascii', None), 'hcsr04': ('hcsr04', None),
+    'kernels': ('kernels', None), 'Pin': ('machine', 'Pin'), 'SPI': ('machine', 'SPI'),
+    'ADC': ('machine', 'ADC'), 'PWM': ('machine', 'PWM'), 'TFT': ('ST7735', 'TFT'),
+    'TFTColor': ('ST7735', 'TFTColor'), 'sysfont': ('sysfont', 'sysfont'),
+    'Iniconf': ('iniconf', 'Iniconf'), 'sqrt': ('math', 'sqrt'), 'LRUCache': ('lrucache', 'LRUCache'),
+}
+
+# Rebound by their submodule, so they are looked up there every time instead of kept here
+_VARIABLES = ('MOTOR_ALIGNMENT', 'IMAGE_CACHE', 'IMAGE_CACHE_MIN_FREE')
+
+def _module(name):
+    """The submodule bot.<name>, imported if it isn't yet"""
+    mod = sys.modules.get('bot.' + name)
+    if mod is None:
+        __import__('bot.' + name)
+        mod = sys.modules['bot.' + name]
+    return mod
+
+def __getattr__(name):
+    # Only called for names the package doesn't have (yet)
+    for mod, names in _MODULES.items():
+        if name in names:
+            value = getattr(_module(mod), name)
+            if name not in _VARIABLES:
+                globals()[name] = value # The next bot.<name> doesn't come here
+            return value
+    if name in _IMPORTS:
+        mod, attr = _IMPORTS[name]
+        __import__(mod)
+        value = sys.modules[mod]
+        if attr is not None:
+            value = getattr(value, attr)
+        globals()[name] = value
+        return value
+    if name in _MODULES:
+        return _module(name)
+    raise AttributeError(name)
+
+# For `from bot import *`, every name bot.py had
+__all__ = ['config', 'rgb_to_tft_color', 'sleep', 'warmup', 'BLACK', 'RED', 'GREEN', 'BLUE',
+           'CYAN', 'YELLOW', 'MAGENTA', 'WHITE', 'GREY', 'GRAY'] + list(_IMPORTS)
+for _names in _MODULES.values():
+    __all__.extend(_names)
+del _names
+
+def warmup(*subsystems):
+    """Set up hardware now instead of on first use, e.g. at boot so the first motor() call doesn't wait
+
+    Args:
+        subsystems: Names of 'display', 'ultrasonic', 'motors', 'sound', 'led',
+            'infrared', 'buttons', 'battery'. None for all of them.
+    """
+    for name in subsystems or ('display', 'ultrasonic', 'motors', 'sound', 'led', 'infrared', 'buttons', 'battery'):
+        _module(name).warmup()
@@ -0,0 +1,138 @@
+"""
+bot.battery - Battery voltage, sampled in the background by a hardware timer.
+"""
+
+from machine import Pin, ADC, Timer
+from bot.core import config, hardware, sleep, BLACK, RED, YELLOW
+
+### BATTERY
+BATTERY_PIN = 35  # This pin number may need to be adjusted for your specific board
+# Hardware timer sampling the voltage, Timer 1 is the menu's
+BATTERY_TIMER = 2
+# Milliseconds between samples, the battery voltage changes slowly
+BATTERY_INTERVAL_MS = config.get('BATTERY_INTERVAL_MS', default=1000)
+
+_samples = [0, 0, 0] # Last raw readings, the median of them filters out spikes
+_next = 0 # Index in _samples of the next reading
+_filtered = 0 # Moving average of the medians, raw ADC value * 16
+_timer = None # Timer of the running monitor
+
+# Initialize the ADC and start the monitor on first use: bot.battery_adc (see bot.core.hardware)
+def _init_battery():
+    global battery_adc
+    # Create ADC object on the VBAT pin
+    # Note: You'll need to identify the correct pin number from your board's pinout
+    adc = ADC(Pin(BATTERY_PIN))
+
+    # Configure ADC
+    adc.atten(ADC.ATTN_11DB)  # Full range: 3.3V
+    adc.width(ADC.WIDTH_12BIT)  # 12-bit resolution
+    battery_adc = adc
+    battery_monitor(True)
+
+def _voltage(raw_value):
+    """Battery voltage of a raw ADC reading"""
+    # Convert to voltage
+    # With 12-bit resolution (0-4095) and 3.3V reference
+    voltage = (raw_value * 3.3) / 4095.0
+
+    # Add calibration factor (displayed voltage vs multimeter measurement)
+    calibration_factor = 1.015
+    
+    # If there's a voltage divider on your board, adjust the calculation
+    # Example: if it's a 1:2 divider, multiply by 2
+    actual_voltage = voltage * 2 * calibration_factor 
+    
+    return actual_voltage
+
+def battery_voltage_read():
+    """Read the battery voltage now, a single unfiltered reading (see battery_voltage())"""
+    # Read raw value
+    raw_value = _lazy('battery_adc').read()
+    return _voltage(raw_value)
+
+def _sample(timer=None):
+    """Add a reading to the filtered voltage, called by the timer"""
+    global _next, _filtered
+    _samples[_next] = battery_adc.read()
+    _next = (_next + 1) % 3
+    # Median of three, then an exponential moving average with weight 1/4.
+    # Integers only, the timer calls this every BATTERY_INTERVAL_MS
+    a, b, c = _samples
+    median = max(min(a, b), min(max(a, b), c))
+    _filtered += (median * 16 - _filtered) >> 2
+
+def _seed():
+    """Start the filter at the current voltage: median of three readings now"""
+    global _filtered
+    adc = _lazy('battery_adc')
+    for i in range(3):
+        _samples[i] = adc.read()
+    a, b, c = _samples
+    _filtered = max(min(a, b), min(max(a, b), c)) * 16
+
+def battery_monitor(enable=True, interval_ms=None):
+    """Sample the battery voltage in the background for battery_voltage()
+
+    Started when the battery is used first, e.g. by the first motor() call.
+
+    Args:
+        enable: True to start sampling, False to stop the timer
+        interval_ms: Milliseconds between samples, default BATTERY_INTERVAL_MS
+    """
+    global _timer
+    if _timer is not None:
+        _timer.deinit()
+        _timer = None
+    if not enable:
+        return
+    _seed() # Instead of starting the average at 0
+    _timer = Timer(BATTERY_TIMER)
+    # On the ESP32 timer callbacks are scheduled like a soft interrupt, so
+    # they run between Python statements and can't break a running ADC read
+    _timer.init(period=interval_ms or BATTERY_INTERVAL_MS, mode=Timer.PERIODIC, callback=_sample)
+
+def battery_voltage():
+    """Filtered battery voltage, without waiting for the ADC
+
+    Returns:
+        float: Voltage of the last samples of the background monitor, steady
+            against ADC noise. With the monitor stopped, the median of three
+            readings taken now (the samples of the stopped monitor are stale).
+    """
+    _lazy('battery_adc') # Start the monitor on first use
+    if _timer is None:
+        _seed()
+    return _voltage(_filtered / 16)
+
+def battery_voltage_warning():
+    # For 4*1.5V AAA batteries
+    voltage = battery_voltage()
+
+    if voltage > 5.2:   
+        return False
+
+    # Only needed for the warning, so motor() doesn't pull in the display
+    from bot.display import write, reset_terminal
+    from bot.led import rgb_led
+    from bot.sound import beep
+    
+    if voltage < 4.7:
+        write(f"Battery empty! {voltage:.2f}V", color=RED)
+        rgb_led(RED)
+    else:
+        write(f"Battery soon empty! {voltage:.2f}V", color=YELLOW)
+        rgb_led(YELLOW)
+
+    beep(1000, 100)
+    sleep(0.1)
+    beep(1000, 100)
+    sleep(0.1)
+    beep(1000, 100)        
+
+    sleep(1)
+
+    rgb_led(BLACK)
+    reset_terminal()
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_battery, ('battery_adc',))
@@ -0,0 +1,21 @@
+"""
+bot.buttons - The five buttons.
+"""
+
+from machine import Pin
+from bot.core import config, hardware
+
+### BUTTONS
+# Load button pin configuration, pins are set up on first use: bot.BUTTON_UP ... bot.BUTTON_A (see bot.core.hardware)
+def _init_buttons():
+    global BUTTON_UP, BUTTON_DOWN, BUTTON_LEFT, BUTTON_RIGHT, BUTTON_A
+    BUTTON_UP = Pin(config.get('UP_PIN'), Pin.IN, Pin.PULL_UP)
+    BUTTON_DOWN = Pin(config.get('DOWN_PIN'), Pin.IN, Pin.PULL_UP)
+    BUTTON_LEFT = Pin(config.get('LEFT_PIN'), Pin.IN, Pin.PULL_UP)
+    BUTTON_RIGHT = Pin(config.get('RIGHT_PIN'), Pin.IN, Pin.PULL_UP)
+    BUTTON_A = Pin(config.get('A_PIN'), Pin.IN, Pin.PULL_UP)
+
+def is_pressed(button):
+    return not button.value()  # Returns True if button is pressed (low)
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_buttons, ('BUTTON_UP', 'BUTTON_DOWN', 'BUTTON_LEFT', 'BUTTON_RIGHT', 'BUTTON_A'))
@@ -0,0 +1,85 @@
+"""
+bot.core - Config, colors and helpers every part of the bot package uses.
+Imported with the bot package, keep it small: no display or network code.
+"""
+
+import sys
+import time
+from iniconf import Iniconf
+
+### CONFIG HANDLING
+# Initialize config manager
+config = Iniconf()
+
+def rgb_to_tft_color(rgb_tuple):
+    """Convert RGB tuple (0-255 per channel) to 16-bit RGB565 format
+
+    Args:
+        rgb_tuple: Tuple of (r,g,b) values from 0-255
+
+    Returns:
+        16-bit RGB565 color value
+    """
+    r, g, b = rgb_tuple
+    # Same as ST7735.TFTColor, without importing the display driver
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+# Define colors as RGB tuples (0-255 for each component)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+CYAN = (0, 255, 255)
+YELLOW = (255, 255, 0)
+MAGENTA = (255, 0, 255)
+WHITE = (255, 255, 255)
+GREY = (128, 128, 128)
+GRAY = (128, 128, 128)
+
+### FRIENDLY FUNCTIONS
+def sleep(quantity, unit = "s"):
+    # Send changes a skipped display_update() left behind before idling
+    # (without importing the display code if nothing used it yet)
+    display = sys.modules.get('bot.display')
+    if display is not None:
+        display._idle()
+    if unit == "ms":
+        return time.sleep_ms(quantity)
+
+    return time.sleep(quantity)
+
+### LAZY HARDWARE
+def hardware(g, init, names):
+    """Set up the hardware of a subsystem module when it is used first
+
+    So a program that only reads a sensor doesn't wait for the display.
+    bot.tft, bot.uss, bot.BUTTON_A ... work as before: reading them sets up
+    their subsystem (see __getattr__).
+
+    Args:
+        g: globals() of the module
+        init: Function of the module setting up the hardware
+        names: Names init defines, the last one is set last
+
+    Returns:
+        tuple: (_lazy, __getattr__, warmup) for the module:
+            _lazy(name) returns a hardware object, set up if it isn't yet,
+            warmup() sets up the hardware now instead of on first use
+    """
+    def _lazy(name):
+        obj = g.get(name)
+        if obj is None:
+            init()
+            obj = g[name]
+        return obj
+
+    def __getattr__(name):
+        # Only called for names the module doesn't have (yet)
+        if name in names:
+            return _lazy(name)
+        raise AttributeError(name)
+
+    def warmup():
+        _lazy(names[-1])
+
+    return _lazy, __getattr__, warmup
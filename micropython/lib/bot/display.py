@@ -0,0 +1,185 @@
+"""
+bot.display - The TFT display and the text terminal: write(), clear() ...
+"""
+
+from machine import SPI
+from ST7735 import TFT # GMT-177-01 128x160px TFTST7735 display
+from sysfont import sysfont
+from bot.core import config, rgb_to_tft_color, hardware, BLACK, WHITE
+
+### DISPLAY
+# Load display pin configuration
+SCK_PIN = config.get('SCK_PIN')
+SDA_PIN = config.get('SDA_PIN')
+DC_PIN = config.get('DC_PIN')
+RESET_PIN = config.get('RESET_PIN')
+CS_PIN = config.get('CS_PIN')
+# Draw into a 40 KB RAM frame buffer and only send changed regions to the display
+# 2 = double buffered, a background thread sends the changes (another 40 KB)
+DISPLAY_BUFFER = config.get('DISPLAY_BUFFER', default=0)
+# Maximum frame rate of the background thread with DISPLAY_BUFFER=2 (0 = unlimited)
+DISPLAY_FPS = config.get('DISPLAY_FPS', default=25)
+# Count display traffic and time per drawing function, see display_stats()
+DISPLAY_STATS = config.get('DISPLAY_STATS', default=0)
+# Scroll the terminal instead of clearing it when full (redraws all lines in landscape without DISPLAY_BUFFER)
+TERMINAL_SCROLL = config.get('TERMINAL_SCROLL', default=0)
+
+# Initialize display on first use: bot.spi and bot.tft (see bot.core.hardware)
+def _init_display():
+    global spi, tft
+    spi = SPI(1, baudrate=60000000, polarity=0, phase=0, miso=None) # Using default SPI pins from >>> print(machine.SPI(1))
+    t = TFT(spi, DC_PIN, RESET_PIN, CS_PIN)
+    t.initr()
+    t.rgb(True)
+    t.rotation(1) # landscape orientation - pins on the right
+    if DISPLAY_BUFFER:
+        t.framebuffer(True)
+    t.fill(rgb_to_tft_color(BLACK)) # reset screen to black
+    t.flush() # send the cleared frame buffer (no-op without DISPLAY_BUFFER)
+    if DISPLAY_BUFFER == 2:
+        t.doublebuffer(True, DISPLAY_FPS)
+    if TERMINAL_SCROLL:
+        t.terminal_scroll(True)
+    if DISPLAY_STATS:
+        t.instrument(True)
+    tft = t # Set last, the display is only used when it is ready
+
+def display_update():
+    """Send changed regions of the frame buffer to the display (no-op in direct mode)
+    
+    Double buffered, the changes are handed to the background thread and this
+    returns at once. If the thread is still busy or the frame rate limit is
+    reached, the changes go out with a later update.
+    """
+    tft = _lazy('tft')
+    if tft.doublebuffered():
+        tft.swap()
+    elif tft.buffered():
+        tft.flush()
+
+def display_buffer(enable=True):
+    """Switch the frame buffer on or off. The screen is cleared.
+    
+    With the buffer enabled, drawing goes to RAM and only the changed
+    regions are sent to the display. tft.flush_rects and tft.flush_bytes
+    tell how much the last update has sent.
+    """
+    tft = _lazy('tft')
+    tft.framebuffer(enable)
+    tft.terminal_reset()
+    display_update()
+
+def display_instrument(enable=True):
+    """Switch the display statistics on or off, see display_stats()"""
+    tft = _lazy('tft')
+    tft.instrument(enable)
+
+def display_stats(reset=False):
+    """Show where display time goes, e.g. whether write() or image() dominates a loop.
+    
+    Statistics are collected after display_instrument() or with DISPLAY_STATS=1.
+    
+    Args:
+        reset: Set all counters to zero after reading them
+        
+    Returns:
+        dict: Per drawing function (terminal = write(), image = image() ...)
+            calls, us (microseconds), commands and data (bytes sent),
+            cs_toggles and transactions. 'total' sums them up.
+            Empty if statistics are off.
+    """
+    tft = _lazy('tft')
+    stats = tft.stats()
+    if reset:
+        tft.reset_stats()
+    return stats
+
+def display_doublebuffer(enable=True, fps=DISPLAY_FPS):
+    """Send the frame buffer from a background thread, so drawing never waits for the display.
+    
+    Args:
+        enable: True to switch double buffering on (enables the frame buffer too)
+        fps: Maximum number of frames per second sent, 0 for no limit
+    """
+    tft = _lazy('tft')
+    if enable:
+        tft.doublebuffer(True, fps)
+    else:
+        tft.doublebuffer(False)
+        tft.flush()
+
+# "Terminal", write to next line until display is full, then reset
+#def write(text, color = TFT.WHITE):
+#    tft.terminal(text, color, sysfont)
+def write(*args, **kwargs):    
+    text = ""
+    
+    # Convert normal arguments to string and concatenate
+    for arg in args:        
+        text += str(arg)
+        
+    # Check for keyword arguments
+    color = WHITE  # Now using our RGB tuple colors
+    newline = True
+    line = None
+    
+    if 'color' in kwargs:
+        color = kwargs['color']
+    if 'newline' in kwargs:
+        newline = kwargs['newline']
+    if 'line' in kwargs:
+        line = kwargs['line']
+        newline = False  # Force newline to False when using line parameter
+
+    # Convert RGB tuple to TFT color
+    tft_color = rgb_to_tft_color(color)
+        
+    _lazy('tft').terminal(text, tft_color, sysfont, newline, line)
+    display_update()
+
+def terminal_scroll(enable=True):
+    """Scroll the terminal by one line when the screen is full instead of clearing it.
+    
+    The display can only scroll along its long side in hardware, so in the
+    default landscape orientation the frame buffer (DISPLAY_BUFFER=1) is
+    scrolled. Without it the lines are redrawn one line up, which is slower.
+    """
+    _lazy('tft').terminal_scroll(enable)
+    display_update()
+
+def reset_terminal():
+    """Reset the terminal cursor position to top of screen"""
+    tft = _lazy('tft')
+    tft.terminal_reset()  # Use TFT's terminal reset function
+    display_update()
+
+def clear_line(line):
+    """Clear one line of the terminal, e.g. before writing a shorter text to it with write(..., line=)
+    
+    Args:
+        line: Line number, 0 is the top line
+    """
+    _lazy('tft').terminal_clear_line(line)
+    display_update()
+
+def terminal_lines():
+    """Text shown on the terminal, without reading the display
+    
+    Returns:
+        list: One entry per line from the top, each a list of (text, color)
+            runs with RGB565 colors. Lines not written are empty lists.
+    """
+    return _lazy('tft').terminal_lines()
+
+def clear():
+    tft = _lazy('tft')
+    tft.terminal_reset()
+    display_update()
+
+def _idle():
+    """Send changes a skipped display_update() left behind, called by sleep()"""
+    tft = globals().get('tft') # Without setting up the display if nothing used it yet
+    if tft is not None and tft.doublebuffered():
+        tft.swap(True)
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_display, ('spi', 'tft'))
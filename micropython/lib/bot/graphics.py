@@ -0,0 +1,395 @@
+"""
+bot.graphics - Text, images, sprites and animations on the display.
+"""
+
+import gc
+import os
+from sysfont import sysfont
+from lrucache import LRUCache
+import kernels # Pixel loops, compiled with viper if the firmware can
+from bot.core import config, rgb_to_tft_color, BLACK, WHITE
+from bot.display import display_update, _lazy
+
+_fonts = {} # Opened binary fonts by path
+
+def load_font(path):
+    """Open a binary font file (see images/convert_font.py), each file is opened only once
+    
+    Returns:
+        BinFont: Font for text(), glyphs are read from flash when needed
+    """
+    f = _fonts.get(path)
+    if f is None:
+        from binfont import BinFont
+        f = _fonts[path] = BinFont(path)
+    return f
+
+def text(text, x=0, y=0, color=WHITE, size=1, background=BLACK, font=None):
+    """Draw text at a pixel position, e.g. a big distance or voltage readout
+    
+    Args:
+        text: Text or number to display
+        x: Left position in pixels
+        y: Top position in pixels
+        color: RGB tuple for the text
+        size: Scaling factor (3 = three times as big)
+        background: RGB tuple for the background, None for transparent
+        font: Path of a binary font file or a font from load_font(), None for the built-in font
+    """
+    if font is None:
+        font = sysfont
+    elif isinstance(font, str):
+        font = load_font(font)
+    bg = None if background is None else rgb_to_tft_color(background)
+    _lazy('tft').text((x, y), str(text), rgb_to_tft_color(color), font, size, aBgColor=bg)
+    display_update()
+
+def _image_repeat(buf, unit, total):
+    """Fill buf[0:total] by repeating its first unit bytes
+    
+    The filled part is doubled with each slice copy, so only about
+    log2(total / unit) copies are needed.
+    
+    Args:
+        buf: memoryview of the buffer
+        unit: Number of bytes at the start of buf to repeat
+        total: Number of bytes to fill
+    """
+    n = unit
+    while n < total:
+        c = min(n, total - n)
+        buf[n:n + c] = buf[0:c]
+        n += c
+
+def _image_scale_map(x, x0, x1, scale):
+    """Screen columns covered by each visible source pixel
+    
+    Args:
+        x: Screen x of the scaled image's left edge
+        x0, x1: Visible screen columns
+        scale: Scaling factor
+        
+    Returns:
+        bytearray: Width in columns per source pixel, the first and the last
+        can be less than scale when clipped by the screen edge
+    """
+    widths = bytearray()
+    px = x0
+    while px <= x1:
+        end = min(x + ((px - x) // scale + 1) * scale, x1 + 1)
+        widths.append(end - px)
+        px = end
+    return widths
+
+IMAGE_BUFFER = 2048 # Bytes of pixel rows image() reads and sends at once
+# Bytes of decoded images kept in RAM, so redrawing an image doesn't read the file again (0 = off)
+IMAGE_CACHE = config.get('IMAGE_CACHE', default=0)
+# The image cache is emptied when less memory than this is free
+IMAGE_CACHE_MIN_FREE = config.get('IMAGE_CACHE_MIN_FREE', default=20000)
+
+_image_cache = LRUCache(IMAGE_CACHE) # Ready to send pixels by (path, file stamp, scale, clip)
+_image_sizes = {} # Image size by path: (file stamp, width, height)
+_image_purges = 0 # Number of times the cache was emptied for lack of memory
+
+def _image_place(width, height, scale, x, y):
+    """Position and visible part of a scaled image
+    
+    Returns:
+        tuple: (x, y, x0, y0, x1, y1) with the top-left position and the
+        visible screen rectangle, None if the image is off-screen
+    """
+    # Calculate scaled dimensions
+    scaled_width = width * scale
+    scaled_height = height * scale
+    
+    # Use provided position or center if None
+    screen_width, screen_height = _lazy('tft').size()
+    if x is None:
+        x = (screen_width - scaled_width) // 2
+    if y is None:
+        y = (screen_height - scaled_height) // 2
+    
+    # Visible part on screen, nothing to do if the image is off-screen
+    x0 = max(x, 0)
+    y0 = max(y, 0)
+    x1 = min(x + scaled_width, screen_width) - 1
+    y1 = min(y + scaled_height, screen_height) - 1
+    if x1 < x0 or y1 < y0:
+        return None
+    return (x, y, x0, y0, x1, y1)
+
+def _image_key(filepath, stamp, scale, place):
+    """Cache key: the file, the scale and the visible part in image coordinates"""
+    x, y, x0, y0, x1, y1 = place
+    return (filepath, stamp, scale, x0 - x, y0 - y, x1 - x, y1 - y)
+
+def _image_memory(nbytes=0):
+    """Empty the image cache if fewer than IMAGE_CACHE_MIN_FREE bytes would be left
+    
+    Args:
+        nbytes: Bytes about to be allocated for a new cache entry
+        
+    Returns:
+        bool: True if nbytes can be allocated
+    """
+    global _image_purges
+    if gc.mem_free() - nbytes >= IMAGE_CACHE_MIN_FREE:
+        return True
+    if len(_image_cache):
+        _image_cache.clear()
+        _image_purges += 1
+    gc.collect()
+    return gc.mem_free() - nbytes >= IMAGE_CACHE_MIN_FREE
+
+def image(filepath, scale=5, x=None, y=None, cache=True):
+    """Display an image file on the screen
+    
+    The file is streamed: only the rows and columns that are visible on the
+    screen are read, a few rows at a time, so images of any size need only
+    IMAGE_BUFFER bytes of RAM and may be partly outside the screen.
+    With IMAGE_CACHE set (see image_cache()), the visible pixels are kept
+    in RAM and drawing the same image at the same scale again sends them
+    without reading the file.
+    
+    Args:
+        filepath: Absolute path to the image file
+        scale: Optional scaling factor (1 = original size)
+        x: Optional x coordinate for top-left position (centers if None)
+        y: Optional y coordinate for top-left position (centers if None)
+        cache: False to never cache this image, e.g. a large one-off picture
+        
+    File Format:
+        - Bytes 0-1: Width (16-bit unsigned integer, big-endian)
+        - Bytes 2-3: Height (16-bit unsigned integer, big-endian)
+        - Bytes 4+: RGB565 pixel data (2 bytes per pixel)
+        Files made by images/convert_to_rgb565.py can also be run-length
+        encoded or palette images, see lib/imagefile.py
+    """
+    from imagefile import ImageFile
+    tft = _lazy('tft')
+    try:
+        cache = cache and _image_cache.budget > 0
+        if cache:
+            _image_memory()
+            # Size and modification time, a changed file gets new cache keys
+            st = os.stat(filepath)
+            stamp = (st[6], st[8])
+            size = _image_sizes.get(filepath)
+            if size is not None and size[0] == stamp:
+                place = _image_place(size[1], size[2], scale, x, y)
+                if place is None:
+                    return
+                buf = _image_cache.get(_image_key(filepath, stamp, scale, place))
+                if buf is not None:
+                    tft.image(place[2], place[3], place[4], place[5], buf)
+                    display_update()
+                    return
+            else:
+                # Unknown size, the cache can't be looked up but it's a miss all the same
+                _image_cache.misses += 1
+        
+        # Read header and dimensions
+        with ImageFile(filepath) as f:
+            original_width = f.width
+            height = f.height
+            
+            # Verify reasonable dimensions
+            if original_width <= 0 or height <= 0 or original_width > 1000 or height > 1000:
+                raise ValueError(f"Invalid image dimensions: {original_width}x{height}")
+            
+            if cache:
+                _image_sizes[filepath] = (stamp, original_width, height)
+            place = _image_place(original_width, height, scale, x, y)
+            if place is None:
+                return
+            x, y, x0, y0, x1, y1 = place
+            # Source rows and columns that cover the visible part
+            src_x0 = (x0 - x) // scale
+            src_x1 = (x1 - x) // scale
+            src_y0 = (y0 - y) // scale
+            src_y1 = (y1 - y) // scale
+            row_bytes = (src_x1 - src_x0 + 1) * 2
+            
+            # Send the pixels to the display, or collect them for the cache
+            draw = tft.image
+            cached = None
+            if cache:
+                nbytes = (x1 - x0 + 1) * (y1 - y0 + 1) * 2
+                if nbytes <= _image_cache.budget and _image_memory(nbytes):
+                    pixels = bytearray(nbytes)
+                    cached = memoryview(pixels)
+                    def draw(dx0, dy0, dx1, dy1, data):
+                        # Rows are full visible width, so the block is contiguous
+                        i = (dy0 - y0) * (x1 - x0 + 1) * 2
+                        cached[i:i + len(data)] = data
+            
+            if scale == 1:
+                # Display directly at 1:1 scale - fastest method
+                # Read as many visible rows as fit into the buffer and send them as one window
+                rows = max(1, IMAGE_BUFFER // row_bytes)
+                buf = memoryview(bytearray(rows * row_bytes))
+                sy = src_y0
+                while sy <= src_y1:
+                    n = min(rows, src_y1 - sy + 1)
+                    f.rows(sy, n, src_x0, src_x1, buf[:n * row_bytes])
+                    draw(x0, y + sy, x1, y + sy + n - 1, buf[:n * row_bytes])
+                    sy += n
+            else:
+                # Scale one source row at a time - good balance of speed and memory
+                src_buf = bytearray(row_bytes)
+                line_bytes = (x1 - x0 + 1) * 2  # 2 bytes per pixel
+                # All visible scaled rows of one source row, as many as fit into the buffer
+                block_rows = max(1, min(scale, IMAGE_BUFFER // line_bytes))
+                block = memoryview(bytearray(block_rows * line_bytes))
+                # Number of screen columns each visible source pixel covers, computed once
+                widths = _image_scale_map(x, x0, x1, scale)
+                
+                # Scale and display one line at a time
+                for sy in range(src_y0, src_y1 + 1):
+                    # Read the visible part of the source line
+                    f.rows(sy, 1, src_x0, src_x1, src_buf)
+                    
+                    # Scale this line horizontally into the first row of the block (viper where available)
+                    kernels.scale_row(block, src_buf, widths)
+                    
+                    # Repeat the scaled line vertically, clipped to the screen
+                    py0 = max(y + sy*scale, y0)
+                    py1 = min(y + sy*scale + scale - 1, y1)
+                    n = min(block_rows, py1 - py0 + 1)
+                    _image_repeat(block, line_bytes, n * line_bytes)
+                    # One window per block, more only if the block doesn't fit into IMAGE_BUFFER
+                    while py0 <= py1:
+                        n = min(block_rows, py1 - py0 + 1)
+                        draw(x0, py0, x1, py0 + n - 1, block[:n * line_bytes])
+                        py0 += n
+            
+            if cached is not None:
+                # Whole visible image in one window
+                tft.image(x0, y0, x1, y1, cached)
+                _image_cache.put(_image_key(filepath, stamp, scale, place), pixels)
+            
+            display_update()
+
+            # Clean up memory
+            gc.collect()
+                    
+    except Exception as e:
+        print("Error displaying image:", e)
+
+def image_cache(budget, min_free=None):
+    """Set the size of the image cache
+    
+    Args:
+        budget: Bytes of decoded images kept in RAM, 0 switches the cache off
+        min_free: Empty the cache when less memory than this is free
+    """
+    global IMAGE_CACHE, IMAGE_CACHE_MIN_FREE
+    IMAGE_CACHE = budget
+    if min_free is not None:
+        IMAGE_CACHE_MIN_FREE = min_free
+    _image_cache.resize(budget)
+    if not budget:
+        image_cache_clear()
+
+def image_cache_clear():
+    """Free the memory of all cached images"""
+    _image_cache.clear()
+    _image_sizes.clear()
+    gc.collect()
+
+def image_cache_stats(reset=False):
+    """Show how well the image cache works
+    
+    Args:
+        reset: Set the counters to zero after reading them
+        
+    Returns:
+        dict: entries, bytes, budget, hits, misses, evictions (dropped
+            because the budget was full), purges (cache emptied for lack
+            of memory) and min_free
+    """
+    global _image_purges
+    stats = _image_cache.stats()
+    stats['purges'] = _image_purges
+    stats['min_free'] = IMAGE_CACHE_MIN_FREE
+    if reset:
+        _image_cache.reset_stats()
+        _image_purges = 0
+    return stats
+
+_sprites = {} # Loaded sprites by path and color key
+
+def load_sprite(filepath, key=None):
+    """Load an image file as sprite, each file is loaded only once
+    
+    Args:
+        filepath: Image file (see image())
+        key: RGB tuple of the transparent color, None for the color of the top left pixel
+        
+    Returns:
+        Sprite: Use with sprite(), or draw it yourself with .draw(bot.tft, x, y)
+    """
+    from sprite import Sprite
+    s = _sprites.get((filepath, key))
+    if s is None:
+        s = _sprites[(filepath, key)] = Sprite.load(filepath, key)
+    return s
+
+def sprite(filepath, x=0, y=0, key=None):
+    """Draw an image with a transparent color, e.g. an animated eye or arrow
+    
+    Only the non-transparent pixels are sent, the background stays as it is.
+    The sprite may be partly outside the screen.
+    
+    Args:
+        filepath: Raw RGB565 image file or a sprite from load_sprite()
+        x: Left position in pixels
+        y: Top position in pixels
+        key: RGB tuple of the transparent color, None for the color of the top left pixel
+    """
+    s = load_sprite(filepath, key) if isinstance(filepath, str) else filepath
+    s.draw(_lazy('tft'), x, y)
+    display_update()
+
+_animation = None # Animation playing in the background
+
+def animate(filepath, x=0, y=0, fps=None, loops=1, frames=None, background=False):
+    """Play an animation at a steady frame rate, e.g. a robot face or a boot animation
+
+    Frames are timed with time.ticks_ms(). If drawing takes longer than the
+    frame rate allows, frames are skipped so the animation keeps its speed.
+
+    Args:
+        filepath: Animation file (see images/convert_animation.py) or a sprite
+            sheet image with the frames side by side
+        x: Left position in pixels
+        y: Top position in pixels
+        fps: Frames per second, None for the timing stored in the animation file
+            (sprite sheets default to 10)
+        loops: Number of times to play the animation, 0 = until stopped
+        frames: Number of frames of a sprite sheet, None for square frames
+        background: True to play in a background thread and return at once.
+            Don't draw anything else until the animation is stopped.
+
+    Returns:
+        Animation: .stop() ends a background animation, .shown and .skipped count frames
+    """
+    global _animation
+    from animation import Animation
+    # Only one animation can use the display at a time
+    animate_stop()
+    a = Animation(_lazy('tft'), filepath, frames, update=display_update)
+    if background:
+        _animation = a
+        a.start(x, y, fps, loops)
+    else:
+        a.play(x, y, fps, loops)
+        a.close()
+    return a
+
+def animate_stop():
+    """Stop the background animation started by animate(), if any"""
+    global _animation
+    if _animation is not None:
+        _animation.close()
+        _animation = None
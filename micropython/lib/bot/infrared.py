@@ -0,0 +1,39 @@
+"""
+bot.infrared - The two infrared line sensors.
+"""
+
+from machine import Pin
+from bot.core import config, hardware
+
+### INFRARED SENSORS
+# Load IR sensor pin configuration
+IR_LEFT_PIN = config.get('IR_LEFT_PIN')
+IR_RIGHT_PIN = config.get('IR_RIGHT_PIN')
+
+# Initialize on first use: bot.infrared_left_pin and bot.infrared_right_pin (see bot.core.hardware)
+def _init_infrared():
+    global infrared_left_pin, infrared_right_pin
+    infrared_left_pin = Pin(IR_LEFT_PIN, Pin.IN)
+    infrared_right_pin = Pin(IR_RIGHT_PIN, Pin.IN)
+
+# Return true/1 if the left infrared sensor detects an object
+def infrared_left():
+    return not _lazy('infrared_left_pin').value()
+
+# Return true/1 if the right infrared sensor detects an object
+def infrared_right():
+    return not _lazy('infrared_right_pin').value()   
+
+def ir_is_dark_left():
+    return not infrared_left()
+
+def ir_is_dark_right():
+    return not infrared_right()
+
+def ir_is_bright_left():
+    return infrared_left()
+
+def ir_is_bright_right():
+    return infrared_right()
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_infrared, ('infrared_left_pin', 'infrared_right_pin'))
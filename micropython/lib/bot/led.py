@@ -0,0 +1,56 @@
+"""
+bot.led - The RGB LED.
+"""
+
+from machine import Pin, PWM
+from bot.core import config, hardware, BLACK
+
+### RGB LED
+# Load RGB LED pin configuration
+RGB_RED_PIN = config.get('RED_PIN')
+RGB_GREEN_PIN = config.get('GREEN_PIN')
+RGB_BLUE_PIN = config.get('BLUE_PIN')
+
+# Initialize RGB LED PWM pins on first use: bot.rgb_led_red ... (see bot.core.hardware)
+def _init_led():
+    global rgb_led_red, rgb_led_green, rgb_led_blue
+    rgb_led_red = PWM(Pin(RGB_RED_PIN), freq=1000)
+    rgb_led_green = PWM(Pin(RGB_GREEN_PIN), freq=1000)
+    rgb_led_blue = PWM(Pin(RGB_BLUE_PIN), freq=1000)
+    rgb_led(BLACK)  # Start with led off
+
+# Function to set color using TFT color constants
+def rgb_led(color):
+    #print("rgb_led()", color)
+    """Set RGB LED color using RGB tuple (0-255 per channel)"""
+    r, g, b = color
+    _lazy('rgb_led_blue') # Set up the LED pins used below
+    
+    # Convert 8-bit values (0-255) to 16-bit values (0-65535) for duty_u16
+    rgb_led_red.duty_u16(int(r * 65535 / 255))
+    rgb_led_green.duty_u16(int(g * 65535 / 255))
+    rgb_led_blue.duty_u16(int(b * 65535 / 255))
+
+# Displays a gradient from green to yellow to red on an RGB LED based on an input value between 0 and 255.
+def visualize_value(value):
+    # Ensure the input value is within 0 to 255
+    value = max(0, min(255, value))
+    
+    if value <= 127:
+        # From red to yellow: Decrease red, green starts from 0
+        red = 255 - int((value / 127) * 255)
+        green = int((value / 127) * 255)
+    else:
+        # From yellow to green: Red is 0, increase green
+        red = 0
+        green = int(((value - 128) / 127) * 255)
+        
+    #print(red,green)        
+    
+    # No blue component needed for this gradient
+    blue = 0
+    
+    # Use the rgb_led function to set the color
+    rgb_led((red, green, blue))
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_led, ('rgb_led_red', 'rgb_led_green', 'rgb_led_blue'))
@@ -0,0 +1,223 @@
+"""
+bot.motors - The two drive motors on the MX1508 motor board.
+"""
+
+import time
+from machine import Pin, PWM
+from bot.core import config, hardware, sleep, CYAN, GREEN, GREY, WHITE, YELLOW
+from bot.battery import battery_voltage
+
+### MOTOR BOARD MX1508
+# Connect all ground / minus pins (battery, motor controller, microcontroller
+# Connect plus of motor controller to battery plus
+
+# Motor alignment adjustment (-100 to +100)
+# Negative values slow down left motor
+# Positive values slow down right motor
+MOTOR_ALIGNMENT = config.get('MOTOR_ALIGNMENT', default=0)
+
+# Motor A Control Pins
+# Do not use pins 15,2,0,4 -> 15 and 0 are 3.3V at boot!
+MOTOR_LEFT_FORWARD_PIN = config.get('LEFT_FORWARD_PIN')
+MOTOR_LEFT_BACKWARD_PIN = config.get('LEFT_BACKWARD_PIN')
+MOTOR_RIGHT_FORWARD_PIN = config.get('RIGHT_FORWARD_PIN')
+MOTOR_RIGHT_BACKWARD_PIN = config.get('RIGHT_BACKWARD_PIN')
+
+MOTOR_PWM_FREQUENCY = 500
+
+# Initialize motor PWM pins on first use: bot.INT1_A ... bot.INT2_B (see bot.core.hardware)
+def _init_motors():
+    global INT1_A, INT2_A, INT1_B, INT2_B
+    INT1_A = PWM(Pin(MOTOR_LEFT_FORWARD_PIN))
+    INT2_A = PWM(Pin(MOTOR_LEFT_BACKWARD_PIN))
+    INT1_B = PWM(Pin(MOTOR_RIGHT_FORWARD_PIN))
+    INT2_B = PWM(Pin(MOTOR_RIGHT_BACKWARD_PIN))
+
+    # Initialize PWM
+    INT1_A.freq(MOTOR_PWM_FREQUENCY)  
+    INT2_A.freq(MOTOR_PWM_FREQUENCY)
+    INT1_B.freq(MOTOR_PWM_FREQUENCY)
+    INT2_B.freq(MOTOR_PWM_FREQUENCY)
+    stop()
+
+# Motor control constants
+MIN_SPEED = 0  # Minimum speed that reliably moves the motors
+MIN_DURATION_MS = 80  # Minimum duration of normal speed motor movement in milliseconds
+KICK_START_SPEED = 70  # Speed for initial kick
+KICK_START_DURATION_MS = 20  # Duration of kick in milliseconds
+
+def motor_alignment(speed=15):
+    """Interactive calibration of motor alignment
+    Use LEFT/RIGHT buttons to adjust if robot veers to one side
+    Press A to save and exit
+    
+    Negative values slow down left motor
+    Positive values slow down right motor"""
+    global MOTOR_ALIGNMENT
+    # Only needed for calibrating, so motor() doesn't pull in the display
+    from bot.display import write, reset_terminal
+    from bot.sound import beep
+    from bot.buttons import is_pressed, _lazy as button
+    
+    reset_terminal()
+    write("Motor Alignment", color=CYAN)
+    write("Press LEFT/RIGHT to adjust", color=WHITE)
+    write("LEFT = more to the left", color=GREY)
+    write("RIGHT = more to the right", color=GREY)
+    write("Press A to finish", color=GREY)
+    write("")
+    
+    # Keep track of temporary alignment during calibration
+    temp_alignment = MOTOR_ALIGNMENT
+    BUTTON_A = button('BUTTON_A') # Set up the buttons used below
+    BUTTON_LEFT = button('BUTTON_LEFT')
+    BUTTON_RIGHT = button('BUTTON_RIGHT')
+    
+    while not is_pressed(BUTTON_A):
+        # Show current alignment value
+        #write(f"Alignment: {temp_alignment:+3d}", color=YELLOW, line=6)
+        write(temp_alignment, color=YELLOW)
+        
+        # Drive forward to test alignment
+        motor('forward', speed, 'forward', speed)
+        
+        # Check for button presses
+        if is_pressed(BUTTON_LEFT):
+            temp_alignment = max(-100, temp_alignment - 1)
+            MOTOR_ALIGNMENT = temp_alignment
+            write("LEFT", color=GREY)
+            beep(1000, 100)  
+        elif is_pressed(BUTTON_RIGHT):
+            temp_alignment = min(100, temp_alignment + 1)
+            MOTOR_ALIGNMENT = temp_alignment
+            write("RIGHT", color=GREY)
+            beep(1500, 100)  
+            
+        sleep(0.05)
+    
+    # Stop motors when done
+    stop()
+    reset_terminal()
+    beep(1300)  # Confirmation beep
+    write("Alignment complete!", color=GREEN)
+    write(f"Alignment: {MOTOR_ALIGNMENT:+3d}", color=YELLOW)
+    
+    # Save alignment to config
+    config.set('MOTOR_ALIGNMENT', MOTOR_ALIGNMENT)
+    config.save()
+    write("Saved in config.ini", color=GREEN)
+    sleep(1)
+
+def motor(direction_left, speed_left, direction_right, speed_right):
+    """Control both motors simultaneously
+    direction_left/right: 'forward'/'backward' or None for stop
+    speed_left/right: 0-100"""
+    _lazy('INT2_B') # Set up the motor pins used below
+    
+    # Apply motor alignment adjustment
+    if speed_left > 0 and speed_right > 0:
+        if MOTOR_ALIGNMENT < 0:
+            speed_left = max(0, speed_left * (1 + MOTOR_ALIGNMENT/100))
+        elif MOTOR_ALIGNMENT > 0:
+            speed_right = max(0, speed_right * (1 - MOTOR_ALIGNMENT/100))
+    
+    # Apply battery voltage compensation for motors to compensate for weak battery
+    voltage = battery_voltage() # Filtered by the background monitor, no ADC read here
+    # Nominal voltage is around 6V for 4 AAA batteries
+    # Scale up speed as voltage drops from 6V to 4.7V
+    if voltage < 6.0:
+        compensation = min(6.0 / max(voltage, 4.7), 1.3)  # Max 30% boost
+        speed_left = min(100, speed_left * compensation)
+        speed_right = min(100, speed_right * compensation)
+    
+    # Convert speeds to duty cycles
+    left_duty = int(speed_left * 1023 / 100) if speed_left > 0 else 0
+    right_duty = int(speed_right * 1023 / 100) if speed_right > 0 else 0
+    left_kick_duty = int(KICK_START_SPEED * 1023 / 100) if speed_left > 0 else 0
+    right_kick_duty = int(KICK_START_SPEED * 1023 / 100) if speed_right > 0 else 0
+    
+    # Set kick-start duty for both motors (only if speed > 0)
+    if speed_left > 0:
+        if direction_left == 'forward':
+            INT1_A.duty(left_kick_duty)
+            INT2_A.duty(0)
+        elif direction_left == 'backward':
+            INT1_A.duty(0)
+            INT2_A.duty(left_kick_duty)
+    else:  # stop
+        INT1_A.duty(0)
+        INT2_A.duty(0)
+        
+    if speed_right > 0:
+        if direction_right == 'forward':
+            INT1_B.duty(right_kick_duty)
+            INT2_B.duty(0)
+        elif direction_right == 'backward':
+            INT1_B.duty(0)
+            INT2_B.duty(right_kick_duty)
+    else:  # stop
+        INT1_B.duty(0)
+        INT2_B.duty(0)
+        
+    # Apply kick-start delay if either motor is moving
+    if speed_left > 0 or speed_right > 0:
+        time.sleep_ms(KICK_START_DURATION_MS)
+        
+    # Set normal speed for both motors
+    if speed_left > 0:
+        if direction_left == 'forward':
+            INT1_A.duty(left_duty)
+            INT2_A.duty(0)
+        elif direction_left == 'backward':
+            INT1_A.duty(0)
+            INT2_A.duty(left_duty)
+    else:
+        INT1_A.duty(0)
+        INT2_A.duty(0)
+        
+    if speed_right > 0:
+        if direction_right == 'forward':
+            INT1_B.duty(right_duty)
+            INT2_B.duty(0)
+        elif direction_right == 'backward':
+            INT1_B.duty(0)
+            INT2_B.duty(right_duty)
+    else:
+        INT1_B.duty(0)
+        INT2_B.duty(0)
+        
+    if speed_left > 0 or speed_right > 0:
+        time.sleep_ms(MIN_DURATION_MS)
+
+def forward(speed=10):
+    """Move forward with kick-start"""
+    motor('forward', speed, 'forward', speed)
+    
+def backward(speed=10):
+    """Move backward with kick-start"""
+    motor('backward', speed, 'backward', speed)
+    
+def turn(speed=30, direction=None):
+    if direction == False or direction == 0 or direction == 'L':
+        turn_left(speed)
+    else:
+        turn_right(speed)
+    
+def turn_left(speed=20):
+    motor('forward', 0, 'forward', speed)
+    
+def turn_right(speed=20):
+    motor('forward', speed, 'forward', 0)   
+    
+def turn_random(speed=20):
+    """Turn in a random direction with specified speed"""
+    import random
+    if random.choice([True, False]):
+        turn_left(speed)
+    else:
+        turn_right(speed)
+
+def stop():
+    motor(None, 0, None, 0)
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_motors, ('INT1_A', 'INT2_A', 'INT1_B', 'INT2_B'))
@@ -0,0 +1,48 @@
+"""
+bot.sound - The beeper.
+"""
+
+import time
+from machine import Pin, PWM
+from bot.core import hardware
+
+### SOUND
+# Connecter beeper minus to ground
+# Connect beeper plus to a GPIO pin
+
+# Initialize the beeper on a specific GPIO pin on first use: bot.beeper (see bot.core.hardware)
+def _init_sound():
+    global beeper
+    beeper = PWM(Pin(26))
+    shutup()
+
+# Function to beep, duty = volume/loudness
+def beep(frequencey = 1000, duration_ms = 250, duty = 256):
+    beeper = _lazy('beeper')
+    beeper.freq(frequencey)  # Set frequency (1000 Hz is a typical beeper frequency)
+    beeper.duty(duty)  # Set duty cyle to control volume
+    time.sleep_ms(duration_ms)
+    beeper.duty(0)  # Set duty cycle to 0% to turn off beeper
+    
+def shutup():
+    _lazy('beeper').duty(0)  # Set duty cycle to 0% to turn off beeper
+    
+# def siren():
+#     for _ in range(2):  # Number of siren cycles
+#         beeper.freq(1000)  # First frequency
+#         beeper.duty(512)  # Turn on beeper
+#         time.sleep(0.5)  # Duration of the first tone
+#         beeper.freq(500)  # Second frequency
+#         time.sleep(0.5)  # Duration of the second tone
+#     beeper.duty(0)  # Turn off beeper
+    
+def sweep():
+    # Sweep up in frequency
+    for freq in range(500, 2001, 100):  # Start at 500 Hz, go up to 2000 Hz
+        beep(freq, 25)
+
+    # Sweep down in frequency
+    for freq in range(2000, 499, -100):  # Start at 2000 Hz, go down to 500 Hz
+        beep(freq, 25)
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_sound, ('beeper',))
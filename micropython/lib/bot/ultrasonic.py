@@ -0,0 +1,47 @@
+"""
+bot.ultrasonic - Distance from the HC-SR04 ultrasonic sensor.
+"""
+
+import machine
+import hcsr04 # ultra sound HC-SR04 sensor
+from bot.core import config, hardware
+
+### ULTRASONIC
+# Load ultrasonic pin configuration
+TRIGGER_PIN = config.get('TRIGGER_PIN')
+ECHO_PIN = config.get('ECHO_PIN')
+
+# Initialize sensor on first use: bot.trigger_pin, bot.echo_pin and bot.uss (see bot.core.hardware)
+def _init_ultrasonic():
+    global trigger_pin, echo_pin, uss
+    trigger_pin = machine.Pin(TRIGGER_PIN)
+    echo_pin = machine.Pin(ECHO_PIN)
+    uss = hcsr04.HCSR04(trigger_pin, echo_pin)
+
+def distance():
+    try:
+        distance = _lazy('uss').distance_cm()
+        return int(distance)
+    except Exception as e:
+        print("Error measuring distance:", e)
+        return None    
+
+
+### LDR
+# Connect LDR (Light dependent resistor) to 3.3V and via a 2K resistor to ground
+# Connect the junction between LDR and 2K resistor to a GPIO
+# Gives values between 0 and 4095. Room light level ~ 2000
+#ldrA = ADC(Pin(33))  # Replace with the ADC pin number you are using
+#ldrA.atten(ADC.ATTN_11DB)  # Set attenuation for full range of ADC
+#ldrB = ADC(Pin(32))  # Replace with the ADC pin number you are using
+#ldrB.atten(ADC.ATTN_11DB)  # Set attenuation for full range of ADC
+
+#def brightness(ldr):
+#    if ldr == 'A' or ldr == 'L':
+#        return ldrA.read()
+#    elif ldr == 'B' or ldr == 'R':
+#        return ldrB.read()
+#    
+#    return 0
+
+_lazy, __getattr__, warmup = hardware(globals(), _init_ultrasonic, ('trigger_pin', 'echo_pin', 'uss'))
@@ -0,0 +1,208 @@
+"""
+ImageFile - Reads the image files made by images/convert_to_rgb565.py row by row.
+Besides raw RGB565 files there are two compressed formats that need less
+flash and less time to read: run-length encoded RGB565 for images with
+areas of one colour, and palette images with 1, 2, 4 or 8 bits per pixel
+for images with few colours. Rows are decoded straight into the caller's
+buffer, so an image never has to fit into RAM as a whole.
+
+Usage:
+
+from imagefile import ImageFile
+with ImageFile("/images/xwk.bin") as img:
+    buf = bytearray(img.width * 2)
+    for y in range(img.height):
+        img.rows(y, 1, 0, img.width - 1, buf)     # RGB565, like a raw file
+        tft.image(0, y, img.width - 1, y, buf)
+
+Raw file format (all numbers big-endian):
+- Bytes 0-1: Width, bytes 2-3: Height
+- Bytes 4+: RGB565 pixels, row by row
+
+Compressed file format (all numbers big-endian):
+- Bytes 0-3: Magic b'XWKI' (raw files can't start with it, their width is < 1000)
+- Byte 4: Format, 1 = RLE, 2 = palette
+- Byte 5: Bits per pixel, 16 for RLE, 1, 2, 4 or 8 for palette
+- Bytes 6-7: Width, bytes 8-9: Height
+- Bytes 10-11: Number of palette colours (0 for RLE)
+- Palette: 2 bytes RGB565 per colour
+- RLE data: packets that never span two rows. Header byte n: bit 7 set
+  means the next pixel repeats (n & 0x7F) + 1 times, otherwise
+  (n & 0x7F) + 1 literal pixels follow
+- Palette data: rows of palette indices, the first pixel in the high bits
+  of a byte, each row starts at a new byte
+"""
+
+from kernels import palette_row
+
+MAGIC = b'XWKI'
+RAW = 0
+RLE = 1
+PALETTE = 2
+
+class ImageFile:
+    """
+    An image file opened for reading. Rows can be read in any order, but
+    RLE images are fastest read from top to bottom because their rows can't
+    be found without decoding the rows above.
+    """
+
+    def __init__(self, path, chunk=256):
+        """
+        Args:
+            path (str): Image file
+            chunk (int): Bytes read from the file at once by the RLE decoder
+        """
+        self.path = path
+        self._f = open(path, 'rb')
+        head = bytearray(12)
+        if self._f.readinto(head) < 4:
+            self._f.close()
+            raise ValueError("Image file too short")
+        self.palette = None
+        if head[0:4] == MAGIC:
+            self.format = head[4]
+            self.bpp = head[5]
+            self.width = (head[6] << 8) | head[7]
+            self.height = (head[8] << 8) | head[9]
+            colors = (head[10] << 8) | head[11]
+            if self.format == PALETTE:
+                if self.bpp not in (1, 2, 4, 8):
+                    self._f.close()
+                    raise ValueError("Invalid bits per pixel: " + str(self.bpp))
+                self.palette = self._f.read(colors * 2)
+            elif self.format != RLE:
+                self._f.close()
+                raise ValueError("Unknown image format: " + str(self.format))
+            self._data = 12 + colors * 2
+        else:
+            self.format = RAW
+            self.bpp = 16
+            self.width = (head[0] << 8) | head[1]
+            self.height = (head[2] << 8) | head[3]
+            self._data = 4
+        self._next = 0          # RLE: row the file position is at
+        if self.format == RLE:
+            self._buf = bytearray(chunk)
+            self._mv = memoryview(self._buf)
+            self._p = 0         # Position in _buf
+            self._len = 0       # Valid bytes in _buf
+            self._f.seek(self._data)
+        elif self.format == PALETTE:
+            self._rowbytes = (self.width * self.bpp + 7) // 8
+            self._packed = bytearray(self._rowbytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the image file"""
+        self._f.close()
+
+    def rows(self, y, n, x0, x1, buf):
+        """
+        Decode rows y to y + n - 1, columns x0 to x1, as RGB565 big-endian
+        pixels into buf, one row after the other.
+
+        Args:
+            buf: bytearray or memoryview of at least n * (x1 - x0 + 1) * 2 bytes
+        """
+        mv = memoryview(buf)
+        row = (x1 - x0 + 1) * 2
+        if self.format == RAW:
+            f = self._f
+            if x0 == 0 and x1 == self.width - 1:
+                # Rows are contiguous in the file
+                f.seek(self._data + y * row)
+                f.readinto(mv[:n * row])
+            else:
+                # Skip the invisible columns of each row
+                for i in range(n):
+                    f.seek(self._data + ((y + i) * self.width + x0) * 2)
+                    f.readinto(mv[i * row:(i + 1) * row])
+        elif self.format == PALETTE:
+            for i in range(n):
+                self._paletterow(y + i, x0, x1, mv[i * row:(i + 1) * row])
+        else:
+            if y < self._next:
+                # Start again from the first row
+                self._f.seek(self._data)
+                self._p = self._len = 0
+                self._next = 0
+            while self._next < y:
+                self._rlerow(None, x0, x1)
+            for i in range(n):
+                self._rlerow(mv[i * row:(i + 1) * row], x0, x1)
+
+    def _paletterow(self, y, x0, x1, dst):
+        bpp = self.bpp
+        pal = self.palette
+        packed = self._packed
+        # Only read the bytes holding columns x0 to x1
+        b0 = (x0 * bpp) >> 3
+        b1 = (x1 * bpp) >> 3
+        self._f.seek(self._data + y * self._rowbytes + b0)
+        self._f.readinto(memoryview(packed)[:b1 - b0 + 1])
+        # Bit offset of column x0 in the first byte goes with the bits per pixel
+        palette_row(dst[:(x1 - x0 + 1) * 2], packed, pal, bpp | ((x0 * bpp - b0 * 8) << 4))
+
+    def _byte(self):
+        if self._p >= self._len:
+            self._fill()
+        b = self._buf[self._p]
+        self._p += 1
+        return b
+
+    def _fill(self):
+        self._len = self._f.readinto(self._buf)
+        self._p = 0
+        if not self._len:
+            raise ValueError("Image data too short")
+
+    def _copy(self, dst, n):
+        """Copy the next n bytes of the file to dst, skip them if dst is None"""
+        while n:
+            if self._p >= self._len:
+                self._fill()
+            c = min(n, self._len - self._p)
+            if dst is not None:
+                dst[:c] = self._mv[self._p:self._p + c]
+                dst = dst[c:]
+            self._p += c
+            n -= c
+
+    def _rlerow(self, dst, x0, x1):
+        """Decode the next row, columns x0 to x1 into dst or nothing if dst is None"""
+        x = 0
+        w = self.width
+        while x < w:
+            h = self._byte()
+            n = (h & 0x7F) + 1
+            # Visible part of the packet
+            a = max(x, x0)
+            e = min(x + n, x1 + 1)
+            if dst is None or a >= e:
+                if h & 0x80:
+                    self._copy(None, 2)
+                else:
+                    self._copy(None, n * 2)
+            elif h & 0x80:
+                d = (a - x0) * 2
+                dst[d] = self._byte()
+                dst[d + 1] = self._byte()
+                # Repeat the pixel by doubling the filled part
+                c = 2
+                m = (e - a) * 2
+                while c < m:
+                    k = min(c, m - c)
+                    dst[d + c:d + c + k] = dst[d:d + k]
+                    c += k
+            else:
+                self._copy(None, (a - x) * 2)
+                self._copy(dst[(a - x0) * 2:(e - x0) * 2], (e - a) * 2)
+                self._copy(None, (x + n - e) * 2)
+            x += n
+        self._next += 1
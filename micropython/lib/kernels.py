@@ -0,0 +1,121 @@
+"""
+kernels - The pixel loops of the display code that run once per pixel.
+Where the firmware can compile viper code, the versions in kernels_viper.py
+are used; they are checked against the pure Python versions below when this
+module is imported and skipped if they fail. Anywhere else (ports without a
+native emitter, CPython with the emulator) the Python versions run.
+
+Compare both on the MicroPython unix port with emulator/kernelbench.py.
+
+Usage:
+
+import kernels
+kernels.scale_row(dst, src, widths)
+print(kernels.EMITTER)          # 'viper' or 'python'
+"""
+
+def scale_row(dst, src, widths):
+    """
+    Nearest-neighbour scale one row of RGB565 pixels.
+
+    Args:
+        dst: Buffer to write the scaled row to
+        src: Source pixels, one per entry of widths
+        widths: bytearray, columns per source pixel
+    """
+    i = 0
+    d = 0
+    for w in widths:
+        dst[d] = src[i]
+        dst[d + 1] = src[i + 1]
+        n = 2
+        w *= 2
+        # Replicate the pixel by doubling the copied part
+        while n < w:
+            c = min(n, w - n)
+            dst[d + n:d + n + c] = dst[d:d + c]
+            n += c
+        i += 2
+        d += w
+
+def palette_row(dst, packed, pal, fmt):
+    """
+    Expand palette indices to RGB565 pixels, len(dst) // 2 of them.
+
+    Args:
+        dst: Buffer for the RGB565 pixels
+        packed: Indices, the first pixel in the high bits of a byte
+        pal: Palette, 2 bytes RGB565 per colour
+        fmt: Bits per pixel (1, 2, 4 or 8) plus 16 times the bit offset of
+            the first pixel in packed[0]
+    """
+    bpp = fmt & 0x0F
+    bit = fmt >> 4
+    mask = (1 << bpp) - 1
+    for d in range(0, len(dst) & ~1, 2):
+        c = ((packed[bit >> 3] >> (8 - bpp - (bit & 7))) & mask) * 2
+        dst[d] = pal[c]
+        dst[d + 1] = pal[c + 1]
+        bit += bpp
+
+def render_glyph(buf, cols, geom, color):
+    """
+    Set the pixels of a glyph in buf to color, leaving the background.
+
+    Args:
+        buf: RGB565 pixels of the glyph, filled with the background colour
+        cols: Column data, (height + 7) // 8 bytes per column, bit 0 of the
+            first byte is the top pixel
+        geom: bytes of width and height of the glyph, x and y scale
+        color (int): RGB565 colour of the set pixels
+    """
+    fontw, fonth, sx, sy = geom[0], geom[1], geom[2], geom[3]
+    bpc = (fonth + 7) // 8
+    w = fontw * sx
+    fg = bytes((color >> 8, color & 0xff)) * sx
+    for q in range(fontw):
+        c = cols[q] if bpc == 1 else int.from_bytes(cols[q * bpc:(q + 1) * bpc], 'little')
+        for r in range(fonth):
+            if c & 0x01:
+                pos = 2 * (r * sy * w + q * sx)
+                for i in range(sy):
+                    buf[pos:pos + 2 * sx] = fg
+                    pos += 2 * w
+            c >>= 1
+
+# The Python versions, kept for the benchmark and the self-check
+FALLBACK = {'scale_row': scale_row, 'palette_row': palette_row, 'render_glyph': render_glyph}
+
+def _selfcheck(k):
+    """True if the kernels in module k give the same pixels as FALLBACK"""
+    src = b'\x12\x34\x56\x78'
+    widths = bytearray((3, 1))
+    pal = b'\x00\x00\xff\xff\xf8\x00\x07\xe0'
+    packed = b'\x1b\x6c'
+    geom = bytes((3, 10, 2, 2))
+    cols = b'\x01\x02\x80\x03\xff\x00'
+    bg = b'\x00\x01' * (3 * 2 * 10 * 2)
+    for name, args in (('scale_row', (bytearray(8), src, widths)),
+                       ('palette_row', (bytearray(10), packed, pal, (2 << 4) | 2)),
+                       ('render_glyph', (bytearray(bg), cols, geom, 0xF81F))):
+        # Kernels write to their first argument
+        want = bytearray(args[0])
+        FALLBACK[name](want, *args[1:])
+        got = bytearray(args[0])
+        getattr(k, name)(got, *args[1:])
+        if got != want:
+            return False
+    return True
+
+EMITTER = 'python'
+try:
+    import kernels_viper
+    if _selfcheck(kernels_viper):
+        scale_row = kernels_viper.scale_row
+        palette_row = kernels_viper.palette_row
+        render_glyph = kernels_viper.render_glyph
+        EMITTER = 'viper'
+except Exception:
+    # No viper emitter (SyntaxError), no micropython module (ImportError)
+    # or a kernel that fails, the Python versions stay
+    pass
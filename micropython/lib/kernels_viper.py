@@ -0,0 +1,80 @@
+"""
+kernels_viper - Viper versions of the loops in kernels.py, compiled to
+machine code when imported. Only import it through kernels, which checks
+that they work and falls back to Python where viper isn't available.
+Same arguments and results as the functions in kernels.py; at most four
+arguments each, older firmware doesn't allow more for viper functions.
+Loads through ptr8 are cast with int() before any arithmetic, viper
+refuses to mix them with int otherwise.
+"""
+
+import micropython
+
+@micropython.viper
+def scale_row(dst, src, widths):
+    d = ptr8(dst)
+    s = ptr8(src)
+    w = ptr8(widths)
+    n = int(len(widths))
+    k = 0
+    i = 0
+    o = 0
+    while k < n:
+        hi = s[i]
+        lo = s[i + 1]
+        e = o + int(w[k]) * 2
+        while o < e:
+            d[o] = hi
+            d[o + 1] = lo
+            o += 2
+        i += 2
+        k += 1
+
+@micropython.viper
+def palette_row(dst, packed, pal, fmt: int):
+    d = ptr8(dst)
+    p = ptr8(packed)
+    c = ptr8(pal)
+    bpp = fmt & 0x0F
+    bit = fmt >> 4
+    mask = (1 << bpp) - 1
+    e = (int(len(dst)) >> 1) << 1
+    o = 0
+    while o < e:
+        i = ((int(p[bit >> 3]) >> (8 - bpp - (bit & 7))) & mask) << 1
+        d[o] = c[i]
+        d[o + 1] = c[i + 1]
+        bit += bpp
+        o += 2
+
+@micropython.viper
+def render_glyph(buf, cols, geom, color: int):
+    b = ptr8(buf)
+    c = ptr8(cols)
+    g = ptr8(geom)
+    fontw = int(g[0])
+    fonth = int(g[1])
+    sx2 = int(g[2]) * 2
+    sy = int(g[3])
+    bpc = (fonth + 7) >> 3
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    row = fontw * sx2           # Bytes per pixel row
+    q = 0
+    while q < fontw:
+        r = 0
+        while r < fonth:
+            if (int(c[q * bpc + (r >> 3)]) >> (r & 7)) & 1:
+                pos = r * sy * row + q * sx2
+                i = 0
+                while i < sy:
+                    o = pos
+                    e = pos + sx2
+                    while o < e:
+                        b[o] = hi
+                        b[o + 1] = lo
+                        o += 2
+                    pos += row
+                    i += 1
+            r += 1
+        q += 1
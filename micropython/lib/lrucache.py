@@ -0,0 +1,126 @@
+"""
+LRUCache - A small least-recently-used cache with a byte budget for MicroPython.
+Used for pre-rendered glyphs in ST7735.py.
+
+Usage:
+
+from lrucache import LRUCache
+cache = LRUCache(4096)           # Keep at most 4096 bytes of values
+buf = cache.get(key)             # None on a miss
+if buf is None:
+    buf = render()
+    cache.put(key, buf)          # Size is taken from len(buf)
+print(cache.stats())             # {'entries': 1, 'bytes': 80, 'hits': 0, ...}
+"""
+
+class LRUCache:
+    """
+    Maps keys to values and evicts the least recently used entries when the
+    total size of the values would exceed the budget.
+
+    MicroPython dicts don't keep insertion order, so every entry carries a
+    use counter and eviction scans for the smallest one. This keeps get()
+    cheap, which is the hot path; eviction is rare with a sensible budget.
+    """
+
+    def __init__(self, budget=4096):
+        """
+        Args:
+            budget (int): Maximum number of bytes held in the cache. 0 disables caching.
+        """
+        self.budget = budget
+        self.size = 0          # Bytes currently held
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = {}       # key -> [value, size, last use]
+        self._tick = 0
+
+    def get(self, key):
+        """
+        Look up a value and mark it as recently used.
+
+        Returns:
+            The cached value, or None if the key is not cached
+        """
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._tick += 1
+        item[2] = self._tick
+        return item[0]
+
+    def put(self, key, value, size=None):
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Any hashable key
+            value: The value to cache
+            size (int): Size of the value in bytes, defaults to len(value)
+
+        Returns:
+            bool: False if the value is larger than the whole budget and was not cached
+        """
+        if size is None:
+            size = len(value)
+        self.remove(key)
+        if size > self.budget:
+            return False
+        while self.size + size > self.budget:
+            self._evict()
+        self._tick += 1
+        self._items[key] = [value, size, self._tick]
+        self.size += size
+        return True
+
+    def remove(self, key):
+        """Drop a single entry if it is cached"""
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+
+    def _evict(self):
+        """Drop the least recently used entry"""
+        oldest = None
+        for key, item in self._items.items():
+            if oldest is None or item[2] < oldest[1]:
+                oldest = (key, item[2])
+        self.remove(oldest[0])
+        self.evictions += 1
+
+    def resize(self, budget):
+        """Change the byte budget, evicting entries if it shrinks"""
+        self.budget = budget
+        while self.size > budget:
+            self._evict()
+
+    def clear(self):
+        """Drop all entries, statistics are kept"""
+        self._items = {}
+        self.size = 0
+
+    def reset_stats(self):
+        """Reset hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, bytes, budget, hits, misses and evictions
+        """
+        return {
+            'entries': len(self._items),
+            'bytes': self.size,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def __len__(self):
+        return len(self._items)
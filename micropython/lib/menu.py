@@ -117,12 +117,11 @@ def display_menu(menu_state, old_index=None):
         bot.write("UP/DOWN:Select  A:Run", color=bot.WHITE, newline=False) # Don't advance line otherwise the terminal will be reset on the next write
     else:
         # Only update the changed lines
-        # Clear and update old selection (remove highlight)
-        bot.write(" " * 25, line=old_index+1)  # Clear the entire line first
+        # The terminal knows what each line shows and only redraws characters that change
+        # Update old selection (remove highlight)
         bot.write(format_filename(menu_state.files[old_index], "  "), color=bot.GREY, line=old_index+1, newline=False)
         
-        # Clear and update new selection (add highlight)
-        bot.write(" " * 25, line=menu_state.current_index+1)  # Clear the entire line first
+        # Update new selection (add highlight)
         bot.write(format_filename(menu_state.files[menu_state.current_index], "> "), color=bot.MAGENTA, line=menu_state.current_index+1, newline=False)
 
 def execute_file(filename):
@@ -3,6 +3,7 @@ import uhashlib
 import urequests
 import os
 import gc
+import sys
 from iniconf import Iniconf
 
 """ Manual Execution:
@@ -148,6 +149,34 @@ class OTAUpdater:
                 print(f"  Error number: {e.errno}")
             return False
             
+    def check_mpy(self):
+        """Precompiled .mpy files only load if the firmware has the same .mpy version"""
+        version = self.filelist.get('mpy')
+        if version is None:
+            return True     # Only source files
+        # Version and sub-version, the architecture only matters for native code
+        firmware = getattr(sys.implementation, '_mpy', 0) & 0x3FF
+        if firmware != version:
+            print(f"Error: Update has .mpy version {version}, firmware needs {firmware}")
+            return False
+        return True
+
+    def remove_twin(self, rel_path):
+        """Remove the other variant of an updated module: MicroPython imports a
+        .py before a .mpy, so a stale source would hide a new .mpy"""
+        if rel_path.endswith('.mpy'):
+            twin = rel_path[:-4] + '.py'
+        elif rel_path.endswith('.py'):
+            twin = rel_path[:-3] + '.mpy'
+        else:
+            return
+        # update_all() skips a .py listed together with its .mpy, so the twin is never wanted
+        try:
+            os.remove(f"/{twin}")
+            print(f"  Removed {twin}")
+        except OSError:
+            pass    # There was none
+
     def update_all(self):
         """Update all files that need updating"""
         if not self.load_config():
@@ -155,12 +184,36 @@ class OTAUpdater:
             
         if not self.get_filelist():
             return False
+
+        if not self.check_mpy():
+            return False
             
+        files = self.filelist['files']
         success = True
-        for rel_path, file_info in self.filelist['files'].items():
+        installed = []  # Files that are now on the bot as listed
+        for rel_path, file_info in files.items():
+            if rel_path.endswith('.py') and rel_path[:-3] + '.mpy' in files:
+                continue    # Prefer the precompiled module
             if not self.update_file(rel_path, file_info['size'], file_info['hash']):
                 success = False
+            else:
+                installed.append(rel_path)
+
+        # Switching from the source list to the .mpy build leaves lib/*.py and
+        # weditor/start.py behind, which would be imported instead of the new
+        # .mpy files. Remove the other variant of every module now on the bot,
+        # unchanged ones included; a module that failed to update keeps its old one.
+        for rel_path in installed:
+            self.remove_twin(rel_path)
                 
         if success:
+            # Files of older versions that are in the way, only once everything
+            # replacing them is there (lib/bot.py of the bot package)
+            for rel_path in self.filelist.get('remove', ()):
+                try:
+                    os.remove(f"/{rel_path}")
+                    print(f"  Removed {rel_path}")
+                except OSError:
+                    pass    # Already gone
             print("Update successful!")
         return success
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Sprite - Images with a transparent colour for the ST7735 TFT.
+A sprite is split into runs of opaque pixels once when it is loaded.
+Drawing only sends these runs, one window each, so the background around
+and between the opaque pixels is never repainted.
+
+Usage:
+
+import bot
+from sprite import Sprite
+
+eye = Sprite.load("/images/eye.bin")          # Top left pixel is the colour key
+arrow = Sprite.load("/images/arrow.bin", key=bot.MAGENTA)
+eye.draw(bot.tft, 40, 30)                      # Clipped at the screen edges
+bot.display_update()
+print(eye.runs_count(), "runs,", eye.pixels(), "opaque pixels")
+
+Image files are created by images/convert_to_rgb565.py, raw or compressed.
+Colors are RGB tuples like bot.RED or 16 bit RGB565 values.
+"""
+
+from array import array
+from ST7735 import TFTColor
+from imagefile import ImageFile
+
+class Sprite:
+    """
+    Opaque pixel runs of an image. Runs of consecutive rows with the same
+    horizontal extent are merged into one rectangle. Runs are stored as 16 bit
+    values, a sprite with a run starting after 65535 opaque pixels raises
+    ValueError instead of wrapping (256x256 opaque pixels always fit).
+    """
+
+    def __init__(self, width, height, data, key=None):
+        """
+        Args:
+            width, height (int): Size in pixels
+            data: RGB565 pixels, big-endian, row by row
+            key: Transparent colour, None for the colour of the top left pixel
+        """
+        self.width = width
+        self.height = height
+        if key is None:
+            key = (data[0] << 8) | data[1]
+        elif not isinstance(key, int):
+            key = TFTColor(key[0], key[1], key[2])
+        self.key = key
+        self._build(data, key)
+
+    @classmethod
+    def load(cls, path, key=None):
+        """
+        Load an image file, raw RGB565 or compressed (see imagefile.py).
+
+        Returns:
+            Sprite: The preprocessed sprite, the file data is not kept
+        """
+        with ImageFile(path) as f:
+            width = f.width
+            height = f.height
+            data = bytearray(width * height * 2)
+            f.rows(0, height, 0, width - 1, data)
+        return cls(width, height, data, key)
+
+    def _build(self, data, key):
+        """Find the opaque runs and copy only their pixels"""
+        kh = key >> 8
+        kl = key & 0xFF
+        w = self.width
+        runs = array('H')        # dx, dy, width, height, pixel offset per run
+        pixels = bytearray()
+        src = memoryview(data)
+        for y in range(self.height):
+            row = y * w * 2
+            x = 0
+            while x < w:
+                i = row + x * 2
+                if data[i] == kh and data[i + 1] == kl:
+                    x += 1
+                    continue
+                e = x + 1
+                while e < w:
+                    i = row + e * 2
+                    if data[i] == kh and data[i + 1] == kl:
+                        break
+                    e += 1
+                n = len(runs)
+                if (n and runs[n - 5] == x and runs[n - 3] == e - x
+                        and runs[n - 4] + runs[n - 2] == y):
+                    # Same extent as the run above, which was the last one
+                    # stored: its pixels continue right here, grow it
+                    runs[n - 2] += 1
+                else:
+                    offset = len(pixels) // 2
+                    if offset > 0xFFFF:
+                        # Offsets are 16 bit like the rest of a run, such a sprite
+                        # wouldn't fit in RAM twice (file data and runs) anyway
+                        raise ValueError("Sprite too large, a run starts after 65535 opaque pixels")
+                    runs.extend((x, y, e - x, 1, offset))
+                pixels.extend(src[row + x * 2:row + e * 2])
+                x = e
+        self.runs = runs
+        self.data = bytes(pixels)
+
+    def draw(self, tft, x, y):
+        """Draw the opaque pixels with the top left corner at x, y"""
+        tft.blitruns(x, y, self.runs, self.data)
+
+    def runs_count(self):
+        """Number of windows a draw sends when nothing is clipped"""
+        return len(self.runs) // 5
+
+    def pixels(self):
+        """Number of opaque pixels"""
+        return len(self.data) // 2
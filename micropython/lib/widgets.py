@@ -0,0 +1,353 @@
+"""
+Widgets - Retained-mode display widgets for the ST7735 TFT.
+Each widget remembers what it has drawn and only repaints what changed
+when its value is set, so many live values can be shown at a high rate.
+
+Usage:
+
+import bot
+from widgets import Label, Value, Bar, Gauge, Icon
+
+title = Label(bot.tft, 0, 0, "Distance", color=bot.CYAN)
+dist = Value(bot.tft, 0, 12, fmt="{:4d} cm", size=2, color=bot.YELLOW)
+bar = Bar(bot.tft, 0, 32, 160, 8, maximum=200, color=bot.GREEN)
+title.draw()
+while True:
+    d = bot.distance()
+    dist.set(d)                 # Only the changed digits are redrawn
+    bar.set(d)                  # Only the grown or shrunk part is painted
+    bot.display_update()        # Needed when DISPLAY_BUFFER is set
+
+Colors are RGB tuples like bot.RED or 16 bit RGB565 values.
+"""
+
+from math import sin, cos, pi
+from ST7735 import TFT, TFTColor
+from sysfont import sysfont
+from imagefile import ImageFile
+
+def _color(color):
+    """Convert an RGB tuple to RGB565, RGB565 values are returned as is"""
+    if color is None or isinstance(color, int):
+        return color
+    return TFTColor(color[0], color[1], color[2])
+
+class Widget:
+    """
+    Base class. Subclasses override _paint(old, new) which draws the
+    difference between the last drawn value and the new one; old is None
+    when everything has to be drawn.
+    """
+
+    def __init__(self, tft, x, y, color=TFT.WHITE, background=TFT.BLACK):
+        self.tft = tft
+        self.x = x
+        self.y = y
+        self.color = _color(color)
+        self.background = _color(background)
+        self.value = None
+        self._drawn = None      # Value currently on screen, None if nothing drawn
+
+    def set(self, value):
+        """
+        Set a new value and repaint what changed.
+
+        Returns:
+            bool: True if something was drawn
+        """
+        self.value = value
+        if self._drawn is not None and value == self._drawn:
+            return False
+        self._paint(self._drawn, value)
+        self._drawn = value
+        return True
+
+    def draw(self):
+        """Repaint the whole widget, e.g. after the screen was cleared"""
+        self._drawn = None
+        if self.value is not None:
+            self.set(self.value)
+
+    def invalidate(self):
+        """Forget what is on screen, the next set() repaints everything"""
+        self._drawn = None
+
+    def _paint(self, old, new):
+        """Draw the change from old to new, the base widget draws nothing"""
+        pass
+
+
+class Label(Widget):
+    """
+    Text in a fixed number of character cells. Only the cells whose
+    character changed are redrawn, neighbouring changed cells in one go.
+    With a proportional font (see binfont.py) the text is redrawn from the
+    first changed character on, the following ones may have moved.
+    """
+
+    def __init__(self, tft, x, y, text="", width=None, size=1, font=sysfont,
+                 color=TFT.WHITE, background=TFT.BLACK):
+        """
+        Args:
+            text (str): Initial text, drawn by draw()
+            width (int): Number of character cells, defaults to len(text)
+            size (int): Font scaling factor
+        """
+        super().__init__(tft, x, y, color, background)
+        self.width = width if width is not None else len(text)
+        self.size = size
+        self.font = font
+        self.cell = font['Width'] * size + 1   # Same advance as TFT.text for fixed width fonts
+        self.proportional = type(font) is not dict and getattr(font, 'proportional', True)
+        self.value = text
+
+    def _format(self, value):
+        return str(value)
+
+    def _fit(self, text):
+        """Pad or cut text to the widget width"""
+        if len(text) > self.width:
+            return text[:self.width]
+        return text + " " * (self.width - len(text))
+
+    def set(self, value):
+        # Compare the formatted cells, value keeps what the caller passed
+        self.value = value
+        text = self._fit(self._format(value))
+        if self._drawn is not None and text == self._drawn:
+            return False
+        self._paint(self._drawn, text)
+        self._drawn = text
+        return True
+
+    def _paint(self, old, new):
+        if self.proportional:
+            self._paintproportional(old, new)
+            return
+        i = 0
+        n = len(new)
+        while i < n:
+            if old is not None and old[i] == new[i]:
+                i += 1
+                continue
+            # Collect a run of changed cells and draw it as one text row
+            j = i + 1
+            while j < n and (old is None or old[j] != new[j]):
+                j += 1
+            self.tft.text((self.x + i * self.cell, self.y), new[i:j], self.color,
+                          self.font, self.size, nowrap=True, aBgColor=self.background)
+            i = j
+
+    def _paintproportional(self, old, new):
+        # Characters before the first change keep their place
+        i = 0
+        if old is not None:
+            n = min(len(old), len(new))
+            while i < n and old[i] == new[i]:
+                i += 1
+        tft = self.tft
+        x = self.x + tft.textwidth(new[:i], self.font, self.size)
+        tft.text((x, self.y), new[i:], self.color, self.font, self.size,
+                 nowrap=True, aBgColor=self.background)
+        # Clear what the old text covered beyond the end of the new one. The
+        # blank column after the last character isn't drawn, so clearing
+        # starts there
+        end = self.x + max(tft.textwidth(new, self.font, self.size) - 1, 0)
+        if old is not None:
+            old_end = self.x + tft.textwidth(old, self.font, self.size)
+            if old_end > end:
+                tft.fillrect((end, self.y), (old_end - end, self.font['Height'] * self.size),
+                             self.background)
+
+
+class Value(Label):
+    """
+    A number formatted with fmt, right aligned in width cells.
+    Only digits that change are redrawn.
+    """
+
+    def __init__(self, tft, x, y, fmt="{}", width=6, size=1, font=sysfont,
+                 color=TFT.WHITE, background=TFT.BLACK):
+        """
+        Args:
+            fmt (str): Format string, e.g. "{:5.2f}V"
+            width (int): Number of character cells
+        """
+        super().__init__(tft, x, y, "", width, size, font, color, background)
+        self.fmt = fmt
+        self.value = None
+
+    def _format(self, value):
+        if value is None:
+            return "-"
+        return self.fmt.format(value)
+
+    def _fit(self, text):
+        if len(text) > self.width:
+            return text[-self.width:]
+        return " " * (self.width - len(text)) + text
+
+
+class Bar(Widget):
+    """
+    Horizontal bar graph. On a change only the segment between the old
+    and the new end of the bar is painted.
+    """
+
+    def __init__(self, tft, x, y, w, h, minimum=0, maximum=100,
+                 color=TFT.GREEN, background=TFT.BLACK, border=None):
+        """
+        Args:
+            w, h (int): Size in pixels including the optional border
+            minimum, maximum: Value range mapped to the bar length
+            border: Color of a 1 pixel frame, None for no frame
+        """
+        super().__init__(tft, x, y, color, background)
+        self.w = w
+        self.h = h
+        self.minimum = minimum
+        self.maximum = maximum
+        self.border = _color(border)
+
+    def _length(self, value):
+        inner = self.w - (2 if self.border is not None else 0)
+        if value is None or self.maximum == self.minimum:
+            return 0
+        value = max(self.minimum, min(self.maximum, value))
+        return int((value - self.minimum) * inner / (self.maximum - self.minimum))
+
+    def set(self, value):
+        # Compare pixel lengths, not values, small changes cost nothing
+        self.value = value
+        n = self._length(value)
+        if self._drawn is not None and n == self._drawn:
+            return False
+        self._paint(self._drawn, n)
+        self._drawn = n
+        return True
+
+    def draw(self):
+        self._drawn = None
+        self.set(self.value)
+
+    def _paint(self, old, new):
+        x, y, h = self.x, self.y, self.h
+        inner = self.w
+        if self.border is not None:
+            if old is None:
+                self.tft.rect((x, y), (self.w, h), self.border)
+            x += 1
+            y += 1
+            h -= 2
+            inner -= 2
+        if old is None:
+            if new:
+                self.tft.fillrect((x, y), (new, h), self.color)
+            if new < inner:
+                self.tft.fillrect((x + new, y), (inner - new, h), self.background)
+        elif new > old:
+            self.tft.fillrect((x + old, y), (new - old, h), self.color)
+        else:
+            self.tft.fillrect((x + new, y), (old - new, h), self.background)
+
+
+class Gauge(Widget):
+    """
+    Half circle dial with a needle. The scale is drawn once, on a change
+    the old needle is erased and the new one drawn.
+    """
+
+    def __init__(self, tft, x, y, radius, minimum=0, maximum=100,
+                 color=TFT.RED, background=TFT.BLACK, scale=TFT.GRAY, ticks=5):
+        """
+        Args:
+            x, y (int): Center of the dial, the dial is drawn above it
+            radius (int): Radius of the scale in pixels
+            scale: Color of the scale, None for no scale
+            ticks (int): Number of tick marks on the scale
+        """
+        super().__init__(tft, x, y, color, background)
+        self.radius = radius
+        self.minimum = minimum
+        self.maximum = maximum
+        self.scale = _color(scale)
+        self.ticks = ticks
+
+    def _point(self, fraction, r):
+        a = pi * (1 - fraction)
+        return (self.x + int(cos(a) * r), self.y - int(sin(a) * r))
+
+    def _fraction(self, value):
+        if value is None or self.maximum == self.minimum:
+            return 0
+        value = max(self.minimum, min(self.maximum, value))
+        return (value - self.minimum) / (self.maximum - self.minimum)
+
+    def set(self, value):
+        # The needle only moves if its end point moves
+        self.value = value
+        end = self._point(self._fraction(value), self.radius - 3)
+        if self._drawn is not None and end == self._drawn:
+            return False
+        self._paint(self._drawn, end)
+        self._drawn = end
+        return True
+
+    def draw(self):
+        self._drawn = None
+        self.set(self.value)
+
+    def _paint(self, old, new):
+        center = (self.x, self.y)
+        if old is None:
+            if self.scale is not None:
+                for i in range(self.ticks):
+                    f = i / (self.ticks - 1) if self.ticks > 1 else 0
+                    self.tft.line(self._point(f, self.radius - 1), self._point(f, self.radius), self.scale)
+        else:
+            self.tft.line(center, old, self.background)
+        self.tft.line(center, new, self.color)
+
+
+class Icon(Widget):
+    """
+    Shows one of several .bin images, raw or compressed (see images/convert_to_rgb565.py)
+    at 1:1 scale. Images are read on first use and kept in RAM, so keep them small.
+    What a smaller image leaves of a bigger one is filled with the background.
+    """
+
+    def __init__(self, tft, x, y, paths, background=TFT.BLACK):
+        """
+        Args:
+            paths (list): Image file paths, set() takes an index into this list
+        """
+        super().__init__(tft, x, y, background=background)
+        self.paths = paths
+        self._images = {}
+        self._size = None       # Width and height of the image on screen
+
+    def _load(self, index):
+        img = self._images.get(index)
+        if img is None:
+            with ImageFile(self.paths[index]) as f:
+                w = f.width
+                h = f.height
+                data = bytearray(w * h * 2)
+                f.rows(0, h, 0, w - 1, data)
+                img = (w, h, data)
+            self._images[index] = img
+        return img
+
+    def _paint(self, old, new):
+        if new is None:
+            return
+        w, h, data = self._load(new)
+        self.tft.image(self.x, self.y, self.x + w - 1, self.y + h - 1, data)
+        if self._size is not None:
+            # Clear right of and below the new image
+            ow, oh = self._size
+            if ow > w:
+                self.tft.fillrect((self.x + w, self.y), (ow - w, oh), self.background)
+            if oh > h:
+                self.tft.fillrect((self.x, self.y + h), (min(w, ow), oh - h), self.background)
+        self._size = (w, h)
@@ -1,10 +1,18 @@
 import bot
+from widgets import Label, Value, Bar
 
 bot.write("uss_write.py", color=bot.MAGENTA)
 
+# Live readout: only changed digits and the changed part of the bar are redrawn
+Label(bot.tft, 0, 20, "Distance:", color=bot.YELLOW).draw()
+distance_value = Value(bot.tft, 0, 32, fmt="{} cm", width=7, size=2, color=bot.YELLOW)
+distance_bar = Bar(bot.tft, 0, 56, 160, 10, maximum=200, color=bot.GREEN, border=bot.GREY)
+
 while True:
     distance = bot.distance()
-    bot.write("Distance: ", distance, "cm", color=bot.YELLOW)
+    distance_value.set(distance)
+    distance_bar.set(distance)
+    bot.display_update()
     bot.visualize_value(distance)
     bot.beep(distance * 50, 50, 10)
     
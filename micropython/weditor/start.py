@@ -289,6 +289,39 @@ def run(httpClient, httpResponse):
 
     _respond(httpResponse, content)
 
+@MicroWebSrv.route('/stats')
+def get_stats(httpClient, httpResponse):
+    # Display and image cache statistics, /stats?enable=1 switches them on, &reset=1 zeroes the counters
+    args = httpClient.GetRequestQueryParams()
+    import bot
+    enable = args.get('enable', None)
+    if enable is not None:
+        dprint("Display statistics {}".format(enable))
+        bot.display_instrument(enable == '1')
+    content = {
+        "display": bot.display_stats(args.get('reset', None) == '1'),
+        "images": bot.image_cache_stats(args.get('reset', None) == '1'),
+        "memory": get_memory_info()
+    }
+    _respond(httpResponse, content)
+
+@MicroWebSrv.route('/screen')
+def get_screen(httpClient, httpResponse):
+    # Text on the bot's terminal, read from its line buffer without touching the display
+    import bot
+    lines = []
+    for runs in bot.terminal_lines():
+        line = []
+        for text, color in runs:
+            # RGB565 to #rrggbb
+            line.append([text, "#{:02x}{:02x}{:02x}".format((color >> 11) << 3, ((color >> 5) & 0x3F) << 2, (color & 0x1F) << 3)])
+        lines.append(line)
+    content = {
+        "lines": lines,
+        "text": ["".join(run[0] for run in line) for line in lines]
+    }
+    _respond(httpResponse, content)
+
 @MicroWebSrv.route('/newfile')
 def new_file(httpClient, httpResponse):
     args = httpClient.GetRequestQueryParams()
@@ -0,0 +1,63 @@
+#!/bin/bash
+
+# Script to precompile lib/ (with the lib/bot/ package) and weditor/ with mpy-cross into build/micropython,
+# a copy of micropython/ that can be uploaded or published for OTA (./ota/ota.sh --mpy).
+# The bot then loads bytecode instead of compiling the sources on every boot.
+# Usage: ./ota/build_mpy.sh
+# Needs mpy-cross of the firmware's MicroPython version: pip install mpy-cross==1.24.1
+
+set -e
+
+OUT=build/micropython
+MARCH=xtensawin     # ESP32, for the viper code in kernels_viper.py
+
+# Stay source files so a broken build can still be fixed by OTA
+KEEP_SOURCE=(
+    "lib/ota.py"
+    "lib/ota_check.py"
+    "lib/iniconf.py"
+)
+
+if ! command -v mpy-cross > /dev/null; then
+    echo "Error: mpy-cross not found (pip install mpy-cross==<firmware version>)"
+    exit 1
+fi
+echo "Using $(mpy-cross --version)"
+
+rm -rf "$OUT"
+mkdir -p build
+cp -r micropython "$OUT"
+find "$OUT" -name __pycache__ -prune -exec rm -rf {} +
+
+total_py=0
+total_mpy=0
+for file in "$OUT"/lib/*.py "$OUT"/lib/bot/*.py "$OUT"/weditor/*.py; do
+    rel_path=${file#$OUT/}
+    skip=false
+    for keep in "${KEEP_SOURCE[@]}"; do
+        if [ "$rel_path" = "$keep" ]; then
+            skip=true
+            break
+        fi
+    done
+    if [ "$skip" = true ]; then
+        echo "  $rel_path: kept as source"
+        continue
+    fi
+
+    # -s keeps the file name in tracebacks, line numbers stay the same
+    if ! mpy-cross -march=$MARCH -s "$rel_path" -o "${file%.py}.mpy" "$file"; then
+        echo "  $rel_path: doesn't compile, kept as source"
+        continue
+    fi
+    size_py=$(stat -c %s "$file")
+    size_mpy=$(stat -c %s "${file%.py}.mpy")
+    total_py=$((total_py + size_py))
+    total_mpy=$((total_mpy + size_mpy))
+    echo "  $rel_path: $size_py -> $size_mpy bytes"
+    rm "$file"
+done
+
+echo
+echo "Compiled $total_py bytes of source to $total_mpy bytes of .mpy in $OUT"
+echo "Compare 'Boot to menu' on the serial console (printed by boot.py) before and after deploying"
@@ -1,7 +1,10 @@
 #!/bin/bash
 
 # Script to generate a JSON file list with file sizes and MD5 hashes for OTA update
-# Usage: ./ota/generate_filelist.sh
+# Usage: ./ota/generate_filelist.sh [directory]
+# directory defaults to micropython, build/micropython lists the precompiled files of ./ota/build_mpy.sh
+
+SRC=${1:-micropython}
 
 # Files to exclude from OTA update
 BLACKLIST=(
@@ -14,14 +17,35 @@ BLACKLIST=(
     "linefollower.py"
     "uss_bot.py"
     "uss_write.py"
+
+    ".pyc"                      # CPython caches from running code on the PC
+)
+
+# Files of older versions the updater deletes on the bot
+OBSOLETE=(
+    "lib/bot.py"                # Replaced by the lib/bot/ package
+    "lib/bot.mpy"
 )
 
 # Create file list in JSON format
 echo '{' > ota/filelist.json
+
+# .mpy version the files were compiled for (version | sub-version << 8 like
+# sys.implementation._mpy), the updater refuses files the firmware can't load
+mpy_file=$(find "$SRC" -name '*.mpy' | head -n 1)
+if [ -n "$mpy_file" ]; then
+    read -r magic version flags <<< "$(head -c 3 "$mpy_file" | od -An -tu1)"
+    echo "    \"mpy\": $((version | (flags & 3) << 8))," >> ota/filelist.json
+fi
+
+if [ ${#OBSOLETE[@]} -gt 0 ]; then
+    echo "    \"remove\": [$(printf '"%s", ' "${OBSOLETE[@]}" | sed 's/, $//')]," >> ota/filelist.json
+fi
+
 echo '    "files": {' >> ota/filelist.json
 
-# Find all files in micropython directory
-find micropython -type f | while read file; do
+# Find all files in the directory
+find "$SRC" -type f | while read file; do
     # Check if file is blacklisted
     skip=false
     for pattern in "${BLACKLIST[@]}"; do
@@ -41,7 +65,7 @@ find micropython -type f | while read file; do
     hash=$(md5sum "$file" | cut -d' ' -f1)
     
     # Get relative path
-    rel_path=${file#micropython/}
+    rel_path=${file#$SRC/}
     
     # Add to JSON
     echo "        \"$rel_path\": {" >> ota/filelist.json
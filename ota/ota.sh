@@ -1,19 +1,53 @@
 #!/bin/bash
 
 # Script to generate OTA file list and upload files to server
-# Usage: ./ota/ota.sh
+# Usage: ./ota/ota.sh [--mpy [--force]]
+# --mpy publishes precompiled lib/ and weditor/ modules (see ./ota/build_mpy.sh),
+# only if the published file list already ships the current lib/ota.py (--force skips the check)
 
 # Get the directory where the script is located
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
 
+# Published file list, the bots update from it
+PUBLISHED_FILELIST=$(sed -n 's/^OTA_FILELIST=//p' micropython/config.ini)
+
+# Check for --mpy flag
+SRC=micropython
+FORCE=false
+for arg in "$@"; do
+    if [ "$arg" = "--force" ]; then
+        FORCE=true
+    fi
+done
+for arg in "$@"; do
+    if [ "$arg" = "--mpy" ]; then
+        # The bots apply the .mpy list with the ota.py they already run. Only the
+        # current one removes the .py files a .mpy replaces (older ones leave them,
+        # and MicroPython imports them first), so it must be published before.
+        published=$(curl -s "$PUBLISHED_FILELIST" | grep -A 2 '"lib/ota.py"' | sed -n 's/.*"hash": "\(.*\)".*/\1/p')
+        current=$(md5sum micropython/lib/ota.py | cut -d' ' -f1)
+        if [ "$published" != "$current" ] && [ "$FORCE" != true ]; then
+            echo "Error: the published file list doesn't ship the current lib/ota.py."
+            echo "Publish the source files first (./ota/ota.sh) and update the bots with it,"
+            echo "then publish --mpy. --force skips this check."
+            exit 1
+        fi
+        echo "Precompiling modules..."
+        "$SCRIPT_DIR/build_mpy.sh" || exit 1
+        SRC=build/micropython
+        echo
+        break
+    fi
+done
+
 # Generate file list first
 echo "Generating project file list with file sizes and md5 hashes..."
-"$SCRIPT_DIR/generate_filelist.sh"
+"$SCRIPT_DIR/generate_filelist.sh" "$SRC"
 echo
 
 # Upload files to server
 echo "Uploading files to server..."
-rsync -e "ssh -p 222" -avz --delete micropython/ xwk@bigfish.ull.at:/home/xwk/public_html/projects/xwk-bot/micropython/
+rsync -e "ssh -p 222" -avz --delete "$SRC/" xwk@bigfish.ull.at:/home/xwk/public_html/projects/xwk-bot/micropython/
 echo
 
 # Upload filelist.json